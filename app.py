@@ -6,9 +6,34 @@ import os
 # Initialize model
 MODEL_NAME = os.getenv("MODEL_NAME", "IberaSoft/customer-sentiment-analyzer")
 
+
+def canonical_label(label):
+    """Map a raw model label onto positive, negative or neutral."""
+    label_lower = label.lower()
+    aliases = {
+        "pos": "positive",
+        "neg": "negative",
+        "neu": "neutral",
+        "label_0": "negative",  # Common HF format
+        "label_1": "neutral",
+        "label_2": "positive"
+    }
+    if label_lower in ("positive", "negative", "neutral"):
+        return label_lower
+    if label_lower in aliases:
+        return aliases[label_lower]
+    # Try to infer from label name
+    if "pos" in label_lower:
+        return "positive"
+    if "neg" in label_lower:
+        return "negative"
+    return "neutral"
+
+
 # Load model
 print(f"Loading model: {MODEL_NAME}")
 classifier = None
+label_to_class = {}
 try:
     # Try to load with token if available (for private models)
     hf_token = os.getenv("HF_TOKEN")
@@ -20,6 +45,11 @@ try:
         token=hf_token if hf_token else None,
         top_k=None  # Returns all scores
     )
+    # Resolve label names once instead of on every prediction
+    label_to_class = {
+        label: canonical_label(label)
+        for label in classifier.model.config.id2label.values()
+    }
     print("✓ Model loaded successfully!")
 except Exception as e:
     print(f"Error loading model: {e}")
@@ -46,44 +76,15 @@ def analyze_sentiment(text):
         # Get predictions
         results = classifier(text)
         
-        # Process results - handle different label formats
+        # Map labels onto the standard classes
         scores = {}
-        label_mapping = {
-            "positive": "positive",
-            "negative": "negative",
-            "neutral": "neutral",
-            "pos": "positive",
-            "neg": "negative",
-            "neu": "neutral",
-            "POSITIVE": "positive",
-            "NEGATIVE": "negative",
-            "NEUTRAL": "neutral",
-            "LABEL_0": "negative",  # Common HF format
-            "LABEL_1": "neutral",
-            "LABEL_2": "positive"
-        }
-        
         for result in results[0]:
             label = result["label"]
             score = result["score"]
-            # Normalize label
-            normalized_label = label_mapping.get(label, label.lower())
-            # Map to standard labels
-            if normalized_label not in ["positive", "negative", "neutral"]:
-                # Try to infer from label name
-                label_lower = label.lower()
-                if "pos" in label_lower:
-                    normalized_label = "positive"
-                elif "neg" in label_lower:
-                    normalized_label = "negative"
-                else:
-                    normalized_label = "neutral"
+            normalized_label = label_to_class.get(label) or canonical_label(label)
             
             # Accumulate scores (in case of duplicate labels)
-            if normalized_label in scores:
-                scores[normalized_label] = max(scores[normalized_label], score)
-            else:
-                scores[normalized_label] = score
+            scores[normalized_label] = max(scores.get(normalized_label, 0.0), score)
         
         # Ensure all classes are present with default values
         for cls in ["positive", "negative", "neutral"]:
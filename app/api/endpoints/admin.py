@@ -0,0 +1,45 @@
+"""Admin endpoints for captured request profiles."""
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.core.profiling import PROFILE_HEADER, request_profiler
+
+router = APIRouter()
+
+
+def _require_token(token: Optional[str]) -> None:
+    """Allow only callers holding ``PROFILE_TOKEN``.
+
+    Sampled captures are saved without a token too, but are only served
+    once one is configured.
+    """
+    if not settings.profile_token:
+        raise HTTPException(
+            status_code=404, detail="Profiling admin is disabled, set PROFILE_TOKEN to enable it"
+        )
+    if not request_profiler.token_matches(token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+@router.get("/admin/profiles")
+async def list_profiles(token: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+    """List captured request profiles, newest first, with their hot spots."""
+    _require_token(token)
+    return {"profiles": request_profiler.list()}
+
+
+@router.get("/admin/profiles/{profile_id}/{artifact}")
+async def get_profile_artifact(
+    profile_id: str,
+    artifact: str,
+    token: Optional[str] = Header(None, alias=PROFILE_HEADER),
+):
+    """Download one artifact of a capture: ``pstats``, ``torch`` or ``trace``."""
+    _require_token(token)
+    path = request_profiler.artifact_path(profile_id, artifact)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile artifact not found")
+    return FileResponse(path, filename=f"{profile_id}-{path.name}")
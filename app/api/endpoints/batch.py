@@ -1,24 +1,34 @@
 """Batch prediction endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
+from app.api.responses import batch_payload, json_response
+from app.core.executor import InferenceOverloadedError, inference_executor
 from app.core.model import get_model
+from app.core.profiling import PROFILE_ID_HEADER, request_profiler
 from app.schemas.request import BatchPredictionRequest
-from app.schemas.response import BatchPredictionItem, BatchPredictionResponse
-from app.utils.logger import logger
+from app.schemas.response import BatchPredictionResponse
+from app.utils.logger import logger, should_log
 from app.utils.metrics import (
     api_errors_total,
     api_requests_total,
     inference_duration_seconds,
     sentiment_predictions_total,
 )
+from app.utils.timing import current_endpoint
 
 router = APIRouter()
 
 
-@router.post("/predict/batch", response_model=BatchPredictionResponse)
-async def predict_batch(batch_request: BatchPredictionRequest):
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    response_class=ORJSONResponse,
+)
+async def predict_batch(batch_request: BatchPredictionRequest, http_request: Request):
     """Predict sentiment for multiple texts."""
+    current_endpoint.set("/predict/batch")
 
     try:
         # Validate batch size
@@ -30,7 +40,20 @@ async def predict_batch(batch_request: BatchPredictionRequest):
 
         # Get model and predict
         model = get_model()
-        predictions, processing_time = model.predict_batch(batch_request.texts)
+        profile_id = None
+        profile_trigger = request_profiler.should_profile(http_request.headers)
+        if profile_trigger:
+            (predictions, processing_time), profile_id = await inference_executor.run(
+                request_profiler.capture,
+                profile_trigger,
+                model.predict_batch,
+                batch_request.texts,
+            )
+        else:
+            predictions, processing_time = await inference_executor.run(
+                model.predict_batch,
+                batch_request.texts,
+            )
 
         # Calculate average confidence
         total_confidence = sum(p["confidence"] for p in predictions)
@@ -38,6 +61,8 @@ async def predict_batch(batch_request: BatchPredictionRequest):
             total_confidence / len(predictions) if predictions else 0.0
         )
 
+        cached_count = sum(1 for p in predictions if p.get("cached"))
+
         # Update metrics
         for pred in predictions:
             sentiment_predictions_total.labels(
@@ -51,24 +76,42 @@ async def predict_batch(batch_request: BatchPredictionRequest):
             status="200",
         ).inc()
 
-        # Log batch prediction
-        logger.info(
-            "Batch prediction made",
-            extra={
-                "total_processed": len(predictions),
-                "processing_time_ms": processing_time,
-            },
-        )
+        # Log batch prediction (sampled; slow batches always logged)
+        if should_log(processing_time):
+            logger.info(
+                "Batch prediction made",
+                extra={
+                    "total_processed": len(predictions),
+                    "cached_count": cached_count,
+                    "processing_time_ms": processing_time,
+                },
+            )
 
-        return BatchPredictionResponse(
-            predictions=[BatchPredictionItem(**p) for p in predictions],
-            total_processed=len(predictions),
-            avg_confidence=avg_confidence,
-            processing_time_ms=processing_time,
+        response = json_response(
+            batch_payload(predictions, cached_count, avg_confidence, processing_time)
         )
+        if profile_id:
+            response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
 
     except HTTPException:
         raise
+    except InferenceOverloadedError as e:
+        logger.warning("Inference queue full, shedding batch request")
+        api_errors_total.labels(
+            endpoint="/predict/batch",
+            error_type=type(e).__name__,
+        ).inc()
+        api_requests_total.labels(
+            endpoint="/predict/batch",
+            method="POST",
+            status="503",
+        ).inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Server is overloaded, retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"Error in batch prediction: {str(e)}", exc_info=True)
         api_errors_total.labels(
@@ -3,8 +3,10 @@ import time
 
 from fastapi import APIRouter
 
+from app.core import topology
 from app.core.model import sentiment_model
 from app.schemas.response import HealthResponse, ModelInfoResponse
+from app.utils.memory import process_memory
 from app.utils.metrics import api_requests_total
 
 router = APIRouter()
@@ -49,4 +51,6 @@ async def model_info():
         classes=["positive", "negative", "neutral"],
         accuracy=0.902,
         f1_score=0.89,
+        serving=topology.current_slot.to_dict() if topology.current_slot else None,
+        memory=process_memory(),
     )
@@ -0,0 +1,119 @@
+"""Bulk scoring job endpoints."""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.core.jobs import job_manager
+from app.schemas.response import JobResponse
+from app.utils.logger import logger
+from app.utils.metrics import api_errors_total, api_requests_total
+
+router = APIRouter()
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# The form is parsed in the endpoint, so describe it for the OpenAPI docs
+UPLOAD_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+@router.post(
+    "/jobs",
+    response_model=JobResponse,
+    status_code=202,
+    openapi_extra=UPLOAD_SCHEMA,
+)
+async def create_job(request: Request):
+    """Upload a JSONL or CSV file for background scoring.
+
+    JSONL lines are ``{"text": "...", "id": ...}`` objects or bare strings;
+    CSV files need a ``text`` column and may have an ``id`` column.
+    """
+    too_large = f"Upload exceeds {settings.job_max_upload_bytes} bytes"
+    # Reject an oversized upload before its body is read
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.job_max_upload_bytes:
+        raise HTTPException(status_code=413, detail=too_large)
+
+    async with request.form(max_files=1) as form:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=422, detail="Expected a 'file' form field")
+
+        try:
+            job = job_manager.create(file.filename or "")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Spool the upload to disk chunk by chunk, off the event loop
+        size = 0
+        try:
+            f = await run_in_threadpool(open, job_manager.input_path(job), "wb")
+            try:
+                while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > settings.job_max_upload_bytes:
+                        raise HTTPException(status_code=413, detail=too_large)
+                    await run_in_threadpool(f.write, chunk)
+            finally:
+                await run_in_threadpool(f.close)
+        except HTTPException as e:
+            job_manager.fail(job, e.detail)
+            raise
+        except Exception as e:
+            logger.error(f"Error spooling job upload: {str(e)}", exc_info=True)
+            api_errors_total.labels(endpoint="/jobs", error_type=type(e).__name__).inc()
+            job_manager.fail(job, str(e))
+            raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+
+    job_manager.submit(job)
+
+    api_requests_total.labels(endpoint="/jobs", method="POST", status="202").inc()
+    logger.info(
+        "Bulk job submitted",
+        extra={"job_id": job.job_id, "upload_bytes": size},
+    )
+
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get job status and progress."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/jobs/{job_id}/results")
+async def get_job_results(job_id: str):
+    """Download a completed job's results as NDJSON."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job.status}, results are available once completed",
+        )
+    return FileResponse(
+        job_manager.results_path(job),
+        media_type="application/x-ndjson",
+        filename=f"{job.job_id}.jsonl",
+    )
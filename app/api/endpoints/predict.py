@@ -1,44 +1,65 @@
 """Prediction endpoints."""
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
+from app.api.responses import json_response, prediction_payload
+from app.config import settings
+from app.core.batcher import prediction_batcher
 from app.core.cache import prediction_cache
+from app.core.executor import InferenceOverloadedError, inference_executor
 from app.core.model import get_model
+from app.core.profiling import PROFILE_ID_HEADER, request_profiler
 from app.schemas.request import PredictionRequest
 from app.schemas.response import PredictionResponse
-from app.utils.logger import logger
+from app.utils.logger import logger, should_log
 from app.utils.metrics import (
     api_errors_total,
     api_requests_total,
     inference_duration_seconds,
     sentiment_predictions_total,
 )
+from app.utils.timing import current_endpoint
 
 router = APIRouter()
 
 
-@router.post("/predict", response_model=PredictionResponse)
+@router.post("/predict", response_model=PredictionResponse, response_class=ORJSONResponse)
 async def predict_sentiment(request: PredictionRequest, http_request: Request):
     """Predict sentiment for a single text."""
+    current_endpoint.set("/predict")
 
     try:
+        # A profiled request skips the cache so the model always runs
+        profile_trigger = request_profiler.should_profile(http_request.headers)
+        profile_id = None
+
         # Check cache first
-        cached_result = prediction_cache.get(request.text)
+        cached_result = None if profile_trigger else await prediction_cache.aget(request.text)
         if cached_result:
-            logger.info("Cache hit", extra={"text_preview": request.text[:50]})
+            if should_log():
+                logger.info("Cache hit", extra={"text_preview": request.text[:50]})
             api_requests_total.labels(
                 endpoint="/predict",
                 method="POST",
                 status="200",
             ).inc()
-            return PredictionResponse(**cached_result)
+            return json_response(prediction_payload(cached_result))
 
-        # Get model and predict
-        model = get_model()
-        result = model.predict(request.text)
+        # Predict, coalescing concurrent requests into shared forward passes
+        if profile_trigger:
+            model = get_model()
+            result, profile_id = await inference_executor.run(
+                request_profiler.capture, profile_trigger, model.predict, request.text
+            )
+        elif settings.batching_enabled:
+            result = await prediction_batcher.submit(request.text)
+        else:
+            model = get_model()
+            result = await inference_executor.run(model.predict, request.text)
 
         # Cache result
-        prediction_cache.set(request.text, result)
+        await prediction_cache.aset(request.text, result)
 
         # Update metrics
         sentiment_predictions_total.labels(sentiment=result["sentiment"]).inc()
@@ -49,18 +70,38 @@ async def predict_sentiment(request: PredictionRequest, http_request: Request):
             status="200",
         ).inc()
 
-        # Log prediction
-        logger.info(
-            "Prediction made",
-            extra={
-                "sentiment": result["sentiment"],
-                "confidence": result["confidence"],
-                "processing_time_ms": result["processing_time_ms"],
-            },
-        )
+        # Log prediction (sampled; slow predictions always logged)
+        if should_log(result["processing_time_ms"]):
+            logger.info(
+                "Prediction made",
+                extra={
+                    "sentiment": result["sentiment"],
+                    "confidence": result["confidence"],
+                    "processing_time_ms": result["processing_time_ms"],
+                },
+            )
 
-        return PredictionResponse(**result)
+        response = json_response(prediction_payload(result))
+        if profile_id:
+            response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
 
+    except InferenceOverloadedError as e:
+        logger.warning("Inference queue full, shedding request")
+        api_errors_total.labels(
+            endpoint="/predict",
+            error_type=type(e).__name__,
+        ).inc()
+        api_requests_total.labels(
+            endpoint="/predict",
+            method="POST",
+            status="503",
+        ).inc()
+        raise HTTPException(
+            status_code=503,
+            detail="Server is overloaded, retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"Error in prediction: {str(e)}", exc_info=True)
         api_errors_total.labels(
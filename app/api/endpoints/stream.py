@@ -0,0 +1,192 @@
+"""Streaming NDJSON prediction endpoint."""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+from app.core.executor import InferenceOverloadedError, inference_executor
+from app.core.model import get_model
+from app.schemas.request import PredictionRequest
+from app.utils.logger import logger
+from app.utils.metrics import (
+    api_errors_total,
+    api_requests_total,
+    sentiment_predictions_total,
+)
+from app.utils.timing import current_endpoint, observe_stage
+
+router = APIRouter()
+
+# (line number, caller-supplied id, text)
+StreamItem = Tuple[int, Any, str]
+
+# Same limit as /predict, read from the request schema
+MAX_TEXT_LENGTH = next(
+    constraint.max_length
+    for constraint in PredictionRequest.model_fields["text"].metadata
+    if getattr(constraint, "max_length", None) is not None
+)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response whose body generator also reads the request body.
+
+    ``StreamingResponse`` listens for client disconnects by calling
+    ``receive()`` concurrently, which would swallow request body chunks.
+    Here the generator owns ``receive``: a disconnect surfaces as
+    ``ClientDisconnect`` from ``request.stream()``.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Send the response without a competing disconnect listener."""
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_line(raw: bytes) -> Tuple[Optional[Tuple[Any, str]], Optional[str]]:
+    """Parse one NDJSON line into (id, text), or return an error message."""
+    try:
+        record = orjson.loads(raw)
+    except ValueError:
+        return None, "Invalid JSON"
+
+    if isinstance(record, str):
+        record = {"text": record}
+    if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+        return None, "Expected an object with a 'text' string"
+
+    text = record["text"]
+    if not text or len(text) > MAX_TEXT_LENGTH:
+        return None, f"Text must be 1 to {MAX_TEXT_LENGTH} characters"
+
+    return (record.get("id"), text), None
+
+
+def _error_line(line_no: int, message: str) -> bytes:
+    """Encode a per-line error."""
+    return orjson.dumps({"line": line_no, "error": message}) + b"\n"
+
+
+async def _score(batch: List[StreamItem]) -> bytes:
+    """Score one internal batch and encode its NDJSON results.
+
+    Overload is answered by backing off rather than failing the stream,
+    since a stream is bulk traffic that should yield to interactive calls.
+    """
+    model = get_model()
+    texts = [text for _, _, text in batch]
+    while True:
+        try:
+            results = await inference_executor.run(model.predict_many, texts)
+            break
+        except InferenceOverloadedError as e:
+            await asyncio.sleep(e.retry_after)
+
+    start = time.perf_counter()
+    lines = []
+    for (line_no, item_id, _), result in zip(batch, results):
+        sentiment_predictions_total.labels(sentiment=result["sentiment"]).inc()
+        output: Dict[str, Any] = {"line": line_no}
+        if item_id is not None:
+            output["id"] = item_id
+        output["sentiment"] = result["sentiment"]
+        output["confidence"] = result["confidence"]
+        output["scores"] = result["scores"]
+        lines.append(orjson.dumps(output))
+
+    body = b"\n".join(lines) + b"\n"
+    observe_stage("serialize", time.perf_counter() - start)
+    return body
+
+
+async def _stream_predictions(request: Request) -> AsyncIterator[bytes]:
+    """Read NDJSON lines incrementally and yield results batch by batch.
+
+    Only the current partial line and one internal batch are held in
+    memory, so memory use is independent of the request size.
+    """
+    current_endpoint.set("/predict/stream")
+    buffer = b""
+    batch: List[StreamItem] = []
+    line_no = 0
+    skipping = False
+
+    async def handle(raw: bytes) -> AsyncIterator[bytes]:
+        nonlocal line_no, batch
+        line_no += 1
+        if not raw.strip():
+            yield _error_line(line_no, "Empty line")
+            return
+        parsed, error = _parse_line(raw)
+        if error:
+            yield _error_line(line_no, error)
+            return
+        batch.append((line_no, parsed[0], parsed[1]))
+        if len(batch) >= settings.stream_batch_size:
+            current, batch = batch, []
+            yield await _score(current)
+
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for raw in lines:
+                if skipping:
+                    # Tail of an over-long line already reported
+                    skipping = False
+                    continue
+                async for output in handle(raw):
+                    yield output
+
+            if len(buffer) > settings.stream_max_line_bytes and not skipping:
+                line_no += 1
+                yield _error_line(line_no, "Line too long")
+                buffer = b""
+                skipping = True
+            elif skipping:
+                buffer = b""
+
+        if buffer and not skipping:
+            async for output in handle(buffer):
+                yield output
+        if batch:
+            yield await _score(batch)
+
+        api_requests_total.labels(
+            endpoint="/predict/stream",
+            method="POST",
+            status="200",
+        ).inc()
+        logger.info("Stream prediction completed", extra={"total_processed": line_no})
+
+    except ClientDisconnect:
+        logger.info("Stream prediction client disconnected", extra={"line": line_no})
+
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.error(f"Error in stream prediction: {str(e)}", exc_info=True)
+        api_errors_total.labels(
+            endpoint="/predict/stream",
+            error_type=type(e).__name__,
+        ).inc()
+        yield orjson.dumps({"error": f"Stream prediction failed: {str(e)}"}) + b"\n"
+
+
+@router.post("/predict/stream")
+async def predict_stream(request: Request):
+    """Predict sentiment for a newline-delimited JSON stream of any length.
+
+    Each input line is ``{"text": "...", "id": ...}`` (``id`` optional) or a
+    bare JSON string. Results are streamed back as NDJSON, one line per
+    input line, as each internal batch finishes.
+    """
+    return NDJSONStreamingResponse(_stream_predictions(request))
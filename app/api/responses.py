@@ -0,0 +1,51 @@
+"""Fast JSON responses for trusted model output.
+
+Prediction results come from our own model code with a fixed shape, so the
+endpoints build the response body as plain dicts and encode them with
+orjson instead of re-validating every field through the pydantic response
+models. Those models still define the OpenAPI schema, and the tests
+validate real responses against them.
+"""
+import time
+from typing import Any, Dict, List
+
+from fastapi.responses import ORJSONResponse
+
+from app.utils.timing import observe_stage
+
+
+def prediction_payload(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Body of a ``PredictionResponse``."""
+    return {
+        "sentiment": result["sentiment"],
+        "confidence": result["confidence"],
+        "scores": result["scores"],
+        "processing_time_ms": result["processing_time_ms"],
+    }
+
+
+def batch_payload(
+    predictions: List[Dict[str, Any]],
+    cached_count: int,
+    avg_confidence: float,
+    processing_time_ms: float,
+) -> Dict[str, Any]:
+    """Body of a ``BatchPredictionResponse``."""
+    return {
+        "predictions": [
+            {"text": p["text"], "sentiment": p["sentiment"], "confidence": p["confidence"]}
+            for p in predictions
+        ],
+        "total_processed": len(predictions),
+        "cached_count": cached_count,
+        "avg_confidence": avg_confidence,
+        "processing_time_ms": processing_time_ms,
+    }
+
+
+def json_response(payload: Dict[str, Any]) -> ORJSONResponse:
+    """Encode a payload with orjson, skipping response model validation."""
+    start = time.perf_counter()
+    response = ORJSONResponse(payload)
+    observe_stage("serialize", time.perf_counter() - start)
+    return response
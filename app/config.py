@@ -14,13 +14,81 @@ class Settings(BaseSettings):
         "MODEL_NAME",
         "IberaSoft/customer-sentiment-analyzer",
     )
+    model_revision: Optional[str] = os.getenv("MODEL_REVISION", None)
+
+    # Inference Backend Configuration ("torch" or "onnx")
+    inference_backend: str = os.getenv("INFERENCE_BACKEND", "torch").lower()
+    onnx_model_file: str = os.getenv("ONNX_MODEL_FILE", "model.onnx")
+
+    # Quantization Configuration ("none" or "dynamic-int8", torch backend only)
+    quantization: str = os.getenv("QUANTIZATION", "none").lower()
+    quantized_state_dict_file: str = os.getenv(
+        "QUANTIZED_STATE_DICT_FILE",
+        "quantized_state_dict.pt",
+    )
+    quantization_tolerance: float = float(os.getenv("QUANTIZATION_TOLERANCE", "0.1"))
+    quantization_strict: bool = os.getenv("QUANTIZATION_STRICT", "false").lower() == "true"
 
     # API Configuration
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # 0 = synchronous
+    log_sample_rate: float = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+    log_slow_request_ms: float = float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
     max_batch_size: int = int(os.getenv("MAX_BATCH_SIZE", "32"))
+    max_batch_tokens: int = int(os.getenv("MAX_BATCH_TOKENS", "8192"))
+    long_text_strategy: str = os.getenv("LONG_TEXT_STRATEGY", "head").lower()
+    max_tokens_per_text: int = int(os.getenv("MAX_TOKENS_PER_TEXT", "2048"))
+    long_text_overlap: int = int(os.getenv("LONG_TEXT_OVERLAP", "128"))
+    tokenize_chunk_size: int = int(os.getenv("TOKENIZE_CHUNK_SIZE", "256"))
+    tokenize_prefetch_depth: int = int(os.getenv("TOKENIZE_PREFETCH_DEPTH", "0"))
+    stream_batch_size: int = int(os.getenv("STREAM_BATCH_SIZE", "64"))
+    stream_max_line_bytes: int = int(os.getenv("STREAM_MAX_LINE_BYTES", "65536"))
     cache_size: int = int(os.getenv("CACHE_SIZE", "1000"))
+    cache_ttl_seconds: float = float(os.getenv("CACHE_TTL_SECONDS", "0"))
+    cache_max_bytes: int = int(os.getenv("CACHE_MAX_BYTES", "0"))
+    cache_disk_path: Optional[str] = os.getenv("CACHE_DISK_PATH", None)
+    cache_disk_max_entries: int = int(os.getenv("CACHE_DISK_MAX_ENTRIES", "1000000"))
+    cache_disk_timeout_ms: float = float(os.getenv("CACHE_DISK_TIMEOUT_MS", "50"))
+    cache_redis_url: Optional[str] = os.getenv("CACHE_REDIS_URL", None)
+    cache_redis_timeout_ms: float = float(os.getenv("CACHE_REDIS_TIMEOUT_MS", "20"))
+    cache_redis_max_connections: int = int(os.getenv("CACHE_REDIS_MAX_CONNECTIONS", "16"))
+    cache_warmup_file: Optional[str] = os.getenv("CACHE_WARMUP_FILE", None)
+    cache_warmup_top_n: int = int(os.getenv("CACHE_WARMUP_TOP_N", "1000"))
+    cache_warmup_budget_seconds: float = float(os.getenv("CACHE_WARMUP_BUDGET_SECONDS", "30"))
+    cache_backend_retry_seconds: float = float(os.getenv("CACHE_BACKEND_RETRY_SECONDS", "5"))
+    cache_write_queue_size: int = int(os.getenv("CACHE_WRITE_QUEUE_SIZE", "1000"))
     workers: int = int(os.getenv("WORKERS", "2"))
 
+    # Serving Launcher Configuration (python -m app.serve)
+    host: str = os.getenv("HOST", "0.0.0.0")
+    port: int = int(os.getenv("PORT", "8000"))
+    intra_op_threads: int = int(os.getenv("INTRA_OP_THREADS", "0"))  # 0 = auto
+    inter_op_threads: int = int(os.getenv("INTER_OP_THREADS", "1"))
+    cpu_affinity: bool = os.getenv("CPU_AFFINITY", "false").lower() == "true"
+    preload_model: bool = os.getenv("PRELOAD_MODEL", "true").lower() == "true"
+
+    # Micro-batching Configuration (POST /predict)
+    batching_enabled: bool = os.getenv("BATCHING_ENABLED", "true").lower() == "true"
+    batch_max_size: int = int(os.getenv("BATCH_MAX_SIZE", "32"))
+    batch_max_wait_ms: float = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+
+    # Inference Executor Configuration
+    inference_concurrency: int = int(os.getenv("INFERENCE_CONCURRENCY", "1"))
+    inference_queue_size: int = int(os.getenv("INFERENCE_QUEUE_SIZE", "64"))
+    inference_retry_after: int = int(os.getenv("INFERENCE_RETRY_AFTER", "1"))
+
+    # Bulk Job Configuration (/jobs)
+    jobs_dir: str = os.getenv("JOBS_DIR", "/tmp/sentiment-jobs")
+    job_batch_size: int = int(os.getenv("JOB_BATCH_SIZE", "32"))
+    job_idle_poll_ms: float = float(os.getenv("JOB_IDLE_POLL_MS", "10"))
+    job_max_upload_bytes: int = int(os.getenv("JOB_MAX_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+
+    # Request Profiling Configuration (off unless a token or sample rate is set)
+    profile_token: Optional[str] = os.getenv("PROFILE_TOKEN", None)
+    profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    profile_dir: str = os.getenv("PROFILE_DIR", "/tmp/sentiment-profiles")
+    profile_max_captures: int = int(os.getenv("PROFILE_MAX_CAPTURES", "50"))
+
     # Device Configuration
     device: Optional[str] = os.getenv("DEVICE", None)
     device_id: Optional[int] = (
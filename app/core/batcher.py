@@ -0,0 +1,94 @@
+"""Dynamic micro-batching for single-text predictions."""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.core.executor import inference_executor
+from app.core.model import get_model
+from app.utils.metrics import batch_formed_size, batch_queue_wait_seconds
+
+PendingItem = Tuple[str, asyncio.Future, float]
+
+
+def _predict_many(texts: List[str]) -> List[Dict[str, Any]]:
+    """Default batch function: one forward pass through the global model."""
+    return get_model().predict_many(texts)
+
+
+class MicroBatcher:
+    """Coalesce concurrent single predictions into shared forward passes.
+
+    Callers ``await submit(text)``. The first caller to arrive on an empty
+    queue starts a timer of ``max_wait_ms``; the queue is flushed when the
+    timer fires or as soon as ``max_batch_size`` items are waiting, whichever
+    comes first. Each caller receives its own ``predict``-shaped result.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[str]], List[Dict[str, Any]]] = _predict_many,
+        max_batch_size: int = None,
+        max_wait_ms: float = None,
+    ):
+        """Initialize batcher."""
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size or settings.batch_max_size
+        self.max_wait = (
+            max_wait_ms if max_wait_ms is not None else settings.batch_max_wait_ms
+        ) / 1000
+        self._pending: List[PendingItem] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Running batch tasks; the loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, text: str) -> Dict[str, Any]:
+        """Queue a text and wait for its prediction."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the queued items to a batch task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[PendingItem]) -> None:
+        """Predict one formed batch and resolve every caller's future."""
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            batch_queue_wait_seconds.observe(started - enqueued)
+        batch_formed_size.observe(len(batch))
+
+        try:
+            results = await inference_executor.run(
+                self.predict_fn,
+                [text for text, _, _ in batch],
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Global batcher instance
+prediction_batcher = MicroBatcher()
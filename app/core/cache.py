@@ -1,57 +1,647 @@
 """Response caching utilities."""
-import hashlib
-from typing import Optional
+import asyncio
+import contextlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import xxhash
 
 from app.config import settings
+from app.core.preprocessing import preprocess_text
+from app.utils.logger import logger
+from app.utils.metrics import (
+    cache_backend_errors_total,
+    cache_backend_hits_total,
+    cache_backend_misses_total,
+    cache_backend_writes_dropped_total,
+    cache_bytes,
+    cache_entries,
+    cache_evictions_total,
+    cache_hits_total,
+    cache_misses_total,
+)
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(v) for v in value)
+    return size
+
+
+# Read recency kept in memory per DiskCache before hits stop being recorded
+MAX_PENDING_TOUCHES = 100_000
+
+# How often the DiskCache background thread applies read recency
+TOUCH_INTERVAL_SECONDS = 1.0
+
+
+class CacheBackend:
+    """Shared cache tier below the in-memory LRU.
+
+    Subclasses implement ``_get_many`` and ``_set_many`` over hashed keys
+    and list the exceptions their store raises in ``errors``. Those errors
+    are logged and treated as misses, and the backend is then bypassed for
+    ``retry_seconds`` so a slow or unavailable store costs one timeout,
+    not one per request. The cache never fails a prediction.
+    """
+
+    name = "backend"
+    errors: Tuple[type, ...] = (OSError,)
+
+    def __init__(self, ttl: float = None, retry_seconds: float = None):
+        """Initialize backend."""
+        self.ttl = ttl if ttl is not None else settings.cache_ttl_seconds
+        self.retry_seconds = (
+            retry_seconds if retry_seconds is not None else settings.cache_backend_retry_seconds
+        )
+        self._bypass_until = 0.0
+
+    def _get_many(self, keys: List[str]) -> Dict[str, dict]:
+        raise NotImplementedError
+
+    def _set_many(self, entries: List[Tuple[str, dict]]) -> None:
+        raise NotImplementedError
+
+    @property
+    def available(self) -> bool:
+        """False while bypassed after an error."""
+        return time.monotonic() >= self._bypass_until
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self._bypass_until = time.monotonic() + self.retry_seconds
+        cache_backend_errors_total.labels(backend=self.name).inc()
+        logger.warning(
+            f"Cache backend {self.name} {operation} failed, "
+            f"using local cache only for {self.retry_seconds}s: {str(error)}"
+        )
+
+    def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        """Fetch the entries present among ``keys``."""
+        if not keys or not self.available:
+            return {}
+        try:
+            found = self._get_many(keys)
+        except self.errors as e:
+            self._failed("read", e)
+            return {}
+
+        cache_backend_hits_total.labels(backend=self.name).inc(len(found))
+        cache_backend_misses_total.labels(backend=self.name).inc(len(keys) - len(found))
+        return found
+
+    def set_many(self, entries: List[Tuple[str, dict]]) -> None:
+        """Store entries."""
+        if not entries or not self.available:
+            return
+        try:
+            self._set_many(entries)
+        except self.errors as e:
+            self._failed("write", e)
+
+
+class DiskCache(CacheBackend):
+    """SQLite-backed cache tier shared by all workers on a node.
+
+    Entries survive restarts. Each process opens its own connection
+    (reopened after fork) in WAL mode, so workers read concurrently. When
+    the table grows past ``max_entries`` the least recently read entries
+    are evicted down to 90% of the cap. Eviction runs on a background
+    thread with its own connection, deleting in short transactions, so
+    neither writes nor lookups wait for it. Lookups never write: the
+    recency of hits is recorded in memory and applied in batches by the
+    same thread, so a read hit never takes SQLite's write lock.
+    """
+
+    name = "disk"
+    errors = (sqlite3.Error, OSError)
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = None,
+        ttl: float = None,
+        timeout_ms: float = None,
+        retry_seconds: float = None,
+    ):
+        """Initialize disk cache."""
+        super().__init__(ttl=ttl, retry_seconds=retry_seconds)
+        self.path = path
+        self.max_entries = max_entries or settings.cache_disk_max_entries
+        self.timeout_ms = timeout_ms if timeout_ms is not None else settings.cache_disk_timeout_ms
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # Count rows only every so often; COUNT(*) scans the table
+        self._check_every = max(100, self.max_entries // 100)
+        self._writes_since_check = 0
+        self._evict_requested = threading.Event()
+        self._evictor: Optional[threading.Thread] = None
+        # key -> last read time, applied to accessed_at by the evictor
+        self._touched: Dict[str, float] = {}
+
+    def _open(self, timeout_ms: float) -> sqlite3.Connection:
+        """Open a connection to the database, creating the table if needed."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS predictions_accessed ON predictions (accessed_at)"
+        )
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database for this process; caller must hold the lock."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = self._open(self.timeout_ms)
+            self._pid = os.getpid()
+        return self._conn
+
+    def _get_many(self, keys: List[str]) -> Dict[str, dict]:
+        """Fetch unexpired entries, marking them recently used."""
+        now = time.time()
+        found: Dict[str, dict] = {}
+        with self._lock:
+            conn = self._connection()
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start: start + 500]
+                rows = conn.execute(
+                    "SELECT key, value FROM predictions WHERE key IN "
+                    f"({','.join('?' * len(chunk))}) "
+                    "AND (expires_at = 0 OR expires_at > ?)",
+                    (*chunk, now),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+            if found:
+                # Recency is approximate: past the cap, further touches wait for a flush
+                room = MAX_PENDING_TOUCHES - len(self._touched)
+                self._touched.update((key, now) for key in islice(found, max(0, room)))
+                self._ensure_evictor()
+        return found
+
+    def _set_many(self, entries: List[Tuple[str, dict]]) -> None:
+        """Store entries, waking the evictor every ``_check_every`` writes."""
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else 0.0
+        rows = [(key, json.dumps(value), expires_at, now) for key, value in entries]
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._writes_since_check += len(rows)
+            if self._writes_since_check < self._check_every:
+                return
+            self._writes_since_check = 0
+            self._ensure_evictor()
+            self._evict_requested.set()
+
+    def _ensure_evictor(self) -> None:
+        """Start the background thread if needed; caller must hold the lock."""
+        if self._evictor is None or not self._evictor.is_alive():
+            # Also restarts it in a forked worker, which inherits no threads
+            self._evictor = threading.Thread(
+                target=self._evict_loop, name="disk-cache-evictor", daemon=True
+            )
+            self._evictor.start()
+
+    def _evict_loop(self) -> None:
+        """Apply read recency and evict when writes request it, on a connection of its own."""
+        conn = None
+        while True:
+            requested = self._evict_requested.wait(TOUCH_INTERVAL_SECONDS)
+            self._evict_requested.clear()
+            try:
+                if conn is None:
+                    # Wait longer than request-path calls; nothing waits on eviction
+                    conn = self._open(max(self.timeout_ms, 1000))
+                # Before evicting, so recently read entries are kept
+                self.apply_touches(conn)
+                if requested:
+                    self.evict(conn)
+            except self.errors as e:
+                logger.warning(f"Disk cache eviction failed: {str(e)}")
+
+    def apply_touches(self, conn: sqlite3.Connection, chunk: int = 1000) -> None:
+        """Write the recorded read times to ``accessed_at`` in short transactions."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        rows = [(accessed_at, key) for key, accessed_at in touched.items()]
+        for start in range(0, len(rows), chunk):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "UPDATE predictions SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                    rows[start: start + chunk],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def evict(self, conn: sqlite3.Connection = None, chunk: int = 1000) -> None:
+        """Drop expired entries, then least recently used ones down to 90% of the cap.
+
+        Deletes ``chunk`` rows per transaction so the write lock is only
+        held briefly and concurrent writers are not timed out.
+        """
+        if conn is None:
+            with contextlib.closing(self._open(max(self.timeout_ms, 1000))) as conn:
+                return self.evict(conn, chunk)
+        now = time.time()
+
+        while True:
+            expired = conn.execute(
+                "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions "
+                "WHERE expires_at != 0 AND expires_at <= ? LIMIT ?)",
+                (now, chunk),
+            ).rowcount
+            if expired > 0:
+                cache_evictions_total.labels(reason="disk_expired").inc(expired)
+            if expired < chunk:
+                break
+
+        count = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        excess = count - int(self.max_entries * 0.9) if count > self.max_entries else 0
+        while excess > 0:
+            deleted = conn.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY accessed_at LIMIT ?)",
+                (min(chunk, excess),),
+            ).rowcount
+            if deleted == 0:
+                break
+            cache_evictions_total.labels(reason="disk_size").inc(deleted)
+            excess -= deleted
+
+    def size(self) -> int:
+        """Number of stored entries."""
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+class RedisCache(CacheBackend):
+    """Redis-protocol cache tier shared by every replica.
+
+    A batch lookup is one ``MGET`` and a batch store one pipelined round
+    trip (``MSET``, or ``SET ... EX`` per entry when a TTL is set). The
+    client uses a connection pool with short socket timeouts, so a slow
+    server degrades to local-only caching instead of adding latency.
+    Eviction is left to the server's ``maxmemory-policy``.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = None,
+        client: Any = None,
+        prefix: str = "sentiment:",
+        ttl: float = None,
+        timeout_ms: float = None,
+        max_connections: int = None,
+        retry_seconds: float = None,
+    ):
+        """Initialize Redis cache; ``client`` overrides ``url`` (e.g. a fake in tests)."""
+        super().__init__(ttl=ttl, retry_seconds=retry_seconds)
+        self.prefix = prefix
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_REDIS_URL requires the redis package (pip install redis)")
+
+            if timeout_ms is None:
+                timeout_ms = settings.cache_redis_timeout_ms
+            timeout = timeout_ms / 1000
+            pool = redis.ConnectionPool.from_url(
+                url or settings.cache_redis_url,
+                max_connections=max_connections or settings.cache_redis_max_connections,
+                socket_timeout=timeout,
+                socket_connect_timeout=timeout,
+            )
+            client = redis.Redis(connection_pool=pool)
+            self.errors = (redis.RedisError, OSError)
+        self.client = client
+
+    def _get_many(self, keys: List[str]) -> Dict[str, dict]:
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+
+    def _set_many(self, entries: List[Tuple[str, dict]]) -> None:
+        if self.ttl:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in entries:
+                pipe.set(self.prefix + key, json.dumps(value), ex=max(1, int(self.ttl)))
+            pipe.execute()
+        else:
+            self.client.mset({self.prefix + key: json.dumps(value) for key, value in entries})
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    """Shared tier from settings: Redis if configured, else SQLite, else none."""
+    if settings.cache_redis_url:
+        return RedisCache(settings.cache_redis_url)
+    if settings.cache_disk_path:
+        return DiskCache(settings.cache_disk_path)
+    return None
 
 
 class PredictionCache:
-    """LRU cache for predictions."""
+    """Thread-safe LRU cache for predictions.
+
+    Recency is kept by an ``OrderedDict`` so lookups, updates and evictions
+    are O(1). Entries are bounded by count (``maxsize``) and optionally by
+    approximate memory (``max_bytes``) and age (``ttl`` seconds); a value of
+    0 disables the byte and age limits.
 
-    def __init__(self, maxsize: int = None):
+    Keys are built from the preprocessed text, so inputs that reach the model
+    identically share an entry, and from a model ``namespace`` (name,
+    revision and label set), so results never leak across model swaps.
+
+    An optional shared ``backend`` tier (``DiskCache`` or ``RedisCache``)
+    sits below the LRU: memory misses are fetched from it in one round trip
+    and promoted, and new entries are written to both.
+
+    ``get_many``/``set_many`` block on the backend and suit the inference
+    and job threads. Endpoints use ``aget_many``/``aset_many``, which run
+    backend reads on a worker thread and hand backend writes to a
+    write-behind thread, so the event loop never waits on SQLite or Redis.
+    The write-behind queue holds at most ``write_queue_size`` batches;
+    pending batches are merged into one backend write, and batches
+    arriving while it is full are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = None,
+        ttl: float = None,
+        max_bytes: int = None,
+        backend: Optional[CacheBackend] = None,
+        write_queue_size: int = None,
+    ):
         """Initialize cache."""
         self.maxsize = maxsize or settings.cache_size
-        self._cache = {}
-        self._access_order = []
+        self.ttl = ttl if ttl is not None else settings.cache_ttl_seconds
+        self.max_bytes = max_bytes if max_bytes is not None else settings.cache_max_bytes
+        # key -> (prediction, expires_at, size in bytes)
+        self._cache: "OrderedDict[str, Tuple[dict, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.namespace = ""
+        self.backend = backend
+        self.write_queue_size = write_queue_size or settings.cache_write_queue_size
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer_pid: Optional[int] = None
+
+    def set_namespace(self, namespace: str) -> None:
+        """Scope keys to a model identity, dropping entries from other models.
+
+        Backend entries are kept: their keys include the old namespace, so
+        they can no longer match and age out through eviction.
+        """
+        if namespace != self.namespace:
+            self.namespace = namespace
+            self.clear()
+
+    def _hash_key(self, text: str, processed: bool = False) -> str:
+        """Generate hash key for text; ``processed`` texts are already preprocessed."""
+        key = f"{self.namespace}\x00{text if processed else preprocess_text(text)}"
+        return xxhash.xxh3_128_hexdigest(key.encode())
+
+    def _remove(self, key: str, reason: str) -> None:
+        """Drop an entry; caller must hold the lock."""
+        _, _, nbytes = self._cache.pop(key)
+        self._bytes -= nbytes
+        cache_evictions_total.labels(reason=reason).inc()
+
+    def _update_gauges(self) -> None:
+        """Publish current size; caller must hold the lock."""
+        cache_entries.set(len(self._cache))
+        cache_bytes.set(self._bytes)
+
+    def _lookup(self, key: str, now: float) -> Optional[dict]:
+        """Look up one key; caller must hold the lock."""
+        entry = self._cache.get(key)
+        if entry is None:
+            cache_misses_total.inc()
+            return None
 
-    def _hash_key(self, text: str) -> str:
-        """Generate hash key for text."""
-        return hashlib.md5(text.encode()).hexdigest()
+        prediction, expires_at, _ = entry
+        if expires_at and expires_at <= now:
+            self._remove(key, "expired")
+            cache_misses_total.inc()
+            return None
+
+        # Move to end (most recently used)
+        self._cache.move_to_end(key)
+        cache_hits_total.inc()
+        return prediction
+
+    def _store(self, key: str, prediction: dict, expires_at: float) -> None:
+        """Insert or update one entry; caller must hold the lock."""
+        nbytes = _estimate_size(key) + _estimate_size(prediction)
+        if key in self._cache:
+            self._bytes -= self._cache[key][2]
+        self._cache[key] = (prediction, expires_at, nbytes)
+        self._cache.move_to_end(key)
+        self._bytes += nbytes
+
+    def _evict(self) -> None:
+        """Remove least recently used entries while over budget."""
+        while len(self._cache) > self.maxsize:
+            self._remove(next(iter(self._cache)), "size")
+        while self.max_bytes and self._bytes > self.max_bytes and self._cache:
+            self._remove(next(iter(self._cache)), "bytes")
 
     def get(self, text: str) -> Optional[dict]:
         """Get cached prediction."""
-        key = self._hash_key(text)
-        if key in self._cache:
-            # Move to end (most recently used)
-            self._access_order.remove(key)
-            self._access_order.append(key)
-            return self._cache[key]
-        return None
+        return self.get_many([text])[0]
+
+    def _memory_get(
+        self, texts: List[str], processed: bool = False
+    ) -> Tuple[List[str], List[Optional[dict]], float]:
+        """Look up texts in the memory tier; returns keys, predictions and the time."""
+        keys = [self._hash_key(text, processed) for text in texts]
+        with self._lock:
+            now = time.monotonic()
+            predictions = [self._lookup(key, now) for key in keys]
+            self._update_gauges()
+        return keys, predictions, now
+
+    def _promote(
+        self,
+        keys: List[str],
+        predictions: List[Optional[dict]],
+        found: Dict[str, dict],
+        now: float,
+    ) -> List[Optional[dict]]:
+        """Store backend hits in memory and merge them into the results."""
+        if not found:
+            return predictions
+        expires_at = now + self.ttl if self.ttl else 0.0
+        with self._lock:
+            for key, prediction in found.items():
+                self._store(key, prediction, expires_at)
+            self._evict()
+            self._update_gauges()
+        return [
+            found.get(key) if prediction is None else prediction
+            for key, prediction in zip(keys, predictions)
+        ]
+
+    def get_many(self, texts: List[str], processed: bool = False) -> List[Optional[dict]]:
+        """Get cached predictions for several texts under one lock.
+
+        Memory misses are then fetched from the backend tier, if any, in a
+        single round trip and promoted into memory. Pass ``processed=True``
+        when the texts are already ``preprocess_text`` output.
+        """
+        keys, predictions, now = self._memory_get(texts, processed)
+        if self.backend is not None:
+            missing = [key for key, prediction in zip(keys, predictions) if prediction is None]
+            predictions = self._promote(keys, predictions, self.backend.get_many(missing), now)
+        return predictions
+
+    async def aget(self, text: str) -> Optional[dict]:
+        """Get cached prediction without blocking the event loop."""
+        return (await self.aget_many([text]))[0]
+
+    async def aget_many(self, texts: List[str]) -> List[Optional[dict]]:
+        """``get_many`` for the event loop; the backend lookup runs on a worker thread."""
+        keys, predictions, now = self._memory_get(texts)
+        if self.backend is not None:
+            missing = [key for key, prediction in zip(keys, predictions) if prediction is None]
+            if missing:
+                found = await asyncio.to_thread(self.backend.get_many, missing)
+                predictions = self._promote(keys, predictions, found, now)
+        return predictions
+
+    def _memory_set(
+        self, items: Iterable[Tuple[str, dict]], processed: bool = False
+    ) -> List[Tuple[str, dict]]:
+        """Store predictions in the memory tier; returns the hashed entries."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        entries = [(self._hash_key(text, processed), prediction) for text, prediction in items]
+
+        with self._lock:
+            for key, prediction in entries:
+                self._store(key, prediction, expires_at)
+            self._evict()
+            self._update_gauges()
+        return entries
 
     def set(self, text: str, prediction: dict) -> None:
         """Cache prediction."""
-        key = self._hash_key(text)
+        self.set_many([(text, prediction)])
+
+    def set_many(self, items: Iterable[Tuple[str, dict]], processed: bool = False) -> None:
+        """Cache several predictions under one lock; ``processed`` as in ``get_many``."""
+        entries = self._memory_set(items, processed)
+        if self.backend is not None:
+            self.backend.set_many(entries)
 
-        # Remove oldest if cache is full
-        if len(self._cache) >= self.maxsize and key not in self._cache:
-            oldest_key = self._access_order.pop(0)
-            del self._cache[oldest_key]
+    async def aset(self, text: str, prediction: dict) -> None:
+        """Cache prediction without blocking the event loop."""
+        await self.aset_many([(text, prediction)])
 
-        # Add/update entry
-        self._cache[key] = prediction
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
+    async def aset_many(self, items: Iterable[Tuple[str, dict]]) -> None:
+        """``set_many`` for the event loop; the backend write happens in the background."""
+        entries = self._memory_set(items)
+        if self.backend is not None:
+            self._write_behind(entries)
+
+    def _write_behind(self, entries: List[Tuple[str, dict]]) -> None:
+        """Queue a backend write for this process's writer thread, or drop it if full."""
+        if self._write_queue is None or self._writer_pid != os.getpid():
+            # A forked worker inherits the queue but not the thread draining it
+            self._write_queue = queue.Queue(self.write_queue_size)
+            self._writer_pid = os.getpid()
+            threading.Thread(
+                target=self._drain_writes,
+                args=(self._write_queue,),
+                name="cache-writer",
+                daemon=True,
+            ).start()
+        try:
+            self._write_queue.put_nowait(entries)
+        except queue.Full:
+            cache_backend_writes_dropped_total.labels(backend=self.backend.name).inc(len(entries))
+
+    def _drain_writes(self, write_queue: queue.Queue) -> None:
+        """Write queued batches to the backend, merging whatever is pending."""
+        while True:
+            entries = list(write_queue.get())
+            batches = 1
+            while batches < self.write_queue_size:
+                try:
+                    entries.extend(write_queue.get_nowait())
+                except queue.Empty:
+                    break
+                batches += 1
+            try:
+                # Store errors are handled (and the tier bypassed) by the backend
+                self.backend.set_many(entries)
+            except Exception as e:
+                logger.warning(f"Cache write-behind failed: {str(e)}")
+            finally:
+                for _ in range(batches):
+                    write_queue.task_done()
+
+    def flush(self) -> None:
+        """Wait for queued background backend writes to finish."""
+        if self._write_queue is not None and self._writer_pid == os.getpid():
+            self._write_queue.join()
 
     def clear(self) -> None:
-        """Clear cache."""
-        self._cache.clear()
-        self._access_order.clear()
+        """Clear the in-memory tier."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            self._update_gauges()
 
     def size(self) -> int:
         """Get cache size."""
         return len(self._cache)
 
+    def nbytes(self) -> int:
+        """Get approximate cache size in bytes."""
+        return self._bytes
+
 
 # Global cache instance
-prediction_cache = PredictionCache()
+prediction_cache = PredictionCache(backend=_build_backend())
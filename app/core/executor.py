@@ -0,0 +1,104 @@
+"""Bounded inference executor that keeps the event loop free."""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import settings
+from app.utils.metrics import inference_queue_depth, inference_rejected_total
+from app.utils.timing import observe_stage
+
+
+class InferenceOverloadedError(Exception):
+    """Raised when the inference queue is full and a request is shed."""
+
+    def __init__(self, retry_after: int):
+        """Initialize error."""
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """Run blocking model calls on a dedicated thread pool.
+
+    At most ``max_concurrency`` calls run at once and at most ``max_queue``
+    more wait for a thread. Anything beyond that is rejected immediately
+    with ``InferenceOverloadedError`` so callers can answer 503 instead of
+    piling up behind a slow batch.
+    """
+
+    def __init__(self, max_concurrency: int = None, max_queue: int = None):
+        """Initialize executor."""
+        self.max_concurrency = max_concurrency or settings.inference_concurrency
+        self.max_queue = (
+            max_queue if max_queue is not None else settings.inference_queue_size
+        )
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="inference",
+        )
+        self._lock = threading.Lock()
+        self._admitted = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of calls running or waiting for a thread."""
+        return self._admitted
+
+    def _acquire(self) -> None:
+        """Admit one call or raise if the queue is full."""
+        with self._lock:
+            if self._admitted >= self.max_concurrency + self.max_queue:
+                inference_rejected_total.inc()
+                raise InferenceOverloadedError(settings.inference_retry_after)
+            self._admitted += 1
+            inference_queue_depth.set(self._admitted)
+
+    def _release(self, _: Future) -> None:
+        """Release a slot once the call has actually finished."""
+        with self._lock:
+            self._admitted -= 1
+            inference_queue_depth.set(self._admitted)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Admit and submit one call.
+
+        The call runs in a copy of the caller's context, so context variables
+        such as the endpoint label for stage metrics carry over to the pool
+        thread, and its wait for a thread is recorded as ``queue_wait``.
+        """
+        self._acquire()
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def call() -> Any:
+            observe_stage("queue_wait", time.perf_counter() - submitted)
+            return fn(*args)
+
+        try:
+            future = self._pool.submit(context.run, call)
+        except BaseException:
+            self._release(None)
+            raise
+        # Release on completion, not on await, so cancelled requests still
+        # count against the limit while their forward pass is running.
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the inference pool and await its result."""
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the inference pool from a background thread.
+
+        Used by background work so it shares the pool, and its concurrency
+        limit, with request traffic instead of competing for cores.
+        """
+        return self._submit(fn, *args).result()
+
+
+# Global executor instance
+inference_executor = InferenceExecutor()
@@ -0,0 +1,291 @@
+"""Background bulk scoring jobs spooled to local disk."""
+import fcntl
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.core.executor import InferenceOverloadedError, inference_executor
+from app.core.model import get_model
+from app.utils.logger import logger
+from app.utils.metrics import bulk_job_rows_total, bulk_jobs_total
+from app.utils.records import detect_format, iter_records
+from app.utils.timing import current_endpoint
+
+JOB_FILE = "job.json"
+LOCK_FILE = "job.lock"
+RESULTS_FILE = "results.jsonl"
+# Upload formats accepted for jobs; Parquet is left to scripts/score_file.py
+JOB_FORMATS = ("jsonl", "csv")
+JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class Job:
+    """State of one bulk scoring job, persisted as ``job.json``."""
+
+    job_id: str
+    filename: str
+    format: str
+    status: str = "queued"  # queued, running, completed or failed
+    rows_total: Optional[int] = None
+    rows_done: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        """Scoring throughput since the job started."""
+        if self.started_at is None:
+            return None
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.rows_done / elapsed if elapsed > 0 else None
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated time to completion at the current throughput."""
+        if self.status != "running" or self.rows_total is None:
+            return None
+        rate = self.rows_per_second
+        if not rate:
+            return None
+        return (self.rows_total - self.rows_done) / rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for API responses."""
+        data = asdict(self)
+        data["rows_per_second"] = self.rows_per_second
+        data["eta_seconds"] = self.eta_seconds
+        return data
+
+
+def _chunks(records: Iterator[Tuple[Any, str]], size: int) -> Iterator[List[Tuple[Any, str]]]:
+    """Group records into lists of at most ``size``."""
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class JobManager:
+    """Spool bulk inputs to disk and score them on a background thread.
+
+    Each job lives in ``<jobs_dir>/<job_id>/`` with its input file, a
+    ``results.jsonl`` written as rows are scored, and a ``job.json`` status
+    file. Only one chunk of rows is in memory at a time. Status is always
+    read from disk, so any worker process can answer a status request.
+
+    Jobs run at lower priority than request traffic: chunks go through the
+    shared inference executor, and the worker waits for it to be idle
+    before submitting each one, so interactive calls queue behind at most
+    one job chunk.
+
+    A job is run while holding an exclusive lock on its ``job.lock``, so
+    after a restart ``recover`` can tell orphaned jobs from ones another
+    worker process is still running, and a job queued by several workers
+    is scored once.
+    """
+
+    def __init__(self, jobs_dir: str = None, batch_size: int = None):
+        """Initialize job manager."""
+        self.jobs_dir = Path(jobs_dir or settings.jobs_dir)
+        self.batch_size = batch_size or settings.job_batch_size
+        self._queue: "queue.Queue[Job]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.jobs_dir / job_id
+
+    def input_path(self, job: Job) -> Path:
+        """Path of a job's spooled input file."""
+        return self._job_dir(job.job_id) / f"input.{job.format}"
+
+    def results_path(self, job: Job) -> Path:
+        """Path of a job's results file."""
+        return self._job_dir(job.job_id) / RESULTS_FILE
+
+    def _save(self, job: Job) -> None:
+        """Write the job state atomically."""
+        path = self._job_dir(job.job_id) / JOB_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(job), f)
+        os.replace(tmp_path, path)
+
+    def _claim(self, job_id: str):
+        """Lock a job for this process, or return None if another holds it."""
+        lock = open(self._job_dir(job_id) / LOCK_FILE, "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return None
+        return lock
+
+    def create(self, filename: str) -> Job:
+        """Create a job directory for an upload; raises ValueError on bad file types."""
+        file_format = detect_format(filename)
+        if file_format not in JOB_FORMATS:
+            supported = ", ".join(JOB_FORMATS)
+            raise ValueError(f"Unsupported job format '{file_format}', expected one of {supported}")
+        job = Job(job_id=uuid.uuid4().hex, filename=filename, format=file_format)
+        self._job_dir(job.job_id).mkdir(parents=True, exist_ok=True)
+        return job
+
+    def submit(self, job: Job) -> None:
+        """Queue a job whose input has been spooled."""
+        self._save(job)
+        self._queue.put(job)
+        self._ensure_worker()
+
+    def recover(self) -> int:
+        """Requeue jobs left queued or running by a process that has exited.
+
+        Jobs still locked by a live worker are left alone. Interrupted jobs
+        restart from the first row. Returns the number of jobs requeued.
+        """
+        if not self.jobs_dir.is_dir():
+            return 0
+
+        recovered = 0
+        for path in sorted(self.jobs_dir.iterdir()):
+            job = self.get(path.name)
+            if job is None or job.status not in ("queued", "running"):
+                continue
+            lock = self._claim(job.job_id)
+            if lock is None:
+                continue
+            with lock:
+                job.status = "queued"
+                job.rows_done = 0
+                job.started_at = None
+                self._save(job)
+            self._queue.put(job)
+            recovered += 1
+
+        if recovered:
+            logger.info(f"Requeued {recovered} interrupted bulk job(s)")
+            self._ensure_worker()
+        return recovered
+
+    def fail(self, job: Job, error: str) -> None:
+        """Mark a job failed."""
+        job.status = "failed"
+        job.error = error
+        job.finished_at = time.time()
+        self._save(job)
+        bulk_jobs_total.labels(status="failed").inc()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Load a job's current state, or None if unknown."""
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._job_dir(job_id) / JOB_FILE, encoding="utf-8") as f:
+                return Job(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name="jobs", daemon=True)
+                self._worker.start()
+
+    def _work(self) -> None:
+        current_endpoint.set("/jobs")
+        while True:
+            job = self._queue.get()
+            try:
+                self._process(job)
+            finally:
+                self._queue.task_done()
+
+    def _wait_for_idle(self) -> None:
+        """Yield to request traffic until the inference executor is idle."""
+        while inference_executor.pending > 0:
+            time.sleep(settings.job_idle_poll_ms / 1000)
+
+    def _score(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score one chunk on the shared executor, backing off on overload.
+
+        Uses ``predict_many``, which bypasses the prediction cache, so a
+        back-fill neither evicts the interactive hot set nor fills the
+        shared tiers with rows that are read once.
+        """
+        model = get_model()
+        while True:
+            self._wait_for_idle()
+            try:
+                return inference_executor.run_sync(model.predict_many, texts)
+            except InferenceOverloadedError as e:
+                time.sleep(e.retry_after)
+
+    def _process(self, job: Job) -> None:
+        lock = self._claim(job.job_id)
+        if lock is None:
+            # Already running in another worker process
+            return
+        with lock:
+            # Re-read, in case another process finished it since it was queued
+            current = self.get(job.job_id)
+            if current is not None and current.status == "queued":
+                self._run(current)
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        self._save(job)
+        logger.info("Bulk job started", extra={"job_id": job.job_id})
+
+        try:
+            input_path = self.input_path(job)
+            # Counting pass; also validates the whole file before scoring
+            job.rows_total = sum(1 for _ in iter_records(input_path, job.format))
+            self._save(job)
+
+            with open(self.results_path(job), "w", encoding="utf-8") as out:
+                records = iter_records(input_path, job.format)
+                for chunk in _chunks(records, self.batch_size):
+                    predictions = self._score([text for _, text in chunk])
+                    for (item_id, _), prediction in zip(chunk, predictions):
+                        job.rows_done += 1
+                        row: Dict[str, Any] = {"row": job.rows_done}
+                        if item_id is not None:
+                            row["id"] = item_id
+                        row["sentiment"] = prediction["sentiment"]
+                        row["confidence"] = prediction["confidence"]
+                        out.write(json.dumps(row) + "\n")
+                    out.flush()
+                    bulk_job_rows_total.inc(len(chunk))
+                    self._save(job)
+
+        except Exception as e:
+            logger.error(f"Bulk job {job.job_id} failed: {str(e)}", exc_info=True)
+            self.fail(job, str(e))
+            return
+
+        job.status = "completed"
+        job.finished_at = time.time()
+        self._save(job)
+        bulk_jobs_total.labels(status="completed").inc()
+        logger.info(
+            "Bulk job completed",
+            extra={"job_id": job.job_id, "total_processed": job.rows_done},
+        )
+
+
+# Global job manager instance
+job_manager = JobManager()
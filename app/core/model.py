@@ -1,17 +1,59 @@
 """Model loading and inference."""
+import contextvars
+import os
 import time
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import torch
 from transformers import (
+    AutoConfig,
     AutoModelForSequenceClassification,
     AutoTokenizer,
-    pipeline,
 )
+
 from app.config import settings
+from app.core.cache import prediction_cache
 from app.core.preprocessing import preprocess_text
 from app.utils.logger import logger
 from app.utils.metrics import model_loaded
+from app.utils.timing import observe_batch, observe_stage, set_model_labels
+
+
+# Raw label names seen on HF checkpoints, mapped to the standard classes
+LABEL_ALIASES = {
+    "pos": "positive",
+    "neg": "negative",
+    "neu": "neutral",
+    "label_0": "negative",  # Common HF format
+    "label_1": "neutral",
+    "label_2": "positive",
+}
+
+
+# How texts longer than the model's max length are turned into model inputs
+LONG_TEXT_STRATEGIES = ("head", "head_tail", "sliding_window")
+
+# Supported INFERENCE_BACKEND and QUANTIZATION values
+INFERENCE_BACKENDS = ("torch", "onnx")
+QUANTIZATION_MODES = ("none", "dynamic-int8")
+
+
+def canonical_label(label: str) -> str:
+    """Map a raw model label onto positive, negative or neutral."""
+    label_lower = label.lower()
+    if label_lower in ("positive", "negative", "neutral"):
+        return label_lower
+    if label_lower in LABEL_ALIASES:
+        return LABEL_ALIASES[label_lower]
+
+    # Try to infer from label name
+    if "pos" in label_lower:
+        return "positive"
+    if "neg" in label_lower:
+        return "negative"
+    return "neutral"
 
 
 class SentimentModel:
@@ -20,11 +62,14 @@ class SentimentModel:
     def __init__(self):
         """Initialize model."""
         self.model = None
+        self.onnx_model = None
         self.tokenizer = None
-        self.classifier = None
         self.device = self._get_device()
         self.classes = ["negative", "neutral", "positive"]
         self.label_map = {0: "negative", 1: "neutral", 2: "positive"}
+        self.label_index: Optional[torch.Tensor] = None
+        # Tokenizes ahead of the forward pass; created on first large call
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
         self._load_model()
 
     def _get_device(self) -> str:
@@ -44,32 +89,40 @@ class SentimentModel:
             logger.info(f"Loading model: {settings.model_name}")
             logger.info(f"Using device: {self.device}")
 
+            for name, value, allowed in (
+                ("INFERENCE_BACKEND", settings.inference_backend, INFERENCE_BACKENDS),
+                ("QUANTIZATION", settings.quantization, QUANTIZATION_MODES),
+                ("LONG_TEXT_STRATEGY", settings.long_text_strategy, LONG_TEXT_STRATEGIES),
+            ):
+                if value not in allowed:
+                    raise ValueError(
+                        f"Unknown {name} '{value}', expected one of {', '.join(allowed)}"
+                    )
+
             # Load tokenizer and model
             tokenizer = AutoTokenizer.from_pretrained(
                 settings.model_name,
+                revision=settings.model_revision,
                 token=settings.hf_token,
             )
 
-            model = AutoModelForSequenceClassification.from_pretrained(
-                settings.model_name,
-                token=settings.hf_token,
-            )
-
-            # Move model to device
-            model.to(self.device)
-            model.eval()
-
-            # Create pipeline
-            self.classifier = pipeline(
-                "sentiment-analysis",
-                model=model,
-                tokenizer=tokenizer,
-                device=0 if "cuda" in self.device else -1,
-                return_all_scores=True,
-            )
+            if settings.inference_backend == "onnx":
+                config = self._load_onnx(tokenizer)
+            else:
+                config = self._load_torch(tokenizer)
 
-            self.model = model
             self.tokenizer = tokenizer
+            self.max_length = min(tokenizer.model_max_length, 512)
+            self.pad_token_id = tokenizer.pad_token_id or 0
+            self.label_index = self._build_label_index(config)
+
+            # Namespace cache keys so a model swap never serves stale results
+            self.identity = self._model_identity(config)
+            prediction_cache.set_namespace(self.identity)
+            set_model_labels(
+                self._backend_name(),
+                f"{settings.model_name}@{self._model_revision(config)}",
+            )
 
             model_loaded.set(1)
             logger.info("Model loaded successfully")
@@ -79,12 +132,353 @@ class SentimentModel:
             model_loaded.set(0)
             raise
 
+    def _load_torch(self, tokenizer):
+        """Load the PyTorch sequence classification model."""
+        if settings.quantization == "dynamic-int8":
+            model = self._load_quantized(tokenizer)
+        else:
+            model = AutoModelForSequenceClassification.from_pretrained(
+                settings.model_name,
+                revision=settings.model_revision,
+                token=settings.hf_token,
+            )
+
+        # Move model to device
+        model.to(self.device)
+        model.eval()
+
+        self.model = model
+        return model.config
+
+    def _load_quantized(self, tokenizer):
+        """Load an int8 dynamically quantized model.
+
+        A ``quantized_state_dict.pt`` saved by ``training/optimize.py`` is
+        loaded directly when present; otherwise the fp32 weights are
+        quantized at load time.
+        """
+        from app.core.quantization import (
+            check_quantized_model,
+            load_reference,
+            model_size_mb,
+            quantize_dynamic_int8,
+        )
+
+        if self.device != "cpu":
+            logger.warning("Dynamic int8 quantization runs on CPU only, ignoring device")
+            self.device = "cpu"
+
+        state_dict_path = os.path.join(settings.model_name, settings.quantized_state_dict_file)
+        if os.path.isfile(state_dict_path):
+            logger.info(f"Loading quantized state dict: {state_dict_path}")
+            config = AutoConfig.from_pretrained(settings.model_name)
+            model = AutoModelForSequenceClassification.from_config(config).eval()
+            model = quantize_dynamic_int8(model)
+            model.load_state_dict(torch.load(state_dict_path, map_location="cpu"))
+            reference_model = None
+            reference = load_reference(settings.model_name)
+        else:
+            reference_model = AutoModelForSequenceClassification.from_pretrained(
+                settings.model_name,
+                revision=settings.model_revision,
+                token=settings.hf_token,
+            ).eval()
+            logger.info(f"FP32 model size: {model_size_mb(reference_model):.1f} MB")
+            model = quantize_dynamic_int8(reference_model)
+            reference = None
+
+        logger.info(f"Int8 model size: {model_size_mb(model):.1f} MB")
+        model.eval()
+        check_quantized_model(model, tokenizer, reference_model, reference)
+
+        return model
+
+    def _load_onnx(self, tokenizer):
+        """Load an exported ONNX graph and run it with onnxruntime on CPU."""
+        from app.core.onnx_backend import OnnxSentimentClassifier, resolve_onnx_path
+
+        self.device = "cpu"
+        config = AutoConfig.from_pretrained(
+            settings.model_name,
+            revision=settings.model_revision,
+            token=settings.hf_token,
+        )
+        model_path = resolve_onnx_path(settings.model_name)
+        logger.info(f"Using ONNX Runtime backend: {model_path}")
+
+        self.onnx_model = OnnxSentimentClassifier(model_path)
+        return config
+
+    def _model_revision(self, config) -> str:
+        """Pinned or resolved revision, or ``local`` for a local directory."""
+        revision = settings.model_revision or getattr(config, "_commit_hash", None)
+        return revision if isinstance(revision, str) else "local"
+
+    def _backend_name(self) -> str:
+        """Inference backend, including any quantization."""
+        backend = settings.inference_backend
+        if backend == "torch" and settings.quantization != "none":
+            backend = f"{backend}+{settings.quantization}"
+        return backend
+
+    def _model_identity(self, config) -> str:
+        """Build a stable identity from model name, revision and label set."""
+        revision = self._model_revision(config)
+
+        id2label = getattr(config, "id2label", None)
+        labels = (
+            [str(id2label[i]) for i in sorted(id2label)]
+            if isinstance(id2label, dict)
+            else self.classes
+        )
+
+        identity = f"{settings.model_name}@{revision}/{self._backend_name()}:{','.join(labels)}"
+        if settings.long_text_strategy != "head":
+            identity += (
+                f"#{settings.long_text_strategy}"
+                f"/{settings.max_tokens_per_text}/{settings.long_text_overlap}"
+            )
+        return identity
+
+    def _build_label_index(self, config) -> torch.Tensor:
+        """Map each logits column to its standard class index, once at load."""
+        id2label = config.id2label
+        return torch.tensor(
+            [
+                self.classes.index(canonical_label(str(id2label[i])))
+                for i in range(len(id2label))
+            ],
+            dtype=torch.long,
+        )
+
+    def _plan_batches(self, lengths: List[int]) -> List[List[int]]:
+        """Group text indices into length-bucketed batches under a token budget.
+
+        Texts are sorted by tokenized length so each batch pads to a similar
+        length, and a batch is closed once ``longest * count`` would exceed
+        ``MAX_BATCH_TOKENS`` or it holds ``MAX_BATCH_SIZE`` texts.
+        """
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+
+        batches: List[List[int]] = []
+        current: List[int] = []
+        for i in order:
+            # Sorted ascending, so the newest text is always the longest
+            if current and (
+                lengths[i] * (len(current) + 1) > settings.max_batch_tokens
+                or len(current) >= settings.max_batch_size
+            ):
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def _collate(self, sequences: List[List[int]]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Pad token id sequences into input_ids and attention_mask tensors."""
+        width = max(len(ids) for ids in sequences)
+        input_ids = torch.full((len(sequences), width), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+        for row, ids in enumerate(sequences):
+            input_ids[row, : len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, : len(ids)] = 1
+        return input_ids, attention_mask
+
+    def _forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Run the model and return class probabilities."""
+        if self.onnx_model is not None:
+            logits = self.onnx_model(input_ids, attention_mask)
+        else:
+            with torch.inference_mode():
+                logits = self.model(
+                    input_ids=input_ids.to(self.device),
+                    attention_mask=attention_mask.to(self.device),
+                ).logits
+        return torch.softmax(logits.float().cpu(), dim=-1)
+
+    def _class_scores(self, probs: torch.Tensor) -> torch.Tensor:
+        """Fold model columns onto the standard classes (max on duplicates)."""
+        index = self.label_index.expand(probs.shape[0], -1)
+        scores = probs.new_zeros((probs.shape[0], len(self.classes)))
+        return scores.scatter_reduce_(1, index, probs, reduce="amax")
+
+    def _segments(self, ids: List[int]) -> List[List[int]]:
+        """Split one text's token ids into model-sized segments.
+
+        ``head_tail`` keeps the first quarter and last three quarters of the
+        window, since the tail of a long review often carries its verdict.
+        ``sliding_window`` covers the text with overlapping windows; when
+        that would exceed ``MAX_TOKENS_PER_TEXT``, evenly spaced windows
+        including the first and last are kept, so the cost of one text is
+        bounded.
+        """
+        size = self.max_length - self.tokenizer.num_special_tokens_to_add()
+        if len(ids) <= size:
+            return [ids]
+
+        if settings.long_text_strategy == "head_tail":
+            head = size // 4
+            return [ids[:head] + ids[len(ids) - (size - head):]]
+
+        stride = max(1, size - settings.long_text_overlap)
+        starts = list(range(0, len(ids) - size, stride)) + [len(ids) - size]
+        max_windows = max(1, settings.max_tokens_per_text // size)
+        if len(starts) > max_windows:
+            if max_windows == 1:
+                starts = starts[:1]
+            else:
+                last = len(starts) - 1
+                starts = [starts[round(k * last / (max_windows - 1))] for k in range(max_windows)]
+        return [ids[start: start + size] for start in starts]
+
+    def _prepare(
+        self,
+        processed_texts: List[str],
+        offset: int,
+    ) -> List[Tuple[List[int], List[int], torch.Tensor, torch.Tensor]]:
+        """Tokenize, bucket and collate one chunk of texts.
+
+        With the default ``head`` strategy each text is one truncated
+        sequence; otherwise long texts become several segments. Returns
+        ``(owners, weights, input_ids, attention_mask)`` per batch, where
+        ``owners`` are text indices shifted by ``offset`` into the caller's
+        list and ``weights`` are segment token counts used to aggregate.
+        Segments of different texts share batches.
+        """
+        start = time.perf_counter()
+        if settings.long_text_strategy == "head":
+            input_ids = self.tokenizer(
+                processed_texts,
+                truncation=True,
+                max_length=self.max_length,
+            )["input_ids"]
+            owners = list(range(len(processed_texts)))
+            weights = [1] * len(processed_texts)
+        else:
+            raw_ids = self.tokenizer(
+                processed_texts,
+                add_special_tokens=False,
+                verbose=False,
+            )["input_ids"]
+            input_ids, owners, weights = [], [], []
+            for i, ids in enumerate(raw_ids):
+                for segment in self._segments(ids):
+                    input_ids.append(self.tokenizer.build_inputs_with_special_tokens(segment))
+                    owners.append(i)
+                    weights.append(max(1, len(segment)))
+
+        lengths = [len(ids) for ids in input_ids]
+
+        prepared = []
+        for indices in self._plan_batches(lengths):
+            batch_ids, batch_mask = self._collate([input_ids[i] for i in indices])
+            prepared.append(
+                (
+                    [offset + owners[i] for i in indices],
+                    [weights[i] for i in indices],
+                    batch_ids,
+                    batch_mask,
+                )
+            )
+
+        observe_stage("tokenize", time.perf_counter() - start)
+        return prepared
+
+    def _prepared_chunks(
+        self,
+        processed_texts: List[str],
+    ) -> Iterator[List[Tuple[List[int], List[int], torch.Tensor, torch.Tensor]]]:
+        """Yield prepared chunks, tokenizing ahead of the forward pass.
+
+        Inputs larger than ``TOKENIZE_CHUNK_SIZE`` are split into chunks,
+        and up to ``TOKENIZE_PREFETCH_DEPTH`` chunks are tokenized and
+        collated on a background thread while the caller runs the model on
+        the current one. Both the tokenizer and torch kernels release the
+        GIL, so the two stages overlap. Length bucketing then happens within
+        each chunk rather than across the whole input.
+        """
+        chunk_size = settings.tokenize_chunk_size
+        depth = settings.tokenize_prefetch_depth
+        if depth <= 0 or chunk_size <= 0 or len(processed_texts) <= chunk_size:
+            yield self._prepare(processed_texts, 0)
+            return
+
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="tokenize",
+            )
+
+        offsets = iter(range(0, len(processed_texts), chunk_size))
+        pending = deque()
+
+        def submit_next() -> None:
+            for offset in offsets:
+                chunk = processed_texts[offset: offset + chunk_size]
+                # Run in the caller's context so stage metrics keep its labels
+                context = contextvars.copy_context()
+                pending.append(
+                    self._prefetch_pool.submit(context.run, self._prepare, chunk, offset)
+                )
+                return
+
+        for _ in range(depth):
+            submit_next()
+        while pending:
+            prepared = pending.popleft().result()
+            submit_next()
+            yield prepared
+
+    def _classify(self, processed_texts: List[str]) -> List[Dict[str, Any]]:
+        """Run the classifier over non-empty preprocessed texts.
+
+        Texts are tokenized once, batched by length, scored as one logits
+        matrix per batch, and returned in input order. Scores of a text
+        split into several segments are averaged, weighted by segment length.
+        """
+        totals = torch.zeros((len(processed_texts), len(self.classes)))
+        weights = torch.zeros(len(processed_texts))
+        postprocess_time = 0.0
+
+        for prepared in self._prepared_chunks(processed_texts):
+            for owners, segment_weights, batch_ids, batch_mask in prepared:
+                start = time.perf_counter()
+                probs = self._forward(batch_ids, batch_mask)
+                forward_done = time.perf_counter()
+                observe_stage("forward", forward_done - start)
+                observe_batch(*batch_ids.shape, int(batch_mask.sum()))
+
+                scores = self._class_scores(probs)
+                owner_index = torch.tensor(owners, dtype=torch.long)
+                segment_weight = torch.tensor(segment_weights, dtype=scores.dtype)
+                totals.index_add_(0, owner_index, scores * segment_weight.unsqueeze(1))
+                weights.index_add_(0, owner_index, segment_weight)
+                postprocess_time += time.perf_counter() - forward_done
+
+        start = time.perf_counter()
+        scores = totals / weights.unsqueeze(1)
+        best = scores.argmax(dim=-1).tolist()
+
+        results = [
+            {
+                "sentiment": self.classes[label_idx],
+                "confidence": row[label_idx],
+                "scores": dict(zip(self.classes, row)),
+            }
+            for row, label_idx in zip(scores.tolist(), best)
+        ]
+        observe_stage("postprocess", postprocess_time + time.perf_counter() - start)
+        return results
+
     def predict(self, text: str) -> Dict[str, Any]:
         """Predict sentiment for a single text."""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Preprocess
         processed_text = preprocess_text(text)
+        observe_stage("preprocess", time.perf_counter() - start_time)
 
         if not processed_text:
             return {
@@ -98,179 +492,108 @@ class SentimentModel:
             }
 
         # Predict
-        results = self.classifier(processed_text)
-
-        # Process results - handle different label formats
-        scores = {}
-        label_mapping = {
-            "positive": "positive",
-            "negative": "negative",
-            "neutral": "neutral",
-            "pos": "positive",
-            "neg": "negative",
-            "neu": "neutral",
-            "POSITIVE": "positive",
-            "NEGATIVE": "negative",
-            "NEUTRAL": "neutral",
-            "LABEL_0": "negative",  # Common HF format
-            "LABEL_1": "neutral",
-            "LABEL_2": "positive",
-        }
-
-        for result in results[0]:
-            label = result["label"]
-            score = result["score"]
-            # Normalize label
-            normalized_label = label_mapping.get(label, label.lower())
-            # Map to standard labels
-            if normalized_label not in ["positive", "negative", "neutral"]:
-                # Try to infer from label name
-                label_lower = label.lower()
-                if "pos" in label_lower:
-                    normalized_label = "positive"
-                elif "neg" in label_lower:
-                    normalized_label = "negative"
-                else:
-                    normalized_label = "neutral"
-
-            # Accumulate scores (in case of duplicate labels)
-            if normalized_label in scores:
-                scores[normalized_label] = max(scores[normalized_label], score)
-            else:
-                scores[normalized_label] = score
+        result = self._classify([processed_text])[0]
+
+        processing_time = (time.perf_counter() - start_time) * 1000  # Convert to ms
+        result["processing_time_ms"] = processing_time
+
+        return result
 
-        # Ensure all classes are present
-        for cls in self.classes:
-            if cls not in scores:
-                scores[cls] = 0.0
+    def predict_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Predict full single-text results for several texts in one pass.
+
+        Used by the micro-batcher: every entry has the same shape as a
+        ``predict`` result, and ``processing_time_ms`` is the wall time of
+        the shared forward pass.
+        """
+        start_time = time.perf_counter()
+
+        processed_texts = [preprocess_text(text) for text in texts]
+        observe_stage("preprocess", time.perf_counter() - start_time)
+        valid_indices = [i for i, text in enumerate(processed_texts) if text]
+        predictions = self._classify([processed_texts[i] for i in valid_indices])
+
+        results: List[Dict[str, Any]] = [
+            {
+                "sentiment": "neutral",
+                "confidence": 0.5,
+                "scores": {
+                    "positive": 0.33,
+                    "negative": 0.33,
+                    "neutral": 0.34,
+                },
+            }
+            for _ in texts
+        ]
+        for i, prediction in zip(valid_indices, predictions):
+            results[i] = prediction
 
-        # Get predicted sentiment (highest score)
-        predicted_label = max(scores.items(), key=lambda x: x[1])[0]
-        confidence = scores[predicted_label]
+        processing_time = (time.perf_counter() - start_time) * 1000
+        for result in results:
+            result["processing_time_ms"] = processing_time
 
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        return results
 
-        return {
-            "sentiment": predicted_label,
-            "confidence": confidence,
-            "scores": scores,
-            "processing_time_ms": processing_time,
-        }
+    def predict_batch(self, texts: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+        """Predict sentiment for multiple texts.
 
-    def predict_batch(self, texts: List[str]) -> List[Dict[str, any]]:
-        """Predict sentiment for multiple texts."""
-        start_time = time.time()
+        Cached results are reused and only the misses go through the model;
+        new results are written back so ``/predict`` can reuse them too.
+        Each item carries a ``cached`` flag.
+        """
+        start_time = time.perf_counter()
 
         # Preprocess all texts
         processed_texts = [preprocess_text(text) for text in texts]
+        observe_stage("preprocess", time.perf_counter() - start_time)
 
-        # Filter out empty texts
-        valid_texts = []
-        valid_indices = []
+        # Bulk cache lookup on the preprocessed texts, then collect unique non-empty misses
+        cached = prediction_cache.get_many(processed_texts, processed=True)
+        misses: Dict[str, List[int]] = {}
         for i, text in enumerate(processed_texts):
-            if text:
-                valid_texts.append(text)
-                valid_indices.append(i)
-
-        if not valid_texts:
-            # Return neutral predictions for all
-            return [
-                {
-                    "text": text,
-                    "sentiment": "neutral",
-                    "confidence": 0.5,
-                }
-                for text in texts
-            ]
-
-        # Predict in batches
-        batch_size = settings.max_batch_size
-        predictions = []
-
-        for i in range(0, len(valid_texts), batch_size):
-            batch = valid_texts[i: i + batch_size]
-            batch_results = self.classifier(batch)
-
-            for j, result in enumerate(batch_results):
-                # Process results - handle different label formats
-                scores = {}
-                label_mapping = {
-                    "positive": "positive",
-                    "negative": "negative",
-                    "neutral": "neutral",
-                    "pos": "positive",
-                    "neg": "negative",
-                    "neu": "neutral",
-                    "POSITIVE": "positive",
-                    "NEGATIVE": "negative",
-                    "NEUTRAL": "neutral",
-                    "LABEL_0": "negative",
-                    "LABEL_1": "neutral",
-                    "LABEL_2": "positive",
-                }
-
-                for item in result:
-                    label = item["label"]
-                    score = item["score"]
-                    # Normalize label
-                    normalized_label = label_mapping.get(label, label.lower())
-                    # Map to standard labels
-                    if normalized_label not in [
-                        "positive",
-                        "negative",
-                        "neutral",
-                    ]:
-                        label_lower = label.lower()
-                        if "pos" in label_lower:
-                            normalized_label = "positive"
-                        elif "neg" in label_lower:
-                            normalized_label = "negative"
-                        else:
-                            normalized_label = "neutral"
-
-                    # Accumulate scores
-                    if normalized_label in scores:
-                        scores[normalized_label] = max(
-                            scores[normalized_label],
-                            score,
-                        )
-                    else:
-                        scores[normalized_label] = score
-
-                # Ensure all classes are present
-                for cls in self.classes:
-                    if cls not in scores:
-                        scores[cls] = 0.0
-
-                # Get predicted sentiment
-                predicted_label = max(scores.items(), key=lambda x: x[1])[0]
-                confidence = scores[predicted_label]
-
-                predictions.append(
-                    {
-                        "text": texts[valid_indices[i + j]],
-                        "sentiment": predicted_label,
-                        "confidence": confidence,
-                    }
-                )
+            if text and cached[i] is None:
+                misses.setdefault(text, []).append(i)
+
+        # Predict misses in batches
+        full_results: List[Optional[Dict[str, Any]]] = list(cached)
+        if misses:
+            miss_texts = list(misses)
+            predictions = self._classify(miss_texts)
+            per_item_time = (time.perf_counter() - start_time) * 1000 / len(miss_texts)
+
+            new_entries = []
+            for text, prediction in zip(miss_texts, predictions):
+                prediction["processing_time_ms"] = per_item_time
+                indices = misses[text]
+                for i in indices:
+                    full_results[i] = prediction
+                new_entries.append((text, prediction))
+            prediction_cache.set_many(new_entries, processed=True)
 
         # Fill in empty texts with neutral predictions
         result_predictions = []
-        prediction_idx = 0
         for i, text in enumerate(texts):
-            if i in valid_indices:
-                result_predictions.append(predictions[prediction_idx])
-                prediction_idx += 1
-            else:
+            result = full_results[i]
+            if result is None:
                 result_predictions.append(
                     {
                         "text": text,
                         "sentiment": "neutral",
                         "confidence": 0.5,
+                        "cached": False,
+                    }
+                )
+            else:
+                result_predictions.append(
+                    {
+                        "text": text,
+                        "sentiment": result["sentiment"],
+                        "confidence": result["confidence"],
+                        "cached": cached[i] is not None,
                     }
                 )
 
-        processing_time = (time.time() - start_time) * 1000
+        processing_time = (time.perf_counter() - start_time) * 1000
 
         return result_predictions, processing_time
 
@@ -0,0 +1,73 @@
+"""ONNX Runtime inference backend."""
+import os
+
+import numpy as np
+import onnxruntime as ort
+import torch
+
+from app.config import settings
+
+
+def resolve_onnx_path(model_name: str) -> str:
+    """Locate the exported graph in a local directory or on the Hub."""
+    if os.path.isdir(model_name):
+        return os.path.join(model_name, settings.onnx_model_file)
+
+    from huggingface_hub import hf_hub_download
+
+    return hf_hub_download(
+        model_name,
+        settings.onnx_model_file,
+        revision=settings.model_revision,
+        token=settings.hf_token,
+    )
+
+
+class OnnxSentimentClassifier:
+    """Run a graph exported by ``training/optimize.py --method onnx``.
+
+    Calling the classifier takes the same padded ``input_ids`` and
+    ``attention_mask`` tensors as the PyTorch model and returns logits, so
+    ``SentimentModel`` post-processes both backends identically.
+    """
+
+    def __init__(self, model_path: str):
+        """Initialize classifier; the session is created on first use."""
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"ONNX model not found: {model_path}")
+        self.model_path = model_path
+        self._session = None
+        self._pid = None
+
+    @property
+    def session(self) -> ort.InferenceSession:
+        """ONNX Runtime session of the current process.
+
+        ORT fixes its thread counts when a session is created, so the
+        session is built lazily in each worker, after ``apply_worker_slot``
+        has set the torch thread budget it copies; a model preloaded before
+        fork would otherwise keep the launcher's single thread. Left at its
+        default, ORT would start a thread per core in every worker.
+        """
+        if self._session is None or self._pid != os.getpid():
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.intra_op_num_threads = torch.get_num_threads()
+            options.inter_op_num_threads = 1
+            self._session = ort.InferenceSession(
+                self.model_path,
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+            self._pid = os.getpid()
+        return self._session
+
+    def __call__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Return logits for a padded batch."""
+        session = self.session
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        feeds = {
+            node.name: inputs[node.name].numpy().astype(np.int64, copy=False)
+            for node in session.get_inputs()
+        }
+        return torch.from_numpy(session.run(None, feeds)[0])
@@ -0,0 +1,265 @@
+"""Opt-in per-request profiling."""
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import queue
+import random
+import re
+import secrets
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.metrics import profiles_captured_total
+from app.utils.timing import current_endpoint
+
+# Request header carrying PROFILE_TOKEN to profile that request
+PROFILE_HEADER = "X-Profile-Token"
+
+# Response header naming the capture, when one was taken
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+METADATA_FILE = "profile.json"
+
+# Downloadable artifacts of a capture, by name
+ARTIFACTS = {
+    "pstats": "profile.pstats",  # cProfile stats, open with pstats or snakeviz
+    "torch": "torch_ops.txt",  # torch operator table
+    "trace": "torch_trace.json",  # chrome://tracing / Perfetto timeline
+}
+
+TOP_N = 15
+
+# Captures waiting to be written; more are dropped rather than held in memory
+MAX_PENDING_SAVES = 4
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class RequestProfiler:
+    """Capture a Python and torch operator profile of selected requests.
+
+    A request is profiled when it carries ``PROFILE_TOKEN`` in the
+    ``X-Profile-Token`` header, or is picked at ``PROFILE_SAMPLE_RATE``.
+    With neither configured, ``should_profile`` returns after two attribute
+    reads and the request path is unchanged. Each capture is a directory
+    under ``PROFILE_DIR``; only the newest ``PROFILE_MAX_CAPTURES`` are kept.
+    Captures are written by a background thread after the profiled call
+    returns, so the request does not wait for trace export. At most
+    ``MAX_PENDING_SAVES`` captures wait to be written; beyond that a
+    capture is dropped and the request gets no profile id.
+    """
+
+    def __init__(self, directory: str = None, max_captures: int = None):
+        """Initialize profiler."""
+        self.directory = Path(directory or settings.profile_dir)
+        self.max_captures = (
+            max_captures if max_captures is not None else settings.profile_max_captures
+        )
+        # The torch profiler is process-wide, so one capture at a time
+        self._lock = threading.Lock()
+        self._save_queue: Optional[queue.Queue] = None
+        self._writer_pid: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any request can be profiled."""
+        return bool(settings.profile_token) or settings.profile_sample_rate > 0
+
+    def token_matches(self, token: Optional[str]) -> bool:
+        """Constant-time check of a caller-supplied token."""
+        return bool(settings.profile_token and token) and secrets.compare_digest(
+            token.encode(), settings.profile_token.encode()
+        )
+
+    def should_profile(self, headers) -> Optional[str]:
+        """Return the trigger ("header" or "sample") if this request is profiled."""
+        if not self.enabled:
+            return None
+        if self.token_matches(headers.get(PROFILE_HEADER)):
+            return "header"
+        if settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate:
+            return "sample"
+        return None
+
+    def capture(
+        self,
+        trigger: str,
+        fn: Callable[..., Any],
+        *args: Any,
+    ) -> Tuple[Any, Optional[str]]:
+        """Run ``fn(*args)`` under the profilers and queue the capture to be saved.
+
+        Runs on the inference thread, since cProfile only sees the thread
+        it is enabled on. Returns ``(result, profile_id)``; the id is None
+        when another capture was already running and the call ran unprofiled.
+        The capture's artifacts appear under the id once it has been saved.
+        """
+        if not self._lock.acquire(blocking=False):
+            return fn(*args), None
+
+        try:
+            python_profile = cProfile.Profile()
+            torch_profile = self._torch_profiler()
+            start = time.perf_counter()
+            with torch_profile:
+                python_profile.enable()
+                try:
+                    result = fn(*args)
+                finally:
+                    python_profile.disable()
+            duration_ms = (time.perf_counter() - start) * 1000
+        finally:
+            self._lock.release()
+
+        profile_id = uuid.uuid4().hex
+        metadata = {
+            "profile_id": profile_id,
+            "endpoint": current_endpoint.get(),
+            "trigger": trigger,
+            "created_at": time.time(),
+            "duration_ms": duration_ms,
+        }
+        if not self._queue_save(metadata, python_profile, torch_profile):
+            profiles_captured_total.labels(trigger=trigger, status="dropped").inc()
+            return result, None
+        return result, profile_id
+
+    def _queue_save(self, *capture: Any) -> bool:
+        """Hand a capture to this process's writer thread; False if too many are pending."""
+        if self._save_queue is None or self._writer_pid != os.getpid():
+            # A forked worker inherits the queue but not the thread draining it
+            self._save_queue = queue.Queue(MAX_PENDING_SAVES)
+            self._writer_pid = os.getpid()
+            threading.Thread(
+                target=self._drain_saves,
+                args=(self._save_queue,),
+                name="profile-writer",
+                daemon=True,
+            ).start()
+        try:
+            self._save_queue.put_nowait(capture)
+        except queue.Full:
+            return False
+        return True
+
+    def _drain_saves(self, save_queue: queue.Queue) -> None:
+        """Write queued captures one at a time."""
+        while True:
+            metadata, python_profile, torch_profile = save_queue.get()
+            try:
+                self._save(metadata, python_profile, torch_profile)
+                status = "saved"
+            except Exception as e:
+                # Never fail the request because a capture could not be written
+                logger.warning(f"Could not save profile: {str(e)}")
+                status = "failed"
+            finally:
+                save_queue.task_done()
+            profiles_captured_total.labels(trigger=metadata["trigger"], status=status).inc()
+
+    def flush(self) -> None:
+        """Wait until queued captures have been saved."""
+        if self._save_queue is not None and self._writer_pid == os.getpid():
+            self._save_queue.join()
+
+    def _torch_profiler(self):
+        """Torch operator profiler, or a no-op for the ONNX backend."""
+        if settings.inference_backend == "onnx":
+            return contextlib.nullcontext()
+
+        from torch.profiler import ProfilerActivity, profile
+
+        return profile(activities=[ProfilerActivity.CPU], record_shapes=True)
+
+    def _save(self, metadata, python_profile, torch_profile) -> None:
+        path = self.directory / metadata["profile_id"]
+        path.mkdir(parents=True, exist_ok=True)
+
+        python_profile.dump_stats(str(path / ARTIFACTS["pstats"]))
+        stats = pstats.Stats(python_profile).stats
+        top_functions = [
+            {
+                "function": f"{func[2]} ({func[0]}:{func[1]})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for func, (_, calls, own, cumulative, _) in sorted(
+                stats.items(), key=lambda item: item[1][3], reverse=True
+            )[:TOP_N]
+        ]
+
+        top_ops = []
+        artifacts = ["pstats"]
+        if not isinstance(torch_profile, contextlib.nullcontext):
+            averages = torch_profile.key_averages()
+            (path / ARTIFACTS["torch"]).write_text(
+                averages.table(sort_by="self_cpu_time_total", row_limit=50)
+            )
+            torch_profile.export_chrome_trace(str(path / ARTIFACTS["trace"]))
+            top_ops = [
+                {
+                    "op": event.key,
+                    "calls": event.count,
+                    "self_cpu_ms": round(event.self_cpu_time_total / 1000, 3),
+                }
+                for event in sorted(
+                    averages, key=lambda event: event.self_cpu_time_total, reverse=True
+                )[:TOP_N]
+            ]
+            artifacts += ["torch", "trace"]
+
+        metadata = {
+            **metadata,
+            "artifacts": artifacts,
+            "top_functions": top_functions,
+            "top_torch_ops": top_ops,
+        }
+        # Written last, so a capture is only listed once it is complete
+        with open(path / METADATA_FILE, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest captures beyond ``max_captures``."""
+        captures = sorted(
+            (p for p in self.directory.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for old in captures[self.max_captures:]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Saved captures, newest first."""
+        if not self.directory.is_dir():
+            return []
+
+        profiles = []
+        for path in self.directory.iterdir():
+            try:
+                with open(path / METADATA_FILE, encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+    def artifact_path(self, profile_id: str, artifact: str) -> Optional[Path]:
+        """Path of one artifact of a capture, or None if it does not exist."""
+        if not _PROFILE_ID.match(profile_id) or artifact not in ARTIFACTS:
+            return None
+        path = self.directory / profile_id / ARTIFACTS[artifact]
+        return path if path.is_file() else None
+
+
+# Global profiler instance
+request_profiler = RequestProfiler()
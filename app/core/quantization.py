@@ -0,0 +1,105 @@
+"""Int8 dynamic quantization helpers for serving."""
+import io
+import json
+import os
+from typing import List, Optional
+
+import torch
+
+from app.config import settings
+from app.utils.logger import logger
+
+# Reference inputs for the startup sanity check
+REFERENCE_TEXTS = [
+    "This product is amazing, I love it!",
+    "Terrible experience, would not recommend.",
+    "It's okay, nothing special but works fine.",
+    "Excellent service and fast delivery.",
+    "Poor quality product, very disappointed.",
+]
+
+REFERENCE_FILE = "quantization_reference.json"
+
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """Quantize Linear layers to int8 with dynamic activation scaling."""
+    return torch.quantization.quantize_dynamic(
+        model,
+        {torch.nn.Linear},
+        dtype=torch.qint8,
+    )
+
+
+def model_size_mb(model: torch.nn.Module) -> float:
+    """Serialized size of a model's state dict in MB.
+
+    Quantized Linear weights live in packed params rather than
+    ``parameters()``, so the serialized size is the reliable measure.
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / (1024 * 1024)
+
+
+def reference_probabilities(
+    model: torch.nn.Module,
+    tokenizer,
+    texts: List[str],
+) -> torch.Tensor:
+    """Class probabilities for the reference texts."""
+    encoded = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+    with torch.inference_mode():
+        logits = model(**encoded).logits
+    return torch.softmax(logits, dim=-1)
+
+
+def load_reference(model_dir: str) -> Optional[dict]:
+    """Load fp32 reference outputs saved next to a quantized state dict."""
+    path = os.path.join(model_dir, REFERENCE_FILE)
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_quantized_model(
+    model: torch.nn.Module,
+    tokenizer,
+    reference_model: Optional[torch.nn.Module] = None,
+    reference: Optional[dict] = None,
+) -> bool:
+    """Compare int8 outputs against fp32 on a few reference inputs.
+
+    The fp32 outputs come from ``reference_model`` when quantizing at load
+    time, or from the ``reference`` file written by ``training/optimize.py``.
+    The check passes when every reference keeps its predicted class and no
+    probability moves by more than ``QUANTIZATION_TOLERANCE``. A failure is
+    logged, and raises when ``QUANTIZATION_STRICT`` is set.
+    """
+    if reference_model is not None:
+        texts = REFERENCE_TEXTS
+        expected = reference_probabilities(reference_model, tokenizer, texts)
+    elif reference is not None:
+        texts = reference["texts"]
+        expected = torch.tensor(reference["probabilities"])
+    else:
+        logger.warning("No fp32 reference available, skipping quantization check")
+        return True
+
+    actual = reference_probabilities(model, tokenizer, texts)
+    max_diff = (actual - expected).abs().max().item()
+    agreement = (actual.argmax(dim=-1) == expected.argmax(dim=-1)).float().mean().item()
+    passed = agreement == 1.0 and max_diff <= settings.quantization_tolerance
+
+    message = (
+        f"Quantization check on {len(texts)} references: "
+        f"agreement={agreement:.2f}, max_prob_diff={max_diff:.4f}"
+    )
+    if passed:
+        logger.info(message)
+    elif settings.quantization_strict:
+        raise RuntimeError(f"{message} exceeds tolerance")
+    else:
+        logger.warning(f"{message} exceeds tolerance")
+
+    return passed
@@ -0,0 +1,131 @@
+"""CPU topology detection and per-worker thread layout."""
+import math
+import os
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from app.config import settings
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+@dataclass
+class WorkerSlot:
+    """CPU resources assigned to one serving worker process."""
+
+    worker_index: int
+    workers: int
+    cpu_budget: float
+    intra_op_threads: int
+    inter_op_threads: int
+    cpus: Optional[List[int]] = None
+
+    def to_dict(self) -> dict:
+        """Serialize for API responses."""
+        return asdict(self)
+
+
+# Slot of the current worker process, set by apply_worker_slot
+current_slot: Optional[WorkerSlot] = None
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """CPU quota from cgroup v2 or v1, in cores; None when unlimited."""
+    try:
+        with open(CGROUP_V2_CPU_MAX) as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(CGROUP_V1_QUOTA) as f:
+            quota = int(f.read())
+        with open(CGROUP_V1_PERIOD) as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def cpu_budget() -> float:
+    """Usable cores: the affinity set, capped by any cgroup quota."""
+    cpus = float(len(available_cpus()))
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def plan_layout(
+    workers: int = None,
+    intra_op_threads: int = None,
+    inter_op_threads: int = None,
+    pin: bool = None,
+) -> List[WorkerSlot]:
+    """Split the CPU budget evenly across ``workers`` processes.
+
+    Each worker gets ``floor(budget / workers)`` intra-op threads (at least
+    one) unless ``INTRA_OP_THREADS`` overrides it. With ``CPU_AFFINITY``
+    enabled, workers are pinned to disjoint CPU ranges when there are
+    enough CPUs to go around.
+    """
+    workers = workers or settings.workers
+    intra = intra_op_threads if intra_op_threads is not None else settings.intra_op_threads
+    inter = inter_op_threads if inter_op_threads is not None else settings.inter_op_threads
+    pin = settings.cpu_affinity if pin is None else pin
+
+    budget = cpu_budget()
+    share = budget / workers
+    threads = intra or max(1, math.floor(share))
+
+    cpus = available_cpus()
+    per_worker = max(1, len(cpus) // workers)
+    can_pin = pin and len(cpus) >= workers
+
+    return [
+        WorkerSlot(
+            worker_index=i,
+            workers=workers,
+            cpu_budget=round(share, 2),
+            intra_op_threads=threads,
+            inter_op_threads=inter,
+            cpus=cpus[i * per_worker: (i + 1) * per_worker] if can_pin else None,
+        )
+        for i in range(workers)
+    ]
+
+
+def apply_worker_slot(slot: WorkerSlot) -> None:
+    """Pin the current process and size torch thread pools for its slot."""
+    global current_slot
+
+    # Honoured by OpenMP/MKL if torch has not initialized its pools yet
+    os.environ["OMP_NUM_THREADS"] = str(slot.intra_op_threads)
+    os.environ["MKL_NUM_THREADS"] = str(slot.intra_op_threads)
+
+    if slot.cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, slot.cpus)
+
+    import torch
+
+    torch.set_num_threads(slot.intra_op_threads)
+    try:
+        torch.set_num_interop_threads(slot.inter_op_threads)
+    except RuntimeError:
+        # Inter-op pool already started (e.g. model preloaded before fork)
+        pass
+
+    current_slot = slot
@@ -0,0 +1,101 @@
+"""Prediction cache warm-up from replayed traffic."""
+import json
+import time
+from collections import Counter
+from itertools import islice
+from typing import Dict, List
+
+from app.config import settings
+from app.core.preprocessing import preprocess_text
+from app.utils.logger import logger
+from app.utils.timing import current_endpoint
+
+
+def load_hot_texts(path: str, top_n: int, deadline: float = None) -> List[str]:
+    """Most frequent texts in a request log or hot-key snapshot.
+
+    Each JSONL line may be a ``/predict`` body (``{"text": ...}``), a
+    ``/predict/batch`` body (``{"texts": [...]}``), a bare JSON string, or a
+    snapshot entry ``{"text": ..., "count": n}``. Texts are counted by their
+    preprocessed form, the same normalization the cache keys use. Reading
+    stops early at ``deadline`` (a ``time.monotonic()`` value).
+    """
+    counts: Counter = Counter()
+    originals: Dict[str, str] = {}
+
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if deadline and line_no % 10000 == 0 and time.monotonic() > deadline:
+                logger.warning(f"Cache warm-up stopped reading {path} at line {line_no}")
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+
+            if isinstance(record, str):
+                texts, weight = [record], 1
+            elif isinstance(record, dict):
+                texts = record.get("texts") or [record.get("text")]
+                weight = record.get("count", 1)
+                if not isinstance(texts, list):
+                    continue
+            else:
+                continue
+
+            for text in texts:
+                if not isinstance(text, str):
+                    continue
+                key = preprocess_text(text)
+                if key:
+                    counts[key] += weight if isinstance(weight, int) and weight > 0 else 1
+                    originals.setdefault(key, text)
+
+    return [originals[key] for key, _ in counts.most_common(top_n)]
+
+
+def warm_cache(model, texts: List[str], budget_seconds: float, batch_size: int = None) -> int:
+    """Pre-score ``texts`` in batches until done or the time budget runs out.
+
+    Scoring goes through ``predict_batch``, which writes every result to
+    the prediction cache. Returns the number of texts scored.
+    """
+    batch_size = batch_size or settings.max_batch_size
+    deadline = time.monotonic() + budget_seconds
+    warmed = 0
+
+    remaining = iter(texts)
+    while time.monotonic() < deadline:
+        batch = list(islice(remaining, batch_size))
+        if not batch:
+            break
+        model.predict_batch(batch)
+        warmed += len(batch)
+
+    return warmed
+
+
+def warm_up(model) -> int:
+    """Warm the prediction cache from ``CACHE_WARMUP_FILE`` within the time budget."""
+    path = settings.cache_warmup_file
+    if not path:
+        return 0
+
+    start = time.monotonic()
+    deadline = start + settings.cache_warmup_budget_seconds
+    endpoint = current_endpoint.set("warmup")
+    try:
+        texts = load_hot_texts(path, settings.cache_warmup_top_n, deadline)
+        warmed = warm_cache(model, texts, max(0.0, deadline - time.monotonic()))
+    except Exception as e:
+        # Warm-up is an optimization; never block startup on it
+        logger.warning(f"Cache warm-up failed: {str(e)}")
+        return 0
+    finally:
+        current_endpoint.reset(endpoint)
+
+    logger.info(
+        f"Cache warm-up scored {warmed} of {len(texts)} hot texts "
+        f"in {time.monotonic() - start:.1f}s"
+    )
+    return warmed
@@ -5,10 +5,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import make_asgi_app
 
-from app.api.endpoints import batch, health, predict
+from app.api.endpoints import admin, batch, health, jobs, predict, stream
 from app.config import settings
+from app.core.jobs import job_manager
 from app.core.model import get_model
-from app.utils.logger import logger
+from app.core.warmup import warm_up
+from app.utils.logger import flush_logs, logger
+from app.utils.memory import process_memory
 from app.utils.metrics import model_loaded
 
 
@@ -20,7 +23,17 @@ async def lifespan(app: FastAPI):
     try:
         # Load model on startup
         logger.info("Loading sentiment model...")
-        get_model()
+        model = get_model()
+        # Pre-score hot texts before the worker starts accepting traffic
+        warm_up(model)
+        # Resume bulk jobs interrupted by the previous shutdown
+        job_manager.recover()
+        memory = process_memory()
+        if memory:
+            logger.info(
+                f"Worker memory: rss={memory['rss_mb']} MB, "
+                f"shared={memory['shared_mb']} MB, private={memory['private_mb']} MB"
+            )
         logger.info("Application started successfully")
     except Exception as e:
         logger.error(f"Failed to start application: {str(e)}", exc_info=True)
@@ -31,6 +44,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down application...")
+    flush_logs()
 
 
 # Create FastAPI app
@@ -63,12 +77,30 @@ app.include_router(
     tags=["predictions"],
 )
 
+app.include_router(
+    stream.router,
+    prefix=f"/api/{settings.api_version}",
+    tags=["predictions"],
+)
+
+app.include_router(
+    jobs.router,
+    prefix=f"/api/{settings.api_version}",
+    tags=["jobs"],
+)
+
 app.include_router(
     health.router,
     prefix=f"/api/{settings.api_version}",
     tags=["health"],
 )
 
+app.include_router(
+    admin.router,
+    prefix=f"/api/{settings.api_version}",
+    tags=["admin"],
+)
+
 # Prometheus metrics endpoint
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
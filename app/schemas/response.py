@@ -1,5 +1,7 @@
 """Response schemas."""
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -50,6 +52,11 @@ class BatchPredictionResponse(BaseModel):
         description="List of predictions",
     )
     total_processed: int = Field(..., ge=0)
+    cached_count: int = Field(
+        0,
+        ge=0,
+        description="Number of predictions served from cache",
+    )
     avg_confidence: float = Field(..., ge=0.0, le=1.0)
     processing_time_ms: float = Field(
         ...,
@@ -57,6 +64,26 @@ class BatchPredictionResponse(BaseModel):
     )
 
 
+class ServingLayout(BaseModel):
+    """CPU layout of the worker that served the request."""
+
+    worker_index: int
+    workers: int
+    cpu_budget: float = Field(..., description="CPU cores available to this worker")
+    intra_op_threads: int
+    inter_op_threads: int
+    cpus: Optional[list[int]] = Field(None, description="Pinned CPUs, if any")
+
+
+class WorkerMemory(BaseModel):
+    """Memory breakdown of the worker that served the request."""
+
+    rss_mb: float
+    pss_mb: float = Field(..., description="Proportional share of shared pages")
+    shared_mb: float = Field(..., description="Pages shared with other processes")
+    private_mb: float
+
+
 class ModelInfoResponse(BaseModel):
     """Model information response."""
 
@@ -66,6 +93,14 @@ class ModelInfoResponse(BaseModel):
     classes: list[str]
     accuracy: float = Field(..., ge=0.0, le=1.0)
     f1_score: float = Field(..., ge=0.0, le=1.0)
+    serving: Optional[ServingLayout] = Field(
+        None,
+        description="Worker CPU layout when started with app.serve",
+    )
+    memory: Optional[WorkerMemory] = Field(
+        None,
+        description="Worker memory breakdown, where /proc is available",
+    )
 
 
 class HealthResponse(BaseModel):
@@ -74,3 +109,20 @@ class HealthResponse(BaseModel):
     status: str
     model_loaded: bool
     uptime_seconds: float
+
+
+class JobResponse(BaseModel):
+    """Bulk scoring job status."""
+
+    job_id: str
+    filename: str
+    format: str = Field(..., description="Input format (jsonl or csv)")
+    status: str = Field(..., description="queued, running, completed or failed")
+    rows_total: Optional[int] = Field(None, description="Input rows, once counted")
+    rows_done: int = Field(..., ge=0)
+    rows_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
@@ -0,0 +1,112 @@
+"""Multi-worker serving launcher.
+
+Run with ``python -m app.serve``. The launcher binds the listening socket,
+splits the available CPUs (affinity set and cgroup quota) across
+``WORKERS`` uvicorn processes, and gives each an explicit intra-op thread
+count and optional CPU affinity so workers do not oversubscribe cores.
+
+With ``PRELOAD_MODEL=true`` the model is loaded before forking, so workers
+share one copy of the weights instead of each loading its own.
+"""
+import multiprocessing
+import multiprocessing.connection
+import signal
+import socket
+import sys
+from typing import List
+
+import uvicorn
+
+from app.config import settings
+from app.core.topology import WorkerSlot, apply_worker_slot, cgroup_cpu_limit, plan_layout
+from app.utils.logger import logger
+
+
+def _preload_model() -> None:
+    """Load the model once in the launcher so forked workers share its weights.
+
+    Weight tensors are never written during inference, so their pages stay
+    shared copy-on-write across workers. ``gc.freeze`` keeps the collector
+    from touching (and copying) the preloaded objects in each child.
+    """
+    import gc
+
+    import torch
+
+    from app.core.model import get_model
+
+    # Keep the launcher single-threaded so no OpenMP pool exists at fork time
+    torch.set_num_threads(1)
+    get_model()
+    gc.collect()
+    gc.freeze()
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket, slot: WorkerSlot) -> None:
+    """Worker process entry point."""
+    apply_worker_slot(slot)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main() -> None:
+    """Start the serving workers and supervise them."""
+    config = uvicorn.Config(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        log_level=settings.log_level.lower(),
+    )
+    sock = config.bind_socket()
+
+    layout = plan_layout()
+    if settings.preload_model:
+        logger.info("Preloading model before starting workers")
+        _preload_model()
+
+    logger.info(
+        f"Starting {len(layout)} workers, "
+        f"{layout[0].intra_op_threads} intra-op threads each "
+        f"(cgroup limit: {cgroup_cpu_limit() or 'none'})"
+    )
+
+    context = multiprocessing.get_context("fork")
+    processes: List[multiprocessing.Process] = []
+    for slot in layout:
+        process = context.Process(
+            target=_run_worker,
+            args=(config, sock, slot),
+            name=f"worker-{slot.worker_index}",
+        )
+        process.start()
+        processes.append(process)
+        logger.info(f"Worker {slot.worker_index} started (pid {process.pid}, cpus {slot.cpus})")
+
+    stopping = []
+
+    def shutdown(signum, frame):
+        stopping.append(signum)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # Exit as soon as any worker dies so the orchestrator restarts the pod
+    exit_code = 0
+    multiprocessing.connection.wait([p.sentinel for p in processes])
+    if not stopping:
+        for process in processes:
+            if not process.is_alive():
+                exit_code = process.exitcode or 1
+                logger.error(f"{process.name} exited with code {process.exitcode}")
+    shutdown(None, None)
+    for process in processes:
+        process.join()
+
+    sock.close()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
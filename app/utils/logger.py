@@ -1,10 +1,21 @@
 """Logging configuration."""
+import atexit
+import copy
 import json
 import logging
+import os
+import queue
+import random
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Set
 
 from app.config import settings
+from app.utils.metrics import log_records_dropped_total
+
+# How long a warning or error waits for queue room before being written directly
+BLOCKING_PUT_SECONDS = 0.1
 
 
 class JSONFormatter(logging.Formatter):
@@ -13,7 +24,10 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # When the record was made, not when the writer thread got to it
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%S.%fZ"
+            ),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
@@ -31,25 +45,103 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "processing_time_ms"):
             log_data["processing_time_ms"] = record.processing_time_ms
 
-        # Add exception info if present
+        # Add exception info if present (pre-rendered when queued)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
 
         return json.dumps(log_data)
 
 
-def setup_logger(name: str = "sentiment_api") -> logging.Logger:
-    """Setup and configure logger."""
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops low-severity records instead of blocking when full.
+
+    Callers on the event loop only pay for a ``put_nowait``; JSON
+    formatting and the write to stdout happen on the listener thread.
+    Warnings and errors are never dropped: they wait up to
+    ``BLOCKING_PUT_SECONDS`` for room, then go straight to ``fallback``.
+    """
+
+    def __init__(self, queue_: queue.Queue, fallback: Optional[logging.Handler] = None):
+        """Initialize handler; ``fallback`` writes records the queue cannot take."""
+        super().__init__(queue_)
+        self.fallback = fallback
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record; when full, drop it if below WARNING, else wait or write it."""
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                log_records_dropped_total.inc()
+                return
+
+        try:
+            self.queue.put(record, timeout=BLOCKING_PUT_SECONDS)
+        except queue.Full:
+            if self.fallback is not None:
+                self.fallback.handle(record)
+            else:
+                log_records_dropped_total.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message and exception text, keeping extra fields."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogWriter(QueueListener):
+    """Background thread writing queued records to the real handlers."""
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for room rather than failing when the queue is full."""
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        """Drain the queue and stop the thread; no-op if not running."""
+        if self._thread is not None:
+            super().stop()
+
+
+# Background writer per configured logger name, if queueing is enabled
+log_listeners: Dict[str, LogWriter] = {}
+
+_configured: Set[str] = set()
+
+
+def setup_logger(name: str = "sentiment_api", stream=None) -> logging.Logger:
+    """Setup and configure logger.
+
+    With ``LOG_QUEUE_SIZE`` > 0 records go through a bounded queue to a
+    background writer thread; 0 writes synchronously. Each name is
+    configured once; later calls return the logger unchanged.
+    """
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, settings.log_level.upper()))
+    if name in _configured:
+        return logger
+    _configured.add(name)
 
-    # Remove existing handlers
-    logger.handlers.clear()
+    logger.setLevel(getattr(logging, settings.log_level.upper()))
 
     # Create console handler
-    handler = logging.StreamHandler(sys.stdout)
+    handler = logging.StreamHandler(stream or sys.stdout)
     handler.setFormatter(JSONFormatter())
-    logger.addHandler(handler)
+
+    if settings.log_queue_size > 0:
+        queue_handler = DroppingQueueHandler(queue.Queue(settings.log_queue_size), handler)
+        listener = LogWriter(queue_handler.queue, handler, respect_handler_level=True)
+        listener.start()
+        log_listeners[name] = listener
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(handler)
 
     # Prevent propagation to root logger
     logger.propagate = False
@@ -57,4 +149,47 @@ def setup_logger(name: str = "sentiment_api") -> logging.Logger:
     return logger
 
 
+def flush_logs() -> None:
+    """Write out all queued records and keep logging."""
+    for listener in log_listeners.values():
+        listener.stop()
+        listener.start()
+
+
+def _stop_listeners() -> None:
+    for listener in log_listeners.values():
+        listener.stop()
+
+
+def _restart_listeners_after_fork() -> None:
+    """Give a forked worker its own queues and writer threads.
+
+    Threads do not survive fork, and the parent's queue lock may have been
+    held at fork time, so the child must not reuse either.
+    """
+    for name, listener in list(log_listeners.items()):
+        new_queue = queue.Queue(settings.log_queue_size)
+        for handler in logging.getLogger(name).handlers:
+            if isinstance(handler, QueueHandler):
+                handler.queue = new_queue
+        log_listeners[name] = LogWriter(new_queue, *listener.handlers, respect_handler_level=True)
+        log_listeners[name].start()
+
+
+def should_log(processing_time_ms: float = 0.0) -> bool:
+    """Whether to emit a per-prediction log line.
+
+    Lines are sampled at ``LOG_SAMPLE_RATE``; requests slower than
+    ``LOG_SLOW_REQUEST_MS`` are always logged. Errors are logged directly
+    and never sampled.
+    """
+    if processing_time_ms >= settings.log_slow_request_ms:
+        return True
+    rate = settings.log_sample_rate
+    return rate >= 1.0 or random.random() < rate
+
+
 logger = setup_logger()
+
+os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+atexit.register(_stop_listeners)
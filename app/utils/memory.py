@@ -0,0 +1,36 @@
+"""Process memory reporting."""
+from typing import Dict, Optional
+
+SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+
+
+def process_memory() -> Optional[Dict[str, float]]:
+    """RSS breakdown of the current process in MB.
+
+    ``shared_mb`` counts pages also mapped by other processes, such as model
+    weights inherited from a preloading launcher; ``pss_mb`` splits shared
+    pages proportionally, so summing it across workers gives the real total.
+    Returns None where ``/proc/self/smaps_rollup`` is unavailable.
+    """
+    try:
+        with open(SMAPS_ROLLUP) as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    fields = {}
+    for line in lines[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[1].isdigit():
+            fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+
+    return {
+        "rss_mb": round(fields.get("Rss", 0.0), 1),
+        "pss_mb": round(fields.get("Pss", 0.0), 1),
+        "shared_mb": round(
+            fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0), 1
+        ),
+        "private_mb": round(
+            fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0), 1
+        ),
+    }
@@ -30,3 +30,137 @@ model_loaded = Gauge(
     "model_loaded",
     "Whether the model is loaded (1) or not (0)",
 )
+
+# Micro-batching metrics
+batch_queue_wait_seconds = Histogram(
+    "batch_queue_wait_seconds",
+    "Time a single prediction waited in the micro-batch queue",
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+)
+
+batch_formed_size = Histogram(
+    "batch_formed_size",
+    "Number of requests coalesced into one micro-batch",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128],
+)
+
+# Inference executor metrics
+inference_queue_depth = Gauge(
+    "inference_queue_depth",
+    "Inference calls running or waiting for an executor thread",
+)
+
+inference_rejected_total = Counter(
+    "inference_rejected_total",
+    "Inference calls rejected because the executor queue was full",
+)
+
+# Prediction cache metrics
+cache_hits_total = Counter(
+    "cache_hits_total",
+    "Prediction cache hits",
+)
+
+cache_misses_total = Counter(
+    "cache_misses_total",
+    "Prediction cache misses",
+)
+
+cache_evictions_total = Counter(
+    "cache_evictions_total",
+    "Prediction cache evictions by reason (size, bytes, expired)",
+    ["reason"],
+)
+
+cache_entries = Gauge(
+    "cache_entries",
+    "Number of entries in the prediction cache",
+)
+
+cache_bytes = Gauge(
+    "cache_bytes",
+    "Approximate memory used by the prediction cache in bytes",
+)
+
+cache_backend_hits_total = Counter(
+    "cache_backend_hits_total",
+    "Shared cache tier hits (memory misses served by the backend)",
+    ["backend"],
+)
+
+cache_backend_misses_total = Counter(
+    "cache_backend_misses_total",
+    "Shared cache tier misses",
+    ["backend"],
+)
+
+cache_backend_errors_total = Counter(
+    "cache_backend_errors_total",
+    "Shared cache tier failures that fell back to local-only caching",
+    ["backend"],
+)
+
+cache_backend_writes_dropped_total = Counter(
+    "cache_backend_writes_dropped_total",
+    "Entries not written to the shared cache tier because the write-behind queue was full",
+    ["backend"],
+)
+
+# Bulk job metrics
+bulk_jobs_total = Counter(
+    "bulk_jobs_total",
+    "Bulk scoring jobs finished, by final status",
+    ["status"],
+)
+
+bulk_job_rows_total = Counter(
+    "bulk_job_rows_total",
+    "Rows scored by bulk jobs",
+)
+
+# Logging metrics
+log_records_dropped_total = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+)
+
+# Profiling metrics
+profiles_captured_total = Counter(
+    "profiles_captured_total",
+    "Request profiles captured, by trigger (header or sample) and status "
+    "(saved, dropped or failed)",
+    ["trigger", "status"],
+)
+
+# Pipeline stage metrics (labelled by endpoint, backend and model_version)
+STAGE_LABELS = ["endpoint", "backend", "model_version"]
+
+inference_stage_seconds = Histogram(
+    "inference_stage_seconds",
+    "Time spent per pipeline stage (queue_wait, preprocess, tokenize, "
+    "forward, postprocess, serialize)",
+    ["stage"] + STAGE_LABELS,
+    buckets=[0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+             0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+
+inference_batch_size = Histogram(
+    "inference_batch_size",
+    "Sequences per forward pass",
+    STAGE_LABELS,
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256],
+)
+
+inference_batch_tokens = Histogram(
+    "inference_batch_tokens",
+    "Non-padding tokens per forward pass",
+    STAGE_LABELS,
+    buckets=[32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384],
+)
+
+inference_padding_ratio = Histogram(
+    "inference_padding_ratio",
+    "Fraction of each forward pass spent on padding tokens",
+    STAGE_LABELS,
+    buckets=[0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.75, 0.9],
+)
@@ -0,0 +1,88 @@
+"""Readers for bulk input files (JSONL, CSV and Parquet)."""
+import csv
+import json
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+FORMAT_EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+
+def detect_format(filename: str) -> str:
+    """Input format from a file name's extension."""
+    suffix = Path(filename).suffix.lower()
+    if suffix not in FORMAT_EXTENSIONS:
+        supported = ", ".join(sorted(FORMAT_EXTENSIONS))
+        raise ValueError(f"Unsupported file type '{suffix}', expected one of {supported}")
+    return FORMAT_EXTENSIONS[suffix]
+
+
+def _iter_jsonl(path: Path, text_field: str, id_field: str) -> Iterator[Tuple[Any, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError(f"Line {line_no}: invalid JSON")
+            if isinstance(record, str):
+                yield None, record
+                continue
+            if not isinstance(record, dict) or not isinstance(record.get(text_field), str):
+                raise ValueError(f"Line {line_no}: expected an object with a '{text_field}' string")
+            yield record.get(id_field), record[text_field]
+
+
+def _iter_csv(path: Path, text_field: str, id_field: str) -> Iterator[Tuple[Any, str]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or text_field not in reader.fieldnames:
+            raise ValueError(f"CSV header must include a '{text_field}' column")
+        for row in reader:
+            yield row.get(id_field), row[text_field] or ""
+
+
+def _iter_parquet(path: Path, text_field: str, id_field: str) -> Iterator[Tuple[Any, str]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+
+    parquet_file = pq.ParquetFile(path)
+    names = parquet_file.schema_arrow.names
+    if text_field not in names:
+        raise ValueError(f"Parquet file must include a '{text_field}' column")
+    columns = [text_field] + ([id_field] if id_field in names else [])
+    # Read one row group batch at a time rather than the whole table
+    for batch in parquet_file.iter_batches(columns=columns):
+        data = batch.to_pydict()
+        ids = data.get(id_field) or [None] * batch.num_rows
+        for item_id, text in zip(ids, data[text_field]):
+            yield item_id, text or ""
+
+
+def iter_records(
+    path: Path,
+    fmt: str,
+    text_field: str = "text",
+    id_field: str = "id",
+) -> Iterator[Tuple[Any, str]]:
+    """Stream ``(id, text)`` pairs from a JSONL, CSV or Parquet file.
+
+    JSONL lines are objects with a text field or bare JSON strings; CSV
+    and Parquet files need a text column. ``id`` is None when absent.
+    Malformed input raises ValueError naming the offending line. Parquet
+    support needs the optional ``pyarrow`` package.
+    """
+    if fmt == "jsonl":
+        return _iter_jsonl(Path(path), text_field, id_field)
+    if fmt == "csv":
+        return _iter_csv(Path(path), text_field, id_field)
+    if fmt == "parquet":
+        return _iter_parquet(Path(path), text_field, id_field)
+    raise ValueError(f"Unsupported format: {fmt}")
@@ -0,0 +1,40 @@
+"""Per-stage latency instrumentation for the inference pipeline."""
+from contextvars import ContextVar
+from typing import Dict
+
+from app.utils.metrics import (
+    inference_batch_size,
+    inference_batch_tokens,
+    inference_padding_ratio,
+    inference_stage_seconds,
+)
+
+# Endpoint being served; the inference executor runs calls in a copy of the
+# caller's context, so this is visible on its threads too
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="internal")
+
+# Backend and version of the loaded model, set once it has loaded
+model_labels: Dict[str, str] = {"backend": "unknown", "model_version": "unknown"}
+
+
+def set_model_labels(backend: str, model_version: str) -> None:
+    """Record the loaded model's backend and version for stage metrics."""
+    model_labels["backend"] = backend
+    model_labels["model_version"] = model_version
+
+
+def _labels() -> Dict[str, str]:
+    return {"endpoint": current_endpoint.get(), **model_labels}
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record the duration of one pipeline stage, measured with ``perf_counter``."""
+    inference_stage_seconds.labels(stage=stage, **_labels()).observe(seconds)
+
+
+def observe_batch(rows: int, width: int, tokens: int) -> None:
+    """Record the shape of one forward pass: rows, real tokens and padding."""
+    labels = _labels()
+    inference_batch_size.labels(**labels).observe(rows)
+    inference_batch_tokens.labels(**labels).observe(tokens)
+    inference_padding_ratio.labels(**labels).observe(1 - tokens / (rows * width))
@@ -0,0 +1,261 @@
+"""In-process inference benchmarks: model calls, prediction cache and preprocessing.
+
+Run from the repository root:
+
+    python -m benchmarks.inference --json > before.json
+    # ... change something ...
+    python -m benchmarks.inference --json --compare before.json
+
+By default the model is a randomly initialized DistilBERT ("small", see
+``benchmarks.tiny_model``) saved to a temporary directory, so the suite runs
+without network access. Its scores are meaningless but tokenization,
+padding, batching and the forward pass do the same work as a real model of
+that shape. Pass ``--model`` with a local model directory for realistic
+absolute numbers. Compare runs on the same machine and thread settings only.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import torch
+
+from app.config import settings
+from app.core.cache import PredictionCache
+from app.core.preprocessing import preprocess_text
+from benchmarks.tiny_model import MODEL_SIZES, VOCAB_WORDS, save_tiny_model
+
+# Text lengths in words; each vocabulary word is one token
+TEXT_LENGTHS = {"short": 8, "medium": 64, "long": 256}
+
+BATCH_SIZES = [1, 8, 32, 100]
+
+CACHE_SIZES = [10_000, 100_000]
+
+CACHE_BATCH = 100
+
+RESULT = {
+    "sentiment": "positive",
+    "confidence": 0.9412345,
+    "scores": {"negative": 0.0281234, "neutral": 0.0306421, "positive": 0.9412345},
+    "processing_time_ms": 12.5,
+}
+
+
+def make_texts(count: int, words: int, seed: int = 0) -> List[str]:
+    """Distinct review-like texts of ``words`` words, reproducible by seed."""
+    rng = random.Random(seed)
+    return [
+        f"Review {i}: " + " ".join(rng.choice(VOCAB_WORDS) for _ in range(words)) + "!"
+        for i in range(count)
+    ]
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int,
+    setup: Callable[[], Any] = None,
+    items: int = 1,
+) -> Dict[str, float]:
+    """Time ``repeat`` calls of ``fn`` after one warm-up call.
+
+    ``setup`` runs before every call and is not timed. Returns latency
+    statistics in milliseconds and throughput in ``items`` per second of
+    measured time.
+    """
+    if setup:
+        setup()
+    fn()
+
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    times.sort()
+    total = sum(times)
+    return {
+        "calls": repeat,
+        "mean_ms": round(statistics.mean(times) * 1000, 4),
+        "p50_ms": round(times[len(times) // 2] * 1000, 4),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 4),
+        "min_ms": round(times[0] * 1000, 4),
+        "items_per_second": round(items * repeat / total, 1) if total > 0 else 0.0,
+    }
+
+
+def bench_model(model, repeat: int, batch_sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    """``predict`` per text length and uncached ``predict_batch`` per batch size and length."""
+    from app.core.cache import prediction_cache
+
+    results = {}
+    for length, words in TEXT_LENGTHS.items():
+        text = make_texts(1, words)[0]
+        results[f"predict/{length}"] = measure(lambda: model.predict(text), repeat)
+
+    for length, words in TEXT_LENGTHS.items():
+        for batch_size in batch_sizes:
+            texts = make_texts(batch_size, words)
+            results[f"predict_batch/{length}/{batch_size}"] = measure(
+                lambda: model.predict_batch(texts),
+                max(3, repeat // batch_size),
+                # Every call goes through the model, not the cache
+                setup=prediction_cache.clear,
+                items=batch_size,
+            )
+    return results
+
+
+def bench_cache(repeat: int, cache_sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    """``PredictionCache`` lookups and stores on a full cache, memory tier only."""
+    results = {}
+    for size in cache_sizes:
+        cache = PredictionCache(maxsize=size, ttl=0, max_bytes=0, backend=None)
+        cache.set_namespace("benchmark")
+        keys = make_texts(size, 8, seed=1)
+        for start in range(0, size, 1000):
+            cache.set_many((key, RESULT) for key in keys[start: start + 1000])
+
+        rng = random.Random(2)
+        hits = rng.sample(keys, CACHE_BATCH)
+        misses = make_texts(CACHE_BATCH, 8, seed=3)
+        # Entries not yet cached, so every store evicts one
+        fresh = iter(make_texts(CACHE_BATCH * (repeat + 1), 8, seed=4))
+
+        results[f"cache_get/hit/{size}"] = measure(lambda: cache.get(hits[0]), repeat * 10)
+        results[f"cache_get/miss/{size}"] = measure(lambda: cache.get(misses[0]), repeat * 10)
+        results[f"cache_get_many/{size}/{CACHE_BATCH}"] = measure(
+            lambda: cache.get_many(hits), repeat, items=CACHE_BATCH
+        )
+        results[f"cache_set_many/{size}/{CACHE_BATCH}"] = measure(
+            lambda: cache.set_many(
+                [(next(fresh), RESULT) for _ in range(CACHE_BATCH)]
+            ),
+            repeat,
+            items=CACHE_BATCH,
+        )
+    return results
+
+
+def bench_preprocess(repeat: int) -> Dict[str, Dict[str, float]]:
+    """``preprocess_text`` per text length, on texts with URLs and mixed case."""
+    results = {}
+    for length, words in TEXT_LENGTHS.items():
+        text = make_texts(1, words)[0].upper() + "  see https://example.com/item?id=1  "
+        results[f"preprocess/{length}"] = measure(lambda: preprocess_text(text), repeat * 10)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Context needed to tell whether two result files are comparable."""
+    return {
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "model": settings.model_name,
+        "inference_backend": settings.inference_backend,
+        "quantization": settings.quantization,
+        "max_batch_size": settings.max_batch_size,
+        "max_batch_tokens": settings.max_batch_tokens,
+    }
+
+
+def run(
+    model_dir: str = None,
+    model_size: str = "small",
+    repeat: int = 20,
+    batch_sizes: List[int] = None,
+    cache_sizes: List[int] = None,
+) -> Dict[str, Any]:
+    """Run every benchmark and return the results with their environment."""
+    from app.core.cache import prediction_cache
+    from app.core.model import SentimentModel
+
+    batch_sizes = batch_sizes or BATCH_SIZES
+    cache_sizes = cache_sizes or CACHE_SIZES
+
+    saved = (settings.model_name, prediction_cache.backend)
+    # Loading the benchmark model re-scopes the shared cache to its identity
+    saved_namespace = prediction_cache.namespace
+    # Measure the model and the memory tier, not a shared cache backend
+    prediction_cache.backend = None
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            settings.model_name = model_dir or save_tiny_model(tmp, model_size)
+            model = SentimentModel()
+            info = environment()
+            if not model_dir:
+                info["model"] = f"random-distilbert-{model_size}"
+
+            benchmarks = {}
+            benchmarks.update(bench_model(model, repeat, batch_sizes))
+            benchmarks.update(bench_cache(repeat, cache_sizes))
+            benchmarks.update(bench_preprocess(repeat))
+    finally:
+        settings.model_name, prediction_cache.backend = saved
+        prediction_cache.set_namespace(saved_namespace)
+
+    return {"environment": info, "benchmarks": benchmarks}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, float]:
+    """Ratio of current to baseline p50 latency per benchmark (<1 is faster)."""
+    before = baseline["benchmarks"]
+    return {
+        name: round(result["p50_ms"] / before[name]["p50_ms"], 3)
+        for name, result in current["benchmarks"].items()
+        if name in before and before[name]["p50_ms"] > 0
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark inference in process")
+    parser.add_argument("--model", default=None,
+                        help="Local model directory (default: random DistilBERT)")
+    parser.add_argument("--size", choices=sorted(MODEL_SIZES), default="small",
+                        help="Size of the random model")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per benchmark")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--cache-sizes", type=int, nargs="+", default=CACHE_SIZES)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--output", default=None, help="Also write the JSON results here")
+    parser.add_argument("--compare", default=None,
+                        help="Baseline results file; adds p50 ratios to the output")
+    args = parser.parse_args()
+
+    # Keep model loading logs out of the results on stdout
+    logging.getLogger("sentiment_api").setLevel(logging.WARNING)
+
+    results = run(args.model, args.size, args.repeat, args.batch_sizes, args.cache_sizes)
+    if args.compare:
+        with open(args.compare) as f:
+            results["p50_ratio_vs_baseline"] = compare(json.load(f), results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        ratios = results.get("p50_ratio_vs_baseline", {})
+        for name, r in results["benchmarks"].items():
+            ratio = f"  x{ratios[name]}" if name in ratios else ""
+            print(
+                f"{name:<32} p50 {r['p50_ms']:>10.4f} ms  p95 {r['p95_ms']:>10.4f} ms  "
+                f"{r['items_per_second']:>12.1f} /s{ratio}"
+            )
@@ -0,0 +1,137 @@
+"""Per-response serialization overhead, pydantic path vs the orjson fast path.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization
+
+The "pydantic" path is what the endpoints did before: build the response
+model from the result dicts, then let FastAPI validate and serialize it
+against ``response_model`` and encode it with ``JSONResponse``. The "fast"
+path is the current one: plain dicts encoded by ``ORJSONResponse``. Both
+run as a coroutine, like an endpoint, so event loop overhead is included
+on each side.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.api.responses import batch_payload, json_response, prediction_payload
+from app.main import app
+from app.schemas.response import (
+    BatchPredictionItem,
+    BatchPredictionResponse,
+    PredictionResponse,
+)
+
+RESULT = {
+    "sentiment": "positive",
+    "confidence": 0.9412345,
+    "scores": {"negative": 0.0281234, "neutral": 0.0306421, "positive": 0.9412345},
+    "processing_time_ms": 12.5,
+}
+
+
+def _batch_items(size: int):
+    return [
+        {
+            "text": f"Review number {i}: the product arrived on time and works well.",
+            "sentiment": "positive",
+            "confidence": 0.9412345,
+            "cached": i % 3 == 0,
+        }
+        for i in range(size)
+    ]
+
+
+def _response_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return route.response_field
+    raise ValueError(f"No route {path}")
+
+
+async def _pydantic_response(field, model) -> JSONResponse:
+    content = await serialize_response(field=field, response_content=model)
+    return JSONResponse(content)
+
+
+async def _fast_response(payload):
+    return json_response(payload)
+
+
+def _time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Best-of-5 mean time per call in microseconds."""
+    fn()
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def run(iterations: int = 2000, batch_size: int = 100) -> Dict[str, Dict[str, float]]:
+    """Measure both paths for a single prediction and a full batch."""
+    loop = asyncio.new_event_loop()
+    predict_field = _response_field("/api/v1/predict")
+    batch_field = _response_field("/api/v1/predict/batch")
+    items = _batch_items(batch_size)
+
+    def single_pydantic():
+        loop.run_until_complete(_pydantic_response(predict_field, PredictionResponse(**RESULT)))
+
+    def single_fast():
+        loop.run_until_complete(_fast_response(prediction_payload(RESULT)))
+
+    def batch_pydantic():
+        model = BatchPredictionResponse(
+            predictions=[BatchPredictionItem(**p) for p in items],
+            total_processed=len(items),
+            cached_count=sum(1 for p in items if p["cached"]),
+            avg_confidence=0.94,
+            processing_time_ms=80.0,
+        )
+        loop.run_until_complete(_pydantic_response(batch_field, model))
+
+    def batch_fast():
+        cached_count = sum(1 for p in items if p["cached"])
+        loop.run_until_complete(_fast_response(batch_payload(items, cached_count, 0.94, 80.0)))
+
+    results = {}
+    for name, before, after, n in (
+        ("predict", single_pydantic, single_fast, iterations),
+        (f"batch_{batch_size}", batch_pydantic, batch_fast, max(1, iterations // 10)),
+    ):
+        before_us = _time_per_call(before, n)
+        after_us = _time_per_call(after, n)
+        results[name] = {
+            "pydantic_us": round(before_us, 1),
+            "fast_us": round(after_us, 1),
+            "speedup": round(before_us / after_us, 1),
+        }
+    loop.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.batch_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, r in results.items():
+            print(
+                f"{name:>10}: pydantic {r['pydantic_us']:>8.1f} us, "
+                f"fast {r['fast_us']:>7.1f} us ({r['speedup']}x)"
+            )
@@ -0,0 +1,49 @@
+"""Randomly initialized DistilBERT classifiers that need no network access."""
+import string
+
+import torch
+from transformers import (
+    DistilBertConfig,
+    DistilBertForSequenceClassification,
+    DistilBertTokenizerFast,
+)
+
+VOCAB_WORDS = [
+    "great", "good", "love", "excellent", "amazing", "product", "service",
+    "bad", "terrible", "poor", "awful", "hate", "okay", "fine", "it", "is",
+    "this", "the", "not", "very", "would", "recommend", "experience",
+]
+
+# Model sizes by name: "tiny" for tests, "small" for benchmarks whose
+# per-layer cost should dominate Python overhead like a real model's does
+MODEL_SIZES = {
+    "tiny": {"dim": 32, "hidden_dim": 64, "n_layers": 2, "n_heads": 2},
+    "small": {"dim": 256, "hidden_dim": 1024, "n_layers": 4, "n_heads": 4},
+}
+
+
+def save_tiny_model(path: str, size: str = "tiny") -> str:
+    """Save a tokenizer and a seeded random 3-class classifier to ``path``."""
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += list(string.ascii_lowercase + string.digits + string.punctuation)
+    vocab += [f"##{c}" for c in string.ascii_lowercase + string.digits]
+    vocab += VOCAB_WORDS
+    vocab_file = f"{path}/vocab.txt"
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(vocab) + "\n")
+
+    tokenizer = DistilBertTokenizerFast(vocab_file=vocab_file, model_max_length=512)
+    tokenizer.save_pretrained(path)
+
+    torch.manual_seed(0)
+    config = DistilBertConfig(
+        vocab_size=len(vocab),
+        max_position_embeddings=512,
+        num_labels=3,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2},
+        **MODEL_SIZES[size],
+    )
+    DistilBertForSequenceClassification(config).save_pretrained(path)
+
+    return path
@@ -1,66 +1,483 @@
-"""Benchmark API performance."""
+"""Open-loop load generator for the prediction API.
+
+Run from the repository root against a running server:
+
+    # Hold 50 req/s for 60 s, 20% of requests to /predict/batch
+    python -m scripts.benchmark --rate 50 --duration 60 --batch-ratio 0.2
+
+    # Step from 10 to 200 req/s in steps of 10 and report where it saturates
+    python -m scripts.benchmark --ramp 10 200 10 --step-duration 20 --slo-ms 250
+
+Requests are sent on a fixed arrival schedule (Poisson by default) whether
+or not earlier requests have completed, so a slow server builds a queue the
+way it would under real traffic instead of slowing the client down. Latency
+is measured from each request's scheduled send time, not from when it was
+actually sent, which corrects for coordinated omission: time a request
+spent waiting because the server (or this client) fell behind is counted.
+The uncorrected service time is reported alongside for comparison.
+"""
 import argparse
+import asyncio
+import itertools
+import json
+import random
 import time
-import statistics
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-
-def benchmark_endpoint(
-    url: str,
-    num_requests: int = 100,
-    num_threads: int = 10,
-    payload: dict = None
-):
-    """Benchmark an API endpoint."""
-    print(f"Benchmarking {url}")
-    print(f"Requests: {num_requests}, Threads: {num_threads}")
-    
-    times = []
-    errors = 0
-    
-    def make_request():
-        start = time.time()
-        try:
-            response = requests.post(url, json=payload, timeout=30)
-            elapsed = time.time() - start
-            if response.status_code == 200:
-                times.append(elapsed * 1000)  # Convert to ms
-                return True
-            else:
-                errors += 1
-                return False
-        except Exception as e:
-            errors += 1
-            return False
-    
-    # Run requests in parallel
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        futures = [executor.submit(make_request) for _ in range(num_requests)]
-        results = [f.result() for f in as_completed(futures)]
-    
-    if times:
-        print(f"\nResults:")
-        print(f"Successful requests: {len(times)}")
-        print(f"Errors: {errors}")
-        print(f"Mean latency: {statistics.mean(times):.2f} ms")
-        print(f"Median latency: {statistics.median(times):.2f} ms")
-        print(f"P95 latency: {statistics.quantiles(times, n=20)[18]:.2f} ms")
-        print(f"P99 latency: {statistics.quantiles(times, n=100)[98]:.2f} ms")
-        print(f"Throughput: {len(times) / sum(times) * 1000:.2f} req/s")
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+PREDICT_PATH = "/predict"
+BATCH_PATH = "/predict/batch"
+
+# API limits on one request
+MAX_TEXT_LENGTH = 5000
+MAX_BATCH_TEXTS = 100
+
+# Word count ranges of the synthetic text length classes
+TEXT_LENGTHS = {"short": (5, 20), "medium": (20, 100), "long": (100, 400)}
+
+WORDS = [
+    "great", "product", "arrived", "quickly", "and", "works", "well", "but",
+    "the", "battery", "life", "is", "poor", "customer", "service", "was",
+    "helpful", "terrible", "packaging", "would", "not", "recommend", "love",
+    "it", "okay", "for", "price", "broke", "after", "week", "excellent",
+]
+
+
+class Stage(NamedTuple):
+    """A period of constant target arrival rate."""
+
+    rate: float
+    duration: float
+    warmup: bool = False
+
+
+@dataclass
+class Sample:
+    """One request; times are seconds since the start of the run."""
+
+    stage: int
+    endpoint: str
+    texts: int
+    intended: float
+    sent: Optional[float] = None
+    done: Optional[float] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    @property
+    def latency(self) -> float:
+        """Seconds from the scheduled send time to the response."""
+        return self.done - self.intended
+
+    @property
+    def service_time(self) -> float:
+        """Seconds from the actual send to the response (not corrected)."""
+        return self.done - self.sent
+
+
+def build_stages(
+    rate: float = None,
+    duration: float = 60.0,
+    ramp: Tuple[float, float, float] = None,
+    step_duration: float = 20.0,
+    warmup: float = 0.0,
+) -> List[Stage]:
+    """A fixed rate, or a ramp from ``start`` to ``end`` in ``step`` increments."""
+    if ramp:
+        start, end, step = ramp
+        if step <= 0 or start <= 0 or end < start:
+            raise ValueError("Ramp needs 0 < start <= end and step > 0")
+        count = int(round((end - start) / step)) + 1
+        stages = [Stage(start + i * step, step_duration) for i in range(count)]
+    elif rate and rate > 0:
+        stages = [Stage(rate, duration)]
     else:
-        print("No successful requests!")
+        raise ValueError("Set a positive --rate or a --ramp")
+
+    if warmup > 0:
+        stages.insert(0, Stage(stages[0].rate, warmup, warmup=True))
+    return stages
+
+
+def stage_bounds(stages: List[Stage]) -> List[Tuple[float, float]]:
+    """Start and end offset of each stage."""
+    bounds = []
+    start = 0.0
+    for stage in stages:
+        bounds.append((start, start + stage.duration))
+        start += stage.duration
+    return bounds
+
+
+def arrival_times(
+    stages: List[Stage],
+    rng: random.Random,
+    poisson: bool = True,
+) -> Iterator[Tuple[int, float]]:
+    """Yield ``(stage index, scheduled offset)`` for every request.
+
+    Poisson arrivals have exponential gaps with the stage's mean rate, the
+    usual model for independent clients; otherwise gaps are uniform.
+    """
+    for index, (stage, (start, end)) in enumerate(zip(stages, stage_bounds(stages))):
+        t = start
+        for n in itertools.count(1):
+            if t >= end:
+                break
+            yield index, t
+            # Uniform times are computed, not summed, so they do not drift
+            t = t + rng.expovariate(stage.rate) if poisson else start + n / stage.rate
+
+
+def parse_length_mix(spec: str) -> Dict[str, float]:
+    """Parse ``short=0.7,medium=0.25,long=0.05`` into normalized weights."""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in TEXT_LENGTHS:
+            raise ValueError(f"Unknown text length '{name}', expected one of {', '.join(TEXT_LENGTHS)}")
+        weights[name] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Text length weights must sum to more than 0")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def synthetic_texts(length_mix: Dict[str, float], rng: random.Random) -> Iterator[str]:
+    """Endless review-like texts drawn from a length distribution.
+
+    Every text is distinct, so the server's prediction cache does not hide
+    the cost of inference.
+    """
+    names = list(length_mix)
+    weights = [length_mix[name] for name in names]
+    for n in itertools.count():
+        low, high = TEXT_LENGTHS[rng.choices(names, weights)[0]]
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+        yield f"Review {n}: {words}"
+
+
+def corpus_texts(path: str, text_field: str = "text") -> Iterator[str]:
+    """Cycle through the texts of a JSONL corpus, in file order.
+
+    Lines may be bare JSON strings, objects with ``text_field``, or
+    ``/predict/batch`` bodies (``{"texts": [...]}``).
+    """
+    texts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, str):
+                texts.append(record)
+            elif isinstance(record, dict):
+                if isinstance(record.get(text_field), str):
+                    texts.append(record[text_field])
+                elif isinstance(record.get("texts"), list):
+                    texts.extend(t for t in record["texts"] if isinstance(t, str))
+
+    texts = [text[:MAX_TEXT_LENGTH] for text in texts if text.strip()]
+    if not texts:
+        raise ValueError(f"No texts found in {path}")
+    return itertools.cycle(texts)
+
+
+class Traffic:
+    """Turn a text source into a mix of ``/predict`` and ``/predict/batch`` requests."""
+
+    def __init__(
+        self,
+        texts: Iterator[str],
+        batch_ratio: float = 0.0,
+        batch_size: int = 16,
+        rng: random.Random = None,
+    ):
+        """Initialize traffic mix."""
+        self.texts = texts
+        self.batch_ratio = batch_ratio
+        self.batch_size = min(batch_size, MAX_BATCH_TEXTS)
+        self.rng = rng or random.Random()
+
+    def next(self) -> Tuple[str, Dict[str, Any]]:
+        """Endpoint and JSON body of the next request."""
+        if self.batch_ratio > 0 and self.rng.random() < self.batch_ratio:
+            return BATCH_PATH, {"texts": list(itertools.islice(self.texts, self.batch_size))}
+        return PREDICT_PATH, {"text": next(self.texts)}
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    sample: Sample,
+    payload: Dict[str, Any],
+    start: float,
+) -> None:
+    sample.sent = time.perf_counter() - start
+    try:
+        response = await client.post(sample.endpoint, json=payload)
+        sample.status = response.status_code
+    except httpx.HTTPError as e:
+        sample.error = type(e).__name__
+    sample.done = time.perf_counter() - start
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    stages: List[Stage],
+    traffic: Traffic,
+    max_in_flight: int = 1000,
+    poisson: bool = True,
+    rng: random.Random = None,
+) -> List[Sample]:
+    """Send requests on the arrival schedule and collect one sample each.
+
+    Sending never waits for responses. If ``max_in_flight`` requests are
+    already outstanding, the request is recorded as ``client_saturated``
+    instead of being delayed, since delaying it would close the loop.
+    """
+    rng = rng or random.Random()
+    samples: List[Sample] = []
+    in_flight = set()
+    start = time.perf_counter()
+
+    for stage, intended in arrival_times(stages, rng, poisson):
+        delay = intended - (time.perf_counter() - start)
+        # Always yield, so responses are processed even when behind schedule
+        await asyncio.sleep(max(0.0, delay))
+
+        endpoint, payload = traffic.next()
+        sample = Sample(stage, endpoint, len(payload.get("texts", [None])), intended)
+        samples.append(sample)
+        if len(in_flight) >= max_in_flight:
+            sample.error = "client_saturated"
+            continue
+
+        task = asyncio.create_task(_send(client, sample, payload, start))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return samples
+
+
+def percentiles(seconds: List[float]) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles in milliseconds."""
+    keys = {"p50": 0.50, "p90": 0.90, "p99": 0.99, "p99.9": 0.999}
+    if not seconds:
+        return {**{key: None for key in keys}, "max": None}
+
+    ordered = sorted(seconds)
+    result = {
+        key: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+        for key, q in keys.items()
+    }
+    result["max"] = round(ordered[-1] * 1000, 2)
+    return result
+
+
+def summarize_stage(stage: Stage, bounds: Tuple[float, float], samples: List[Sample]) -> Dict[str, Any]:
+    """Throughput, errors and latency for the requests scheduled in one stage.
+
+    Achieved throughput counts successful responses that completed within
+    the stage's time window, so a server that falls behind shows a rate
+    below target even if the backlog completes later.
+    """
+    start, end = bounds
+    ok = [s for s in samples if s.ok]
+    failures = Counter(s.error or str(s.status) for s in samples if not s.ok)
+    completed_in_window = sum(1 for s in ok if start <= s.done < end)
+
+    by_endpoint = {}
+    for endpoint in (PREDICT_PATH, BATCH_PATH):
+        endpoint_ok = [s for s in ok if s.endpoint == endpoint]
+        count = sum(1 for s in samples if s.endpoint == endpoint)
+        if count:
+            by_endpoint[endpoint] = {
+                "requests": count,
+                "ok": len(endpoint_ok),
+                "latency_ms": percentiles([s.latency for s in endpoint_ok]),
+            }
+
+    return {
+        "target_rps": stage.rate,
+        "offered_rps": round(len(samples) / stage.duration, 2),
+        "duration_s": stage.duration,
+        "requests": len(samples),
+        "ok": len(ok),
+        "failures": dict(failures),
+        "error_rate": round(1 - len(ok) / len(samples), 4) if samples else 0.0,
+        "achieved_rps": round(completed_in_window / stage.duration, 2),
+        "texts_per_second": round(
+            sum(s.texts for s in ok if start <= s.done < end) / stage.duration, 2
+        ),
+        "latency_ms": percentiles([s.latency for s in ok]),
+        "service_time_ms": percentiles([s.service_time for s in ok]),
+        "by_endpoint": by_endpoint,
+    }
+
+
+def find_saturation(
+    stage_summaries: List[Dict[str, Any]],
+    slo_ms: float = None,
+    max_error_rate: float = 0.01,
+    min_throughput_ratio: float = 0.95,
+) -> Dict[str, Any]:
+    """Highest sustained rate, and the first rate where the server fell over.
+
+    A stage is saturated when achieved throughput drops below
+    ``min_throughput_ratio`` of the offered rate (the requests actually
+    scheduled, which varies around the target with Poisson arrivals), its
+    error rate exceeds
+    ``max_error_rate``, or its corrected p99 exceeds ``slo_ms``.
+    """
+    sustained = None
+    for summary in stage_summaries:
+        reasons = []
+        if summary["achieved_rps"] < min_throughput_ratio * summary["offered_rps"]:
+            reasons.append("throughput below offered load")
+        if summary["error_rate"] > max_error_rate:
+            reasons.append("error rate")
+        p99 = summary["latency_ms"]["p99"]
+        if slo_ms and (p99 is None or p99 > slo_ms):
+            reasons.append(f"p99 above {slo_ms} ms")
+        if reasons:
+            return {
+                "max_sustained_rps": sustained,
+                "saturated_at_rps": summary["target_rps"],
+                "reasons": reasons,
+            }
+        sustained = summary["target_rps"]
+    return {"max_sustained_rps": sustained, "saturated_at_rps": None, "reasons": []}
+
+
+def summarize(
+    stages: List[Stage],
+    samples: List[Sample],
+    slo_ms: float = None,
+) -> Dict[str, Any]:
+    """Per-stage summaries (warm-up excluded) and the saturation finding."""
+    summaries = []
+    for index, (stage, bounds) in enumerate(zip(stages, stage_bounds(stages))):
+        if stage.warmup:
+            continue
+        summaries.append(
+            summarize_stage(stage, bounds, [s for s in samples if s.stage == index])
+        )
+    return {"stages": summaries, "saturation": find_saturation(summaries, slo_ms)}
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    def ms(value):
+        return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+    print(
+        f"{'target/s':>9} {'offered/s':>9} {'achieved/s':>10} {'texts/s':>9} {'errors':>7} "
+        f"{'p50':>9} {'p99':>9} {'p99.9':>9} {'svc p99':>9}   (ms, corrected)"
+    )
+    for stage in report["stages"]:
+        latency = stage["latency_ms"]
+        print(
+            f"{stage['target_rps']:>9.1f} {stage['offered_rps']:>9.1f} {stage['achieved_rps']:>10.1f} "
+            f"{stage['texts_per_second']:>9.1f} {stage['error_rate']:>7.1%} "
+            f"{ms(latency['p50'])} {ms(latency['p99'])} {ms(latency['p99.9'])} "
+            f"{ms(stage['service_time_ms']['p99'])}"
+        )
+        if stage["failures"]:
+            print(f"{'':>9} failures: {stage['failures']}")
+
+    saturation = report["saturation"]
+    sustained = saturation["max_sustained_rps"]
+    sustained = f"{sustained} req/s" if sustained is not None else "none of the tested rates"
+    if saturation["saturated_at_rps"] is None:
+        print(f"\nNot saturated; sustained {sustained}")
+    else:
+        print(
+            f"\nSaturated at {saturation['saturated_at_rps']} req/s "
+            f"({', '.join(saturation['reasons'])}); max sustained {sustained}"
+        )
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the configured load and return the report."""
+    rng = random.Random(args.seed)
+    stages = build_stages(args.rate, args.duration, args.ramp, args.step_duration, args.warmup)
+    if args.corpus:
+        texts = corpus_texts(args.corpus, args.text_field)
+    else:
+        texts = synthetic_texts(parse_length_mix(args.lengths), rng)
+    traffic = Traffic(texts, args.batch_ratio, args.batch_size, rng)
+
+    limits = httpx.Limits(
+        max_connections=args.connections,
+        max_keepalive_connections=args.connections,
+    )
+    async with httpx.AsyncClient(
+        base_url=args.url.rstrip("/") + args.api_prefix,
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        samples = await run_load(
+            client,
+            stages,
+            traffic,
+            max_in_flight=args.max_in_flight,
+            poisson=args.arrivals == "poisson",
+            rng=rng,
+        )
+
+    report = summarize(stages, samples, args.slo_ms)
+    report["config"] = {
+        key: value for key, value in vars(args).items() if key not in ("output",)
+    }
+    return report
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Benchmark API performance")
-    parser.add_argument("--url", default="http://localhost:8000/api/v1/predict")
-    parser.add_argument("--num-requests", type=int, default=100)
-    parser.add_argument("--num-threads", type=int, default=10)
-    parser.add_argument("--text", default="This is a test review for benchmarking")
-    
+    parser = argparse.ArgumentParser(description="Open-loop load test for the prediction API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--rate", type=float, default=None, help="Fixed arrival rate (req/s)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds at --rate")
+    parser.add_argument("--ramp", type=float, nargs=3, metavar=("START", "END", "STEP"),
+                        help="Step the arrival rate from START to END req/s")
+    parser.add_argument("--step-duration", type=float, default=20.0, help="Seconds per ramp step")
+    parser.add_argument("--warmup", type=float, default=0.0,
+                        help="Seconds at the first rate before measuring")
+    parser.add_argument("--arrivals", choices=["poisson", "uniform"], default="poisson")
+    parser.add_argument("--batch-ratio", type=float, default=0.0,
+                        help="Fraction of requests sent to /predict/batch")
+    parser.add_argument("--batch-size", type=int, default=16, help="Texts per batch request")
+    parser.add_argument("--lengths", default="short=0.6,medium=0.3,long=0.1",
+                        help="Synthetic text length mix (short 5-20, medium 20-100, long 100-400 words)")
+    parser.add_argument("--corpus", default=None, help="JSONL file of texts to replay instead")
+    parser.add_argument("--text-field", default="text", help="Text field of corpus records")
+    parser.add_argument("--connections", type=int, default=100, help="Keep-alive connection pool size")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Outstanding requests before new ones count as client_saturated")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--slo-ms", type=float, default=None,
+                        help="Corrected p99 above this marks a stage as saturated")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report")
+
     args = parser.parse_args()
-    
-    payload = {"text": args.text}
-    benchmark_endpoint(args.url, args.num_requests, args.num_threads, payload)
+    report = asyncio.run(main(args))
 
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
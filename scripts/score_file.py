@@ -0,0 +1,302 @@
+"""Score a large JSONL, CSV or Parquet file offline with a pool of model workers.
+
+Run from the repository root:
+
+    python -m scripts.score_file reviews.csv --output scored.jsonl --workers 4
+
+Results are appended to the output file in input order. After each chunk a
+checkpoint records how many rows and bytes are safely written, so rerunning
+the same command after a crash or kill resumes where it stopped. Once
+the run finishes, the checkpoint is marked complete and a rerun stops
+with a message unless ``--overwrite`` is given.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.config import settings
+from app.core.topology import WorkerSlot, apply_worker_slot, plan_layout
+from app.utils.records import detect_format, iter_records
+
+# (start row, output lines, worker pid, busy seconds)
+ChunkResult = Tuple[int, List[str], int, float]
+
+# Per-process model, created by the pool initializer
+_worker_model = None
+
+
+def _init_worker(layout: List[WorkerSlot]) -> None:
+    """Take the CPU slot matching this pool worker and load its model.
+
+    Pool workers are numbered from 1 in start order, and a replacement for
+    a dead worker gets the next number, so the slot is derived from that
+    number rather than claimed from a queue a replacement could never read.
+    """
+    global _worker_model
+
+    from app.core.model import SentimentModel
+
+    identity = multiprocessing.current_process()._identity
+    worker_number = identity[-1] if identity else 1
+    apply_worker_slot(layout[(worker_number - 1) % len(layout)])
+    _worker_model = SentimentModel()
+
+
+def _score_chunk(task: Tuple[int, List[Tuple[Any, str]]]) -> ChunkResult:
+    """Score one chunk of records in a worker process."""
+    start_row, records = task
+    start = time.perf_counter()
+    predictions = _worker_model.predict_many([text for _, text in records])
+    elapsed = time.perf_counter() - start
+
+    lines = []
+    for offset, ((item_id, _), prediction) in enumerate(zip(records, predictions)):
+        row: Dict[str, Any] = {"row": start_row + offset + 1}
+        if item_id is not None:
+            row["id"] = item_id
+        row["sentiment"] = prediction["sentiment"]
+        row["confidence"] = prediction["confidence"]
+        row["scores"] = prediction["scores"]
+        lines.append(json.dumps(row))
+    return start_row, lines, os.getpid(), elapsed
+
+
+def _tasks(
+    records: Iterator[Tuple[Any, str]],
+    chunk_size: int,
+    start_row: int,
+) -> Iterator[Tuple[int, List[Tuple[Any, str]]]]:
+    """Number and group records into chunks."""
+    row = start_row
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield row, chunk
+        row += len(chunk)
+
+
+def load_checkpoint(checkpoint_path: str, input_path: str) -> Dict[str, Any]:
+    """Rows and output bytes already committed, or zeros for a fresh run."""
+    if not os.path.exists(checkpoint_path):
+        return {"rows_done": 0, "output_bytes": 0, "completed": False}
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("input") != os.path.abspath(input_path):
+        raise ValueError(
+            f"Checkpoint {checkpoint_path} belongs to {checkpoint.get('input')}, "
+            "remove it or choose another output file"
+        )
+    return {
+        "rows_done": checkpoint["rows_done"],
+        "output_bytes": checkpoint["output_bytes"],
+        "completed": checkpoint.get("completed", False),
+    }
+
+
+def save_checkpoint(
+    checkpoint_path: str,
+    input_path: str,
+    rows_done: int,
+    output_bytes: int,
+    completed: bool = False,
+) -> None:
+    """Atomically record committed progress; ``completed`` marks a finished run."""
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {
+                "input": os.path.abspath(input_path),
+                "rows_done": rows_done,
+                "output_bytes": output_bytes,
+                "completed": completed,
+            },
+            f,
+        )
+    os.replace(tmp_path, checkpoint_path)
+
+
+class _Progress:
+    """Committed rows and per-worker throughput for one run."""
+
+    def __init__(self, rows_done: int):
+        self.rows_done = rows_done
+        self.rows_this_run = 0
+        self.start = time.perf_counter()
+        # pid -> [rows, busy seconds]
+        self.workers: Dict[int, List[float]] = {}
+
+    def add(self, result: ChunkResult) -> None:
+        start_row, lines, pid, busy = result
+        self.rows_done = start_row + len(lines)
+        self.rows_this_run += len(lines)
+        stats = self.workers.setdefault(pid, [0, 0.0])
+        stats[0] += len(lines)
+        stats[1] += busy
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def worker_rates(self) -> Dict[int, float]:
+        """Rows per second of busy time for each worker process."""
+        return {
+            pid: rows / busy if busy > 0 else 0.0
+            for pid, (rows, busy) in sorted(self.workers.items())
+        }
+
+    def report(self) -> None:
+        rate = self.rows_this_run / self.elapsed if self.elapsed > 0 else 0.0
+        per_worker = ", ".join(
+            f"{pid}: {worker_rate:.1f}" for pid, worker_rate in self.worker_rates().items()
+        )
+        print(
+            f"{self.rows_done} rows done, {rate:.1f} rows/sec "
+            f"(per worker rows/sec {per_worker})"
+        )
+
+
+def _commit(
+    result: ChunkResult,
+    out,
+    checkpoint_path: str,
+    input_path: str,
+    progress: _Progress,
+) -> None:
+    """Durably append one chunk's results, then checkpoint past it."""
+    _, lines, _, _ = result
+    out.write(("\n".join(lines) + "\n").encode("utf-8"))
+    out.flush()
+    os.fsync(out.fileno())
+    progress.add(result)
+    save_checkpoint(checkpoint_path, input_path, progress.rows_done, out.tell())
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    file_format: str = None,
+    workers: int = 1,
+    chunk_size: int = 256,
+    text_field: str = "text",
+    id_field: str = "id",
+    report_every: float = 10.0,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """Score ``input_path`` into ``output_path`` (JSONL), resuming from any checkpoint.
+
+    Raises ValueError rather than replacing a finished output, or an output
+    with no checkpoint, unless ``overwrite`` is set.
+    """
+    file_format = file_format or detect_format(input_path)
+    checkpoint_path = output_path + ".checkpoint"
+    if overwrite and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = load_checkpoint(checkpoint_path, input_path)
+    rows_done = checkpoint["rows_done"]
+
+    if not overwrite:
+        if checkpoint["completed"]:
+            raise ValueError(
+                f"{output_path} is already complete ({rows_done} rows), "
+                "pass --overwrite to score it again"
+            )
+        if not os.path.exists(checkpoint_path) and os.path.exists(output_path):
+            raise ValueError(
+                f"{output_path} exists without a checkpoint, pass --overwrite to replace it"
+            )
+
+    # Drop anything written after the last checkpoint
+    mode = "r+b" if os.path.exists(output_path) else "wb"
+    with open(output_path, mode) as out:
+        out.truncate(checkpoint["output_bytes"])
+    if rows_done:
+        print(f"Resuming after {rows_done} rows")
+
+    records = iter_records(input_path, file_format, text_field=text_field, id_field=id_field)
+    tasks = _tasks(islice(records, rows_done, None), chunk_size, rows_done)
+
+    # Fork so workers inherit settings changed on the command line
+    context = multiprocessing.get_context("fork")
+    layout = plan_layout(workers=workers)
+
+    progress = _Progress(rows_done)
+    last_report = progress.start
+
+    with context.Pool(workers, initializer=_init_worker, initargs=(layout,)) as pool, \
+            open(output_path, "ab") as out:
+        # Keep a bounded window of chunks in flight (Pool.imap would read the
+        # whole input ahead) and commit them in input order, so the output is
+        # always a checkpointed prefix plus at most one partial chunk
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_score_chunk, (task,)))
+            if len(pending) >= workers * 2:
+                _commit(pending.popleft().get(), out, checkpoint_path, input_path, progress)
+
+            if time.perf_counter() - last_report >= report_every:
+                progress.report()
+                last_report = time.perf_counter()
+
+        while pending:
+            _commit(pending.popleft().get(), out, checkpoint_path, input_path, progress)
+
+    progress.report()
+    # Kept so that rerunning the command does not rewrite a finished output
+    save_checkpoint(
+        checkpoint_path,
+        input_path,
+        progress.rows_done,
+        os.path.getsize(output_path),
+        completed=True,
+    )
+
+    return {
+        "rows_done": progress.rows_done,
+        "rows_this_run": progress.rows_this_run,
+        "elapsed_seconds": progress.elapsed,
+        "worker_rows_per_second": progress.worker_rates(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a JSONL, CSV or Parquet file offline")
+    parser.add_argument("input", help="Input file (.jsonl, .ndjson, .csv or .parquet)")
+    parser.add_argument("--output", required=True, help="Output JSONL file")
+    parser.add_argument("--format", choices=["jsonl", "csv", "parquet"], default=None,
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--workers", type=int, default=settings.workers,
+                        help="Worker processes, each holding its own model")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Rows per worker task")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--model", default=None, help="Model name or path (default: MODEL_NAME)")
+    parser.add_argument("--report-every", type=float, default=10.0,
+                        help="Seconds between progress reports")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Score from the start even if the output is complete or exists")
+
+    args = parser.parse_args()
+    if args.model:
+        settings.model_name = args.model
+
+    try:
+        score_file(
+            args.input,
+            args.output,
+            file_format=args.format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            text_field=args.text_field,
+            id_field=args.id_field,
+            report_every=args.report_every,
+            overwrite=args.overwrite,
+        )
+    except ValueError as e:
+        sys.exit(f"error: {e}")
@@ -0,0 +1,10 @@
+"""Shared test fixtures."""
+import pytest
+
+from benchmarks.tiny_model import save_tiny_model
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """Save a randomly initialized tiny DistilBERT classifier for offline tests."""
+    return save_tiny_model(str(tmp_path_factory.mktemp("tiny-distilbert")))
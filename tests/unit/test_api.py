@@ -1,9 +1,11 @@
 """Tests for API endpoints."""
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, patch, Mock
 
+from app.api.responses import batch_payload, prediction_payload
 from app.main import app
+from app.schemas.response import BatchPredictionResponse, PredictionResponse
 
 
 @pytest.fixture
@@ -71,10 +73,15 @@ def test_predict_endpoint(client):
         "scores": {"positive": 0.95, "negative": 0.03, "neutral": 0.02},
         "processing_time_ms": 35.0
     }
+    mock_model_instance.predict_many.side_effect = lambda texts: [
+        mock_model_instance.predict.return_value for _ in texts
+    ]
     
     with patch('app.api.endpoints.predict.get_model', return_value=mock_model_instance), \
+         patch('app.core.batcher.get_model', return_value=mock_model_instance), \
          patch('app.api.endpoints.predict.prediction_cache') as mock_cache:
-        mock_cache.get.return_value = None  # No cache hit
+        mock_cache.aget = AsyncMock(return_value=None)  # No cache hit
+        mock_cache.aset = AsyncMock()
         response = client.post(
             "/api/v1/predict",
             json={"text": "This is great!"}
@@ -83,6 +90,7 @@ def test_predict_endpoint(client):
         data = response.json()
         assert data["sentiment"] == "positive"
         assert data["confidence"] == 0.95
+        PredictionResponse.model_validate(data)
 
 
 def test_batch_predict_endpoint(client):
@@ -105,4 +113,81 @@ def test_batch_predict_endpoint(client):
         data = response.json()
         assert len(data["predictions"]) == 2
         assert data["total_processed"] == 2
+        BatchPredictionResponse.model_validate(data)
 
+
+
+def test_batch_predict_endpoint_overloaded(client):
+    """Test that a full inference queue returns 503 with Retry-After."""
+    from app.core.executor import InferenceOverloadedError
+
+    async def overloaded(*args):
+        raise InferenceOverloadedError(retry_after=2)
+
+    with patch('app.api.endpoints.batch.get_model'), \
+         patch('app.api.endpoints.batch.inference_executor') as mock_executor:
+        mock_executor.run = overloaded
+        response = client.post(
+            "/api/v1/predict/batch",
+            json={"texts": ["Great!", "Bad!"]}
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+
+
+def test_stream_predict_endpoint(client):
+    """Test NDJSON streaming predictions with per-line errors."""
+    import json
+
+    mock_model_instance = Mock()
+    mock_model_instance.predict_many.side_effect = lambda texts: [
+        {
+            "sentiment": "positive",
+            "confidence": 0.9,
+            "scores": {"positive": 0.9, "negative": 0.05, "neutral": 0.05},
+            "processing_time_ms": 1.0,
+        }
+        for _ in texts
+    ]
+    body = "\n".join([
+        json.dumps({"id": "a", "text": "Great!"}),
+        "not json",
+        json.dumps("Bare string"),
+        "",
+        json.dumps({"text": "Last line without newline"}),
+    ])
+
+    with patch('app.api.endpoints.stream.get_model', return_value=mock_model_instance), \
+         patch('app.api.endpoints.stream.settings.stream_batch_size', 2):
+        response = client.post(
+            "/api/v1/predict/stream",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results = sorted(lines, key=lambda line: line["line"])
+    assert [line["line"] for line in results] == [1, 2, 3, 4, 5]
+    assert results[0]["id"] == "a"
+    assert results[0]["sentiment"] == "positive"
+    assert "error" in results[1]
+    assert results[3]["error"] == "Empty line"
+    assert results[4]["scores"]["positive"] == 0.9
+
+
+def test_fast_payloads_match_response_schemas(tiny_model_dir, monkeypatch):
+    """Test that unvalidated response bodies satisfy the response models."""
+    from app.config import settings
+    from app.core.model import SentimentModel
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    model = SentimentModel()
+
+    result = model.predict_many(["great product"])[0]
+    payload = prediction_payload(result)
+    assert PredictionResponse.model_validate(payload).model_dump() == payload
+
+    predictions, processing_time = model.predict_batch(["great product", "", "bad"])
+    payload = batch_payload(predictions, 0, 0.5, processing_time)
+    assert BatchPredictionResponse.model_validate(payload).model_dump() == payload
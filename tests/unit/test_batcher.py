@@ -0,0 +1,82 @@
+"""Tests for micro-batching module."""
+import asyncio
+
+from app.core.batcher import MicroBatcher
+
+
+def _fake_predict_many(calls):
+    """Build a batch function that records the batches it receives."""
+
+    def predict_many(texts):
+        calls.append(list(texts))
+        return [
+            {"sentiment": "positive", "confidence": 0.9, "text": text}
+            for text in texts
+        ]
+
+    return predict_many
+
+
+def test_concurrent_submits_share_one_batch():
+    """Test that concurrent callers are coalesced into one forward pass."""
+    calls = []
+    batcher = MicroBatcher(_fake_predict_many(calls), max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(5)))
+
+    results = asyncio.run(run())
+
+    assert calls == [[f"text {i}" for i in range(5)]]
+    assert [r["text"] for r in results] == [f"text {i}" for i in range(5)]
+
+
+def test_batch_flushes_at_max_size():
+    """Test that a full batch is flushed without waiting for the timer."""
+    calls = []
+    batcher = MicroBatcher(_fake_predict_many(calls), max_batch_size=2, max_wait_ms=10_000)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(str(i)) for i in range(4))),
+            timeout=1,
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == [["0", "1"], ["2", "3"]]
+    assert len(results) == 4
+
+
+def test_batch_error_propagates_to_every_caller():
+    """Test that a failed forward pass fails each waiting request."""
+
+    def failing_predict_many(texts):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(failing_predict_many, max_batch_size=4, max_wait_ms=1)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_batch_tasks_are_referenced_until_done():
+    """Test running batch tasks are held so they cannot be garbage-collected."""
+    batcher = MicroBatcher(predict_fn=lambda texts: texts, max_batch_size=2, max_wait_ms=1)
+
+    async def run():
+        pending = [asyncio.ensure_future(batcher.submit(t)) for t in ("a", "b")]
+        await asyncio.sleep(0)
+        assert len(batcher._tasks) == 1
+        results = await asyncio.gather(*pending)
+        await asyncio.sleep(0)
+        return results
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert not batcher._tasks
@@ -0,0 +1,189 @@
+"""Tests for the open-loop load generator."""
+import asyncio
+import json
+import random
+
+import httpx
+import pytest
+
+from scripts.benchmark import (
+    BATCH_PATH,
+    PREDICT_PATH,
+    Sample,
+    Stage,
+    Traffic,
+    arrival_times,
+    build_stages,
+    corpus_texts,
+    find_saturation,
+    parse_length_mix,
+    percentiles,
+    run_load,
+    summarize,
+    synthetic_texts,
+)
+
+
+def test_build_stages_ramp_with_warmup():
+    """Test a ramp becomes one stage per step after a warm-up stage."""
+    stages = build_stages(ramp=(10, 30, 10), step_duration=5, warmup=2)
+
+    assert stages == [
+        Stage(10, 2, warmup=True),
+        Stage(10, 5),
+        Stage(20, 5),
+        Stage(30, 5),
+    ]
+    with pytest.raises(ValueError):
+        build_stages()
+
+
+def test_arrival_times_follow_stage_rates():
+    """Test each stage schedules requests at its own rate."""
+    stages = [Stage(10, 1.0), Stage(50, 1.0)]
+
+    uniform = list(arrival_times(stages, random.Random(0), poisson=False))
+    assert sum(1 for stage, _ in uniform if stage == 0) == 10
+    assert sum(1 for stage, _ in uniform if stage == 1) == 50
+    assert all(1.0 <= t < 2.0 for stage, t in uniform if stage == 1)
+
+    poisson = list(arrival_times([Stage(200, 5.0)], random.Random(0)))
+    assert 900 < len(poisson) < 1100
+
+
+def test_traffic_mix_and_lengths():
+    """Test the batch ratio and text length mix shape the requests."""
+    rng = random.Random(0)
+    texts = synthetic_texts(parse_length_mix("short=1"), rng)
+    traffic = Traffic(texts, batch_ratio=0.25, batch_size=4, rng=rng)
+
+    requests = [traffic.next() for _ in range(400)]
+    batches = [body for path, body in requests if path == BATCH_PATH]
+    singles = [body for path, body in requests if path == PREDICT_PATH]
+
+    assert 70 < len(batches) < 130
+    assert all(len(body["texts"]) == 4 for body in batches)
+    assert all(5 <= len(body["text"].split(": ", 1)[1].split()) <= 20 for body in singles)
+    # Distinct texts, so the server cache does not absorb the load
+    assert len({body["text"] for body in singles}) == len(singles)
+
+    with pytest.raises(ValueError):
+        parse_length_mix("huge=1")
+
+
+def test_corpus_texts_replays_in_order(tmp_path):
+    """Test corpus replay reads strings, objects and batch bodies, then cycles."""
+    path = tmp_path / "corpus.jsonl"
+    path.write_text(
+        "\n".join([
+            json.dumps("first"),
+            json.dumps({"body": "second"}),
+            json.dumps({"texts": ["third", "fourth"]}),
+            "not json",
+        ]),
+        encoding="utf-8",
+    )
+
+    texts = corpus_texts(str(path), text_field="body")
+    assert [next(texts) for _ in range(5)] == ["first", "second", "third", "fourth", "first"]
+
+
+def test_run_load_is_open_loop():
+    """Test requests go out on schedule while a slow server queues them."""
+    lock = asyncio.Lock()
+
+    async def slow_server(request):
+        # One request at a time, 20 ms each: capacity 50 req/s
+        async with lock:
+            await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"sentiment": "positive"})
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(slow_server),
+            base_url="http://test",
+        ) as client:
+            traffic = Traffic(iter(lambda: "text", None))
+            return await run_load(
+                client, [Stage(100, 0.3)], traffic, poisson=False
+            )
+
+    samples = asyncio.run(run())
+
+    assert len(samples) == 30
+    assert all(s.ok for s in samples)
+    # Sent on schedule despite the backlog...
+    assert max(s.sent - s.intended for s in samples) < 0.05
+    # ...so latency grows as the server queue builds
+    assert samples[-1].latency > samples[0].latency + 0.1
+
+
+def test_run_load_counts_client_saturation():
+    """Test requests beyond the in-flight limit are recorded, not delayed."""
+    release = asyncio.Event()
+
+    async def stuck_server(request):
+        await release.wait()
+        return httpx.Response(200)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(stuck_server),
+            base_url="http://test",
+        ) as client:
+            traffic = Traffic(iter(lambda: "text", None))
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.15, release.set)
+            return await run_load(
+                client, [Stage(100, 0.1)], traffic, max_in_flight=3, poisson=False
+            )
+
+    samples = asyncio.run(run())
+
+    assert sum(1 for s in samples if s.ok) == 3
+    assert all(s.error == "client_saturated" for s in samples[3:])
+
+
+def test_latency_is_corrected_for_coordinated_omission():
+    """Test latency counts from the scheduled time, service time from the send."""
+    late = Sample(0, PREDICT_PATH, 1, intended=1.0, sent=1.5, done=1.6, status=200)
+
+    assert late.latency == pytest.approx(0.6)
+    assert late.service_time == pytest.approx(0.1)
+
+    report = summarize([Stage(1, 10.0)], [late])
+    assert report["stages"][0]["latency_ms"]["p50"] == pytest.approx(600)
+    assert report["stages"][0]["service_time_ms"]["p50"] == pytest.approx(100)
+
+
+def test_percentiles_nearest_rank():
+    """Test percentiles of 1..1000 ms."""
+    result = percentiles([i / 1000 for i in range(1, 1001)])
+
+    assert result["p50"] == 501
+    assert result["p99"] == 991
+    assert result["max"] == 1000
+    assert percentiles([])["p99"] is None
+
+
+def test_find_saturation():
+    """Test the first stage missing throughput, errors or SLO is reported."""
+    def stage(target, achieved, p99, error_rate=0.0):
+        return {
+            "target_rps": target,
+            "offered_rps": target,
+            "achieved_rps": achieved,
+            "error_rate": error_rate,
+            "latency_ms": {"p99": p99},
+        }
+
+    stages = [stage(10, 10, 40), stage(20, 19.8, 80), stage(30, 29.9, 400), stage(40, 31, 900)]
+
+    assert find_saturation(stages) == {
+        "max_sustained_rps": 30,
+        "saturated_at_rps": 40,
+        "reasons": ["throughput below offered load"],
+    }
+    assert find_saturation(stages, slo_ms=250)["saturated_at_rps"] == 30
+    assert find_saturation(stages[:2])["saturated_at_rps"] is None
+    assert find_saturation([stage(10, 10, 40, error_rate=0.2)])["reasons"] == ["error rate"]
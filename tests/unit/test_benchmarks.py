@@ -0,0 +1,29 @@
+"""Tests for the in-process benchmark suite."""
+import json
+
+from app.config import settings
+from app.core.cache import prediction_cache
+from benchmarks import inference
+
+
+def test_inference_suite_produces_comparable_json():
+    """Test a minimal run covers every benchmark and round-trips as JSON."""
+    model_name = settings.model_name
+    namespace = prediction_cache.namespace
+
+    results = inference.run(model_size="tiny", repeat=2, batch_sizes=[2], cache_sizes=[200])
+    results = json.loads(json.dumps(results))
+
+    assert settings.model_name == model_name
+    assert prediction_cache.namespace == namespace
+    assert results["environment"]["model"] == "random-distilbert-tiny"
+    names = set(results["benchmarks"])
+    assert {"predict/short", "predict_batch/long/2", "cache_get_many/200/100",
+            "cache_set_many/200/100", "preprocess/medium"} <= names
+    for result in results["benchmarks"].values():
+        assert result["p50_ms"] >= 0
+        assert result["items_per_second"] >= 0
+
+    ratios = inference.compare(results, results)
+    assert set(ratios) <= names
+    assert all(ratio == 1.0 for ratio in ratios.values())
@@ -0,0 +1,382 @@
+"""Tests for cache module."""
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from app.core.cache import DiskCache, PredictionCache, RedisCache
+
+PREDICTION = {"sentiment": "positive", "confidence": 0.9}
+
+
+class FakeRedis:
+    """In-process stand-in for the Redis commands RedisCache uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.round_trips = 0
+        self.fail = False
+
+    def _call(self):
+        self.round_trips += 1
+        if self.fail:
+            raise TimeoutError("Timeout reading from socket")
+
+    def mget(self, keys):
+        self._call()
+        return [self.data.get(key) for key in keys]
+
+    def mset(self, mapping):
+        self._call()
+        self.data.update(mapping)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffers SET commands until execute, like a Redis pipeline."""
+
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    def execute(self):
+        self.server._call()
+        for key, value, ex in self.commands:
+            self.server.data[key] = value
+            self.server.expiry[key] = ex
+
+
+def test_get_and_set():
+    """Test basic cache round trip."""
+    cache = PredictionCache(maxsize=10)
+    assert cache.get("hello") is None
+
+    cache.set("hello", PREDICTION)
+
+    assert cache.get("hello") == PREDICTION
+    assert cache.size() == 1
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = PredictionCache(maxsize=2)
+    cache.set("a", PREDICTION)
+    cache.set("b", PREDICTION)
+    cache.get("a")  # "b" is now least recently used
+
+    cache.set("c", PREDICTION)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size() == 2
+
+
+def test_update_existing_key_does_not_evict():
+    """Test that overwriting an entry keeps the cache size."""
+    cache = PredictionCache(maxsize=2)
+    cache.set("a", PREDICTION)
+    cache.set("b", PREDICTION)
+
+    cache.set("a", {"sentiment": "negative", "confidence": 0.8})
+
+    assert cache.size() == 2
+    assert cache.get("a")["sentiment"] == "negative"
+    assert cache.get("b") is not None
+
+
+def test_ttl_expiry():
+    """Test that expired entries are treated as misses."""
+    cache = PredictionCache(maxsize=10, ttl=0.01)
+    cache.set("a", PREDICTION)
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.size() == 0
+
+
+def test_byte_budget():
+    """Test that the memory budget bounds the cache."""
+    probe = PredictionCache(maxsize=10)
+    probe.set("a", PREDICTION)
+    entry_bytes = probe.nbytes()
+
+    cache = PredictionCache(maxsize=100, max_bytes=entry_bytes * 3)
+    for i in range(10):
+        cache.set(f"text {i}", PREDICTION)
+
+    assert cache.size() == 3
+    assert cache.nbytes() <= entry_bytes * 3
+    assert cache.get("text 9") is not None
+
+
+def test_concurrent_access():
+    """Test that concurrent writers keep the cache consistent."""
+    cache = PredictionCache(maxsize=50)
+
+    def worker(offset):
+        for i in range(500):
+            cache.set(f"{offset}-{i}", PREDICTION)
+            cache.get(f"{offset}-{i // 2}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.size() == 50
+
+
+def test_clear():
+    """Test clearing the cache."""
+    cache = PredictionCache(maxsize=10)
+    cache.set("a", PREDICTION)
+
+    cache.clear()
+
+    assert cache.size() == 0
+    assert cache.nbytes() == 0
+
+
+def test_keys_normalized_through_preprocessing():
+    """Test that texts with identical model input share an entry."""
+    cache = PredictionCache(maxsize=10)
+    cache.set("Great product", PREDICTION)
+
+    assert cache.get("  great   PRODUCT ") == PREDICTION
+
+
+def test_namespace_scopes_entries():
+    """Test that switching model identity invalidates old entries."""
+    cache = PredictionCache(maxsize=10)
+    cache.set_namespace("model-a@v1:negative,neutral,positive")
+    cache.set("hello", PREDICTION)
+
+    cache.set_namespace("model-a@v2:negative,neutral,positive")
+
+    assert cache.get("hello") is None
+    assert cache._hash_key("hello") != PredictionCache()._hash_key("hello")
+
+
+def test_get_many_and_set_many():
+    """Test bulk lookups and fills."""
+    cache = PredictionCache(maxsize=10)
+    cache.set_many([("a", PREDICTION), ("b", PREDICTION)])
+
+    assert cache.get_many(["a", "missing", "b"]) == [PREDICTION, None, PREDICTION]
+
+
+def test_processed_texts_share_keys_without_preprocessing_again():
+    """Test already-preprocessed texts hit the same entries without another preprocess pass."""
+    cache = PredictionCache(maxsize=10)
+    cache.set_many([("great product", PREDICTION)], processed=True)
+
+    with patch("app.core.cache.preprocess_text") as preprocess:
+        assert cache.get_many(["great product"], processed=True) == [PREDICTION]
+    preprocess.assert_not_called()
+    assert cache.get("  GREAT Product ") == PREDICTION
+
+
+def test_disk_tier_shared_and_persistent(tmp_path):
+    """Test that the disk tier is shared between caches and survives reopening."""
+    path = str(tmp_path / "cache.sqlite")
+    worker_a = PredictionCache(maxsize=10, backend=DiskCache(path))
+    worker_b = PredictionCache(maxsize=10, backend=DiskCache(path))
+
+    worker_a.set_many([("hello", PREDICTION), ("world", PREDICTION)])
+
+    assert worker_b.get_many(["hello", "missing"]) == [PREDICTION, None]
+    assert worker_b.size() == 1  # promoted into memory
+
+    restarted = PredictionCache(maxsize=10, backend=DiskCache(path))
+    assert restarted.get("world") == PREDICTION
+
+
+def test_disk_tier_evicts_least_recently_read(tmp_path):
+    """Test size-capped eviction of the disk tier."""
+    disk = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=100)
+    disk.set_many([("old", PREDICTION), ("hot", PREDICTION)])
+    disk.set_many([(f"key{i}", PREDICTION) for i in range(97)])
+    time.sleep(0.01)
+    disk.get_many(["hot"])
+    time.sleep(0.01)
+
+    disk.set_many([(f"new{i}", PREDICTION) for i in range(5)])
+
+    # Eviction runs in the background
+    deadline = time.monotonic() + 5
+    while disk.size() != 90 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert disk.size() == 90
+    assert disk.get_many(["old", "hot"]) == {"hot": PREDICTION}
+
+
+def test_disk_tier_read_hits_take_no_write_lock(tmp_path):
+    """Test that lookups succeed while another writer holds the database, recency applied later."""
+    import sqlite3
+
+    path = str(tmp_path / "cache.sqlite")
+    disk = DiskCache(path, timeout_ms=10)
+    disk.set_many([("hot", PREDICTION)])
+    before = disk._connection().execute("SELECT accessed_at FROM predictions").fetchone()[0]
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        time.sleep(0.01)
+        assert disk.get_many(["hot"]) == {"hot": PREDICTION}
+        assert disk.available
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    disk.apply_touches(disk._open(1000))
+    after = disk._connection().execute("SELECT accessed_at FROM predictions").fetchone()[0]
+    assert after > before
+
+
+def test_disk_tier_evicts_in_chunks(tmp_path):
+    """Test that expired and excess entries are deleted a chunk at a time."""
+    disk = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=1000, ttl=0.01)
+    disk._check_every = 10**9  # no background eviction, evict explicitly below
+    disk.set_many([(f"expired{i}", PREDICTION) for i in range(25)])
+    disk.ttl = 0
+    disk.set_many([(f"old{i}", PREDICTION) for i in range(150)])
+    time.sleep(0.02)
+    disk.set_many([(f"key{i}", PREDICTION) for i in range(900)])
+
+    disk.evict(chunk=10)
+
+    assert disk.size() == 900
+    assert disk.get_many(["expired0", "old149", "key0"]) == {"key0": PREDICTION}
+
+
+def test_disk_tier_errors_fall_back_to_miss(tmp_path):
+    """Test that an unusable database never fails a lookup."""
+    cache = PredictionCache(maxsize=10, backend=DiskCache(str(tmp_path)))  # a directory
+
+    cache.set("hello", PREDICTION)
+
+    assert cache.get("hello") == PREDICTION
+    assert cache.get("other") is None
+
+
+def test_async_variants_offload_the_backend():
+    """Test that async lookups read the backend on a worker thread and writes happen behind."""
+    server = FakeRedis()
+    threads = []
+    original_mget = server.mget
+
+    def mget(keys):
+        threads.append(threading.current_thread())
+        return original_mget(keys)
+
+    server.mget = mget
+    writer = PredictionCache(maxsize=10, backend=RedisCache(client=server))
+    reader = PredictionCache(maxsize=10, backend=RedisCache(client=server))
+
+    async def run():
+        await writer.aset_many([("hello", PREDICTION), ("world", PREDICTION)])
+        writer.flush()
+        results = await reader.aget_many(["hello", "missing"])
+        return results, await reader.aget("hello")
+
+    results, again = asyncio.run(run())
+
+    assert results == [PREDICTION, None]
+    assert again == PREDICTION  # promoted, so no second backend read
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+    assert writer.get("world") == PREDICTION
+
+
+def test_write_behind_queue_is_bounded():
+    """Test that writes queued behind a slow backend are merged, and dropped once full."""
+    from app.core.cache import CacheBackend
+    from app.utils.metrics import cache_backend_writes_dropped_total
+
+    writing = threading.Event()
+    release = threading.Event()
+    writes = []
+
+    class SlowBackend(CacheBackend):
+        name = "slow"
+
+        def _get_many(self, keys):
+            return {}
+
+        def _set_many(self, entries):
+            writes.append(len(entries))
+            writing.set()
+            release.wait(5)
+
+    cache = PredictionCache(maxsize=10, backend=SlowBackend(), write_queue_size=2)
+    dropped = cache_backend_writes_dropped_total.labels(backend="slow")
+    before = dropped._value.get()
+
+    async def run():
+        await cache.aset("first", PREDICTION)
+        assert writing.wait(5)
+        for text in ("second", "third", "fourth"):
+            await cache.aset(text, PREDICTION)
+
+    asyncio.run(run())
+    release.set()
+    cache.flush()
+
+    assert writes == [1, 2]
+    assert dropped._value.get() == before + 1
+    assert cache.get("fourth") == PREDICTION  # still cached in memory
+
+
+def test_redis_backend_shared_across_replicas():
+    """Test that replicas share entries with one round trip per batch."""
+    server = FakeRedis()
+    replica_a = PredictionCache(maxsize=10, backend=RedisCache(client=server))
+    replica_b = PredictionCache(maxsize=10, backend=RedisCache(client=server))
+
+    replica_a.set_many([("hello", PREDICTION), ("world", PREDICTION)])
+    assert server.round_trips == 1
+
+    assert replica_b.get_many(["hello", "world", "missing"]) == [PREDICTION, PREDICTION, None]
+    assert server.round_trips == 2
+
+    # Promoted into memory, so the next lookup stays local
+    assert replica_b.get("hello") == PREDICTION
+    assert server.round_trips == 2
+
+
+def test_redis_backend_ttl_uses_pipelined_set():
+    """Test that entries with a TTL are written in one pipelined round trip."""
+    server = FakeRedis()
+    backend = RedisCache(client=server, ttl=60)
+
+    backend.set_many([("a", PREDICTION), ("b", PREDICTION)])
+
+    assert server.round_trips == 1
+    assert set(server.expiry.values()) == {60}
+
+
+def test_redis_backend_timeout_falls_back_to_local():
+    """Test that a slow backend is bypassed for a while after a timeout."""
+    server = FakeRedis()
+    cache = PredictionCache(maxsize=10, backend=RedisCache(client=server, retry_seconds=0.05))
+    server.fail = True
+
+    cache.set("hello", PREDICTION)
+    assert cache.get("hello") == PREDICTION
+    assert cache.get("other") is None
+    assert server.round_trips == 1  # bypassed after the first failure
+
+    server.fail = False
+    time.sleep(0.06)
+    cache.set("again", PREDICTION)
+    assert server.round_trips == 2
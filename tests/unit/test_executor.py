@@ -0,0 +1,66 @@
+"""Tests for inference executor module."""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executor import InferenceExecutor, InferenceOverloadedError
+
+
+def test_run_returns_result_off_loop():
+    """Test that calls run on an executor thread, not the event loop."""
+    executor = InferenceExecutor(max_concurrency=1, max_queue=1)
+
+    async def run():
+        return await executor.run(lambda: threading.current_thread().name)
+
+    thread_name = asyncio.run(run())
+
+    assert thread_name.startswith("inference")
+    assert executor.pending == 0
+
+
+def test_full_queue_rejects_fast():
+    """Test that calls beyond concurrency + queue are shed immediately."""
+    executor = InferenceExecutor(max_concurrency=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(InferenceOverloadedError) as exc_info:
+            await executor.run(release.wait)
+
+        release.set()
+        await asyncio.gather(running, queued)
+        return exc_info.value
+
+    error = asyncio.run(run())
+
+    assert error.retry_after >= 0
+    assert executor.pending == 0
+
+
+def test_run_sync_from_background_thread():
+    """Test that background threads can run calls on the shared pool."""
+    executor = InferenceExecutor(max_concurrency=1, max_queue=1)
+
+    thread_name = executor.run_sync(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("inference")
+    assert executor.pending == 0
+
+
+def test_run_propagates_context_to_pool_thread():
+    """Test that context variables set by the caller are visible in the call."""
+    from app.utils.timing import current_endpoint
+
+    executor = InferenceExecutor(max_concurrency=1, max_queue=1)
+
+    async def run():
+        current_endpoint.set("/predict/batch")
+        return await executor.run(current_endpoint.get)
+
+    assert asyncio.run(run()) == "/predict/batch"
@@ -0,0 +1,197 @@
+"""Tests for bulk scoring jobs."""
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.jobs import Job, JobManager
+from app.main import app
+from app.utils.records import detect_format, iter_records
+
+
+def _mock_model():
+    model = Mock()
+    model.predict_many.side_effect = lambda texts: [
+        {"sentiment": "positive", "confidence": 0.9, "scores": {}, "processing_time_ms": 1.0}
+        for _ in texts
+    ]
+    return model
+
+
+def _run_job(manager, filename, content):
+    job = manager.create(filename)
+    manager.input_path(job).write_text(content, encoding="utf-8")
+    with patch("app.core.jobs.get_model", return_value=_mock_model()):
+        manager.submit(job)
+        manager._queue.join()
+    return manager.get(job.job_id)
+
+
+def test_iter_records_jsonl_and_csv(tmp_path):
+    """Test reading records from JSONL and CSV files."""
+    jsonl = tmp_path / "in.jsonl"
+    jsonl.write_text('{"id": 1, "text": "Great"}\n\n"Bare"\n', encoding="utf-8")
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text('id,text\nr1,"Hello, world"\nr2,Bye\n', encoding="utf-8")
+
+    assert list(iter_records(jsonl, "jsonl")) == [(1, "Great"), (None, "Bare")]
+    assert list(iter_records(csv_file, "csv")) == [("r1", "Hello, world"), ("r2", "Bye")]
+    assert detect_format("DATA.NDJSON") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("data.xlsx")
+
+
+def test_job_scores_in_chunks(tmp_path):
+    """Test that a job scores all rows in chunks and writes results."""
+    manager = JobManager(jobs_dir=str(tmp_path), batch_size=2)
+    content = "".join(json.dumps({"id": i, "text": f"text {i}"}) + "\n" for i in range(5))
+
+    job = _run_job(manager, "reviews.jsonl", content)
+
+    assert job.status == "completed"
+    assert job.rows_total == 5
+    assert job.rows_done == 5
+    assert job.to_dict()["rows_per_second"] > 0
+    rows = [json.loads(line) for line in manager.results_path(job).read_text().splitlines()]
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+    assert rows[0] == {"row": 1, "id": 0, "sentiment": "positive", "confidence": 0.9}
+
+
+def test_job_bypasses_the_prediction_cache(tiny_model_dir, tmp_path, monkeypatch):
+    """Test that job rows are neither served from nor written to the shared cache."""
+    from app.config import settings
+    from app.core.cache import prediction_cache
+    from app.core.model import SentimentModel
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    model = SentimentModel()
+    manager = JobManager(jobs_dir=str(tmp_path))
+    job = manager.create("reviews.jsonl")
+    manager.input_path(job).write_text('"Back-fill row"\n', encoding="utf-8")
+
+    with patch("app.core.jobs.get_model", return_value=model):
+        manager.submit(job)
+        manager._queue.join()
+
+    assert manager.get(job.job_id).status == "completed"
+    assert prediction_cache.get("Back-fill row") is None
+
+
+def test_job_with_invalid_input_fails(tmp_path):
+    """Test that malformed input fails the job before scoring."""
+    manager = JobManager(jobs_dir=str(tmp_path))
+
+    job = _run_job(manager, "reviews.csv", "review\nno text column\n")
+
+    assert job.status == "failed"
+    assert "text" in job.error
+    assert job.rows_done == 0
+
+
+def test_recover_requeues_interrupted_jobs(tmp_path):
+    """Test that jobs left queued or running are requeued unless still locked."""
+    manager = JobManager(jobs_dir=str(tmp_path))
+    content = json.dumps({"id": 1, "text": "Great"}) + "\n"
+    jobs = {}
+    for status in ("queued", "running", "completed", "locked"):
+        job = manager.create("reviews.jsonl")
+        manager.input_path(job).write_text(content, encoding="utf-8")
+        job.status = "running" if status == "locked" else status
+        job.rows_done = 1 if status == "running" else 0
+        manager._save(job)
+        jobs[status] = job
+
+    # A live worker process still holds this job's lock
+    held = manager._claim(jobs["locked"].job_id)
+    restarted = JobManager(jobs_dir=str(tmp_path))
+    try:
+        with patch("app.core.jobs.get_model", return_value=_mock_model()):
+            assert restarted.recover() == 2
+            restarted._queue.join()
+    finally:
+        held.close()
+
+    assert restarted.get(jobs["queued"].job_id).status == "completed"
+    resumed = restarted.get(jobs["running"].job_id)
+    assert resumed.status == "completed"
+    assert resumed.rows_done == 1
+    assert restarted.get(jobs["locked"].job_id).status == "running"
+
+
+def test_locked_job_is_not_run_twice(tmp_path):
+    """Test that a queued job another process is running is skipped."""
+    manager = JobManager(jobs_dir=str(tmp_path))
+    job = manager.create("reviews.jsonl")
+    manager.input_path(job).write_text('"Great"\n', encoding="utf-8")
+    manager._save(job)
+
+    held = manager._claim(job.job_id)
+    try:
+        model = _mock_model()
+        with patch("app.core.jobs.get_model", return_value=model):
+            manager._process(job)
+    finally:
+        held.close()
+
+    model.predict_many.assert_not_called()
+    assert manager.get(job.job_id).status == "queued"
+
+
+def test_jobs_api_lifecycle(tmp_path):
+    """Test uploading a job, polling it and downloading results."""
+    manager = JobManager(jobs_dir=str(tmp_path))
+    client = TestClient(app)
+
+    with patch("app.api.endpoints.jobs.job_manager", manager), \
+         patch("app.core.jobs.get_model", return_value=_mock_model()):
+        response = client.post(
+            "/api/v1/jobs",
+            files={"file": ("reviews.csv", b"id,text\na,Great\nb,Bad\n", "text/csv")},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        manager._queue.join()
+
+        status = client.get(f"/api/v1/jobs/{job_id}").json()
+        results = client.get(f"/api/v1/jobs/{job_id}/results")
+
+    assert status["status"] == "completed"
+    assert status["rows_done"] == 2
+    assert results.status_code == 200
+    assert [json.loads(line)["id"] for line in results.text.splitlines()] == ["a", "b"]
+
+
+def test_jobs_api_errors(tmp_path):
+    """Test unknown jobs, unfinished results and unsupported uploads."""
+    manager = JobManager(jobs_dir=str(tmp_path))
+    client = TestClient(app)
+    job = manager.create("pending.jsonl")
+    manager._save(job)
+
+    with patch("app.api.endpoints.jobs.job_manager", manager):
+        assert client.get("/api/v1/jobs/" + "0" * 32).status_code == 404
+        assert client.get("/api/v1/jobs/../../etc").status_code == 404
+        assert client.get(f"/api/v1/jobs/{job.job_id}/results").status_code == 409
+        response = client.post(
+            "/api/v1/jobs",
+            files={"file": ("data.xlsx", b"x", "application/octet-stream")},
+        )
+        parquet = client.post(
+            "/api/v1/jobs",
+            files={"file": ("data.parquet", b"x", "application/octet-stream")},
+        )
+        missing = client.post("/api/v1/jobs", data={"other": "x"})
+        with patch("app.api.endpoints.jobs.settings.job_max_upload_bytes", 10):
+            too_large = client.post(
+                "/api/v1/jobs",
+                files={"file": ("big.jsonl", b'"text"\n' * 10, "application/x-ndjson")},
+            )
+
+    assert response.status_code == 400
+    assert parquet.status_code == 400
+    assert missing.status_code == 422
+    assert too_large.status_code == 413
+    # Rejected from Content-Length, before a job was created
+    assert len(list(tmp_path.iterdir())) == 1
+    assert Job(job_id="x", filename="f", format="csv").eta_seconds is None
@@ -0,0 +1,103 @@
+"""Tests for logging setup."""
+import io
+import json
+import logging
+import queue
+
+from app.config import settings
+from app.utils.logger import (
+    DroppingQueueHandler,
+    JSONFormatter,
+    flush_logs,
+    setup_logger,
+    should_log,
+)
+from app.utils.metrics import log_records_dropped_total
+
+
+def test_full_queue_drops_and_counts():
+    """Test a full log queue drops info records instead of blocking."""
+    handler = DroppingQueueHandler(queue.Queue(1))
+    log = logging.getLogger("test_dropping")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.handlers = [handler]
+
+    before = log_records_dropped_total._value.get()
+    log.info("first")
+    log.info("second")
+    log.info("third")
+
+    assert handler.queue.qsize() == 1
+    assert log_records_dropped_total._value.get() == before + 2
+
+
+def test_full_queue_writes_warnings_directly():
+    """Test warnings are written synchronously rather than dropped when the queue stays full."""
+    stream = io.StringIO()
+    fallback = logging.StreamHandler(stream)
+    fallback.setFormatter(JSONFormatter())
+    handler = DroppingQueueHandler(queue.Queue(1), fallback)
+    log = logging.getLogger("test_fallback")
+    log.propagate = False
+    log.handlers = [handler]
+
+    before = log_records_dropped_total._value.get()
+    log.warning("queued")
+    log.error("written")
+
+    assert handler.queue.qsize() == 1
+    assert json.loads(stream.getvalue())["message"] == "written"
+    assert log_records_dropped_total._value.get() == before
+
+
+def test_should_log_samples_fast_requests(monkeypatch):
+    """Test sampling skips fast requests but always keeps slow ones."""
+    monkeypatch.setattr(settings, "log_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "log_slow_request_ms", 100)
+
+    assert not should_log(5.0)
+    assert should_log(250.0)
+
+    monkeypatch.setattr(settings, "log_sample_rate", 1.0)
+    assert should_log(5.0)
+
+
+def test_queued_logger_writes_json(monkeypatch):
+    """Test the background writer formats records and exceptions as JSON."""
+    monkeypatch.setattr(settings, "log_queue_size", 100)
+    stream = io.StringIO()
+    log = setup_logger("test_queued", stream=stream)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("Prediction failed %s", "here", extra={"processing_time_ms": 1.5})
+    flush_logs()
+
+    record = json.loads(stream.getvalue().strip())
+    assert record["message"] == "Prediction failed here"
+    assert record["processing_time_ms"] == 1.5
+    assert "ValueError: boom" in record["exception"]
+
+
+def test_setup_logger_is_idempotent():
+    """Test repeated setup keeps one handler and leaves the app logger's writer running."""
+    from app.utils.logger import log_listeners, logger
+
+    app_listeners = dict(log_listeners)
+    assert setup_logger() is logger
+    assert setup_logger("test_other") is setup_logger("test_other")
+
+    # pytest attaches its own capture handlers, so count ours only
+    assert sum(isinstance(h, DroppingQueueHandler) for h in logger.handlers) == 1
+    assert len(logging.getLogger("test_other").handlers) == 1
+    for name, listener in app_listeners.items():
+        assert log_listeners[name] is listener
+
+
+def test_timestamp_is_record_creation_time():
+    """Test the timestamp comes from the record, not the time it is formatted."""
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+    record.created = 0.25
+
+    assert json.loads(JSONFormatter().format(record))["timestamp"] == "1970-01-01T00:00:00.250000Z"
@@ -0,0 +1,32 @@
+"""Tests for process memory reporting."""
+from unittest.mock import mock_open, patch
+
+from app.utils.memory import process_memory
+
+SMAPS = """00400000-7ffd0000 ---p 00000000 00:00 0    [rollup]
+Rss:              409600 kB
+Pss:              204800 kB
+Shared_Clean:     358400 kB
+Shared_Dirty:      10240 kB
+Private_Clean:      1024 kB
+Private_Dirty:     39936 kB
+"""
+
+
+def test_process_memory_breakdown():
+    """Test parsing of /proc/self/smaps_rollup."""
+    with patch("builtins.open", mock_open(read_data=SMAPS)):
+        memory = process_memory()
+
+    assert memory == {
+        "rss_mb": 400.0,
+        "pss_mb": 200.0,
+        "shared_mb": 360.0,
+        "private_mb": 40.0,
+    }
+
+
+def test_process_memory_unavailable():
+    """Test that platforms without /proc report no breakdown."""
+    with patch("builtins.open", side_effect=OSError):
+        assert process_memory() is None
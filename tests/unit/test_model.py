@@ -1,58 +1,55 @@
 """Tests for model module."""
 import pytest
+import torch
 from unittest.mock import Mock, patch
 
-from app.core.model import SentimentModel, get_model
+from app.core.model import SentimentModel, canonical_label, get_model
 
 
-@patch('app.core.model.AutoTokenizer')
-@patch('app.core.model.AutoModelForSequenceClassification')
-@patch('app.core.model.pipeline')
-def test_model_initialization(mock_pipeline, mock_model_class, mock_tokenizer_class):
-    """Test model initialization."""
-    # Mock the pipeline return value
-    mock_classifier = Mock()
-    mock_classifier.return_value = [[
-        {"label": "POSITIVE", "score": 0.9},
-        {"label": "NEGATIVE", "score": 0.05},
-        {"label": "NEUTRAL", "score": 0.05}
-    ]]
-    mock_pipeline.return_value = mock_classifier
-    
-    # Mock tokenizer and model
+def _setup_mocks(mock_model_class, mock_tokenizer_class, probs=(0.05, 0.05, 0.9),
+                 id2label=None):
+    """Wire mock tokenizer/model classes that return fixed class probabilities."""
     mock_tokenizer = Mock()
+    mock_tokenizer.side_effect = lambda texts, **kwargs: {
+        "input_ids": [[101] + [7] * len(text.split()) + [102] for text in texts]
+    }
+    mock_tokenizer.model_max_length = 512
+    mock_tokenizer.pad_token_id = 0
+
+    logits = torch.log(torch.tensor([probs]))
     mock_model = Mock()
+    mock_model.config.id2label = id2label or {0: "NEGATIVE", 1: "NEUTRAL", 2: "POSITIVE"}
+    mock_model.config._commit_hash = None
+    mock_model.side_effect = lambda input_ids, attention_mask: Mock(
+        logits=logits.expand(input_ids.shape[0], -1)
+    )
+
     mock_tokenizer_class.from_pretrained.return_value = mock_tokenizer
     mock_model_class.from_pretrained.return_value = mock_model
-    
+    return mock_model, mock_tokenizer
+
+
+@patch('app.core.model.AutoTokenizer')
+@patch('app.core.model.AutoModelForSequenceClassification')
+def test_model_initialization(mock_model_class, mock_tokenizer_class):
+    """Test model initialization."""
+    _setup_mocks(mock_model_class, mock_tokenizer_class)
+
     # Initialize model
     model = SentimentModel()
     
     assert model.model is not None
     assert model.tokenizer is not None
-    assert model.classifier is not None
+    # Columns NEGATIVE, NEUTRAL, POSITIVE map onto the standard class order
+    assert model.label_index.tolist() == [0, 1, 2]
 
 
 @patch('app.core.model.AutoTokenizer')
 @patch('app.core.model.AutoModelForSequenceClassification')
-@patch('app.core.model.pipeline')
-def test_model_predict(mock_pipeline, mock_model_class, mock_tokenizer_class):
+def test_model_predict(mock_model_class, mock_tokenizer_class):
     """Test model prediction."""
-    # Mock pipeline
-    mock_classifier = Mock()
-    mock_classifier.return_value = [[
-        {"label": "POSITIVE", "score": 0.9},
-        {"label": "NEGATIVE", "score": 0.05},
-        {"label": "NEUTRAL", "score": 0.05}
-    ]]
-    mock_pipeline.return_value = mock_classifier
-    
-    # Mock tokenizer and model
-    mock_tokenizer = Mock()
-    mock_model = Mock()
-    mock_tokenizer_class.from_pretrained.return_value = mock_tokenizer
-    mock_model_class.from_pretrained.return_value = mock_model
-    
+    _setup_mocks(mock_model_class, mock_tokenizer_class)
+
     # Initialize and predict
     model = SentimentModel()
     result = model.predict("This is great!")
@@ -62,16 +59,241 @@ def test_model_predict(mock_pipeline, mock_model_class, mock_tokenizer_class):
     assert "scores" in result
     assert "processing_time_ms" in result
     assert result["sentiment"] in ["positive", "negative", "neutral"]
+    assert result["sentiment"] == "positive"
+    assert result["confidence"] == pytest.approx(0.9)
 
 
-def test_model_predict_empty_text():
+@patch('app.core.model.AutoTokenizer')
+@patch('app.core.model.AutoModelForSequenceClassification')
+def test_model_predict_empty_text(mock_model_class, mock_tokenizer_class):
     """Test prediction with empty text."""
-    with patch('app.core.model.AutoTokenizer'), \
-         patch('app.core.model.AutoModelForSequenceClassification'), \
-         patch('app.core.model.pipeline'):
-        model = SentimentModel()
-        result = model.predict("")
+    _setup_mocks(mock_model_class, mock_tokenizer_class)
+
+    model = SentimentModel()
+    result = model.predict("")
         
-        assert result["sentiment"] == "neutral"
-        assert result["confidence"] == 0.5
+    assert result["sentiment"] == "neutral"
+    assert result["confidence"] == 0.5
+
+
+def test_canonical_label():
+    """Test mapping of raw model labels onto standard classes."""
+    assert canonical_label("POSITIVE") == "positive"
+    assert canonical_label("neg") == "negative"
+    assert canonical_label("LABEL_1") == "neutral"
+    assert canonical_label("very_positive") == "positive"
+    assert canonical_label("mixed") == "neutral"
+
+
+@patch('app.core.model.AutoTokenizer')
+@patch('app.core.model.AutoModelForSequenceClassification')
+def test_model_label_index_handles_hf_and_duplicate_labels(mock_model_class, mock_tokenizer_class):
+    """Test column mapping for LABEL_n names and duplicate classes."""
+    _setup_mocks(
+        mock_model_class,
+        mock_tokenizer_class,
+        probs=(0.1, 0.2, 0.3, 0.4),
+        id2label={0: "LABEL_0", 1: "LABEL_1", 2: "very positive", 3: "pos"},
+    )
+
+    model = SentimentModel()
+    result = model.predict("great")
+
+    assert model.label_index.tolist() == [0, 1, 2, 2]
+    # Duplicate labels keep the highest score, as before
+    assert result["scores"]["positive"] == pytest.approx(0.4)
+    assert result["scores"]["negative"] == pytest.approx(0.1)
+
+
+@patch('app.core.model.AutoTokenizer')
+@patch('app.core.model.AutoModelForSequenceClassification')
+def test_model_predict_many(mock_model_class, mock_tokenizer_class):
+    """Test full per-text results for a micro-batch."""
+    _setup_mocks(mock_model_class, mock_tokenizer_class)
+
+    model = SentimentModel()
+    results = model.predict_many(["This is great!", "   "])
+
+    assert len(results) == 2
+    assert results[0]["sentiment"] == "positive"
+    assert results[0]["scores"]["positive"] == pytest.approx(0.9)
+    assert results[1]["sentiment"] == "neutral"
+    assert all("processing_time_ms" in r for r in results)
+
+
+@patch('app.core.model.AutoTokenizer')
+@patch('app.core.model.AutoModelForSequenceClassification')
+def test_model_predict_batch_uses_cache(mock_model_class, mock_tokenizer_class):
+    """Test that batch predictions are served from and written to the cache."""
+    from app.core.cache import prediction_cache
+
+    mock_model, mock_tokenizer = _setup_mocks(mock_model_class, mock_tokenizer_class)
+
+    model = SentimentModel()
+    prediction_cache.clear()
+
+    predictions, _ = model.predict_batch(["Great!", "  GREAT! ", "Love it"])
+    assert [p["cached"] for p in predictions] == [False, False, False]
+    # Texts with identical model input are only scored once
+    assert sorted(mock_tokenizer.call_args[0][0]) == ["great!", "love it"]
+    assert mock_model.call_count == 1
+
+    predictions, _ = model.predict_batch(["great!", "Love it", ""])
+    assert [p["cached"] for p in predictions] == [True, True, False]
+    assert mock_model.call_count == 1
+    assert prediction_cache.get("Love it")["sentiment"] == "positive"
+    prediction_cache.clear()
+
+
+@patch('app.core.model.AutoTokenizer')
+@patch('app.core.model.AutoModelForSequenceClassification')
+def test_model_batches_by_token_budget(mock_model_class, mock_tokenizer_class):
+    """Test length-bucketed batching under a token budget keeps input order."""
+    from app.config import settings
+
+    mock_model, _ = _setup_mocks(mock_model_class, mock_tokenizer_class)
+    mock_model.side_effect = lambda input_ids, attention_mask: Mock(
+        logits=torch.stack(
+            [torch.zeros_like(attention_mask[:, 0], dtype=torch.float)] * 2
+            + [attention_mask.sum(dim=1).float() / 10],
+            dim=1,
+        )
+    )
+
+    model = SentimentModel()
+    texts = ["w " * 38, "short one", "w " * 8, "tiny", "w " * 37]
+    with patch.object(settings, "max_batch_tokens", 80), \
+         patch.object(settings, "max_batch_size", 32):
+        batches = model._plan_batches([40, 4, 10, 3, 39])
+        predictions = model._classify(texts)
+
+    # Similar lengths share a batch and no batch exceeds the budget
+    assert batches == [[3, 1, 2], [4, 0]]
+    assert mock_model.call_count == 2
+    # Padding is masked per row and results come back in input order
+    assert [p["sentiment"] for p in predictions] == ["positive"] * 5
+    confidences = [p["confidence"] for p in predictions]
+    assert sorted(range(5), key=confidences.__getitem__) == [3, 1, 2, 4, 0]
+
+
+def test_prefetch_pipeline_matches_sequential(tiny_model_dir, monkeypatch):
+    """Test that prefetched tokenization gives the same ordered results."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    model = SentimentModel()
+    texts = [("great product " * (i % 7 + 1)).strip() for i in range(23)]
+
+    monkeypatch.setattr(settings, "tokenize_prefetch_depth", 0)
+    sequential = model._classify(texts)
+
+    monkeypatch.setattr(settings, "tokenize_chunk_size", 5)
+    monkeypatch.setattr(settings, "tokenize_prefetch_depth", 2)
+    pipelined = model._classify(texts)
+
+    assert model._prefetch_pool is not None
+    assert [p["sentiment"] for p in pipelined] == [p["sentiment"] for p in sequential]
+    for left, right in zip(pipelined, sequential):
+        assert left["confidence"] == pytest.approx(right["confidence"], abs=1e-5)
+
+
+def test_long_text_segments(tiny_model_dir, monkeypatch):
+    """Test head+tail and capped sliding-window segmentation."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    model = SentimentModel()
+    model.max_length = 10  # 8 content tokens + [CLS]/[SEP]
+    ids = list(range(20))
+
+    monkeypatch.setattr(settings, "long_text_strategy", "head_tail")
+    assert model._segments(ids) == [[0, 1, 14, 15, 16, 17, 18, 19]]
+    assert model._segments(ids[:5]) == [ids[:5]]
+
+    monkeypatch.setattr(settings, "long_text_strategy", "sliding_window")
+    monkeypatch.setattr(settings, "long_text_overlap", 2)
+    monkeypatch.setattr(settings, "max_tokens_per_text", 64)
+    assert [s[0] for s in model._segments(ids)] == [0, 6, 12]
+
+    monkeypatch.setattr(settings, "max_tokens_per_text", 16)
+    assert [s[0] for s in model._segments(ids)] == [0, 12]
+
+
+def test_sliding_window_aggregates_segments(tiny_model_dir, monkeypatch):
+    """Test that long texts are scored from several segments batched together."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    monkeypatch.setattr(settings, "long_text_strategy", "sliding_window")
+    model = SentimentModel()
+    model.max_length = 8
+    short, long = "great product", " ".join(["bad service"] * 20)
+
+    prepared = model._prepare([short, long], 0)
+    owners = [owner for batch in prepared for owner in batch[0]]
+    assert owners.count(0) == 1
+    assert owners.count(1) > 1
+
+    results = model.predict_many([short, long])
+    assert sum(results[1]["scores"].values()) == pytest.approx(1.0, abs=1e-5)
+    assert "#sliding_window" in model.identity
+
+    monkeypatch.setattr(settings, "long_text_strategy", "head")
+    assert model.predict_many([short])[0]["confidence"] == pytest.approx(
+        results[0]["confidence"], abs=1e-5
+    )
+
+
+def test_stage_metrics_recorded_per_endpoint(tiny_model_dir, monkeypatch):
+    """Test that each pipeline stage and batch shape is observed with labels."""
+    from prometheus_client import REGISTRY
+
+    from app.config import settings
+    from app.core.cache import prediction_cache
+    from app.utils.timing import current_endpoint, model_labels
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    model = SentimentModel()
+    prediction_cache.clear()
+    labels = {"endpoint": "/predict/batch", **model_labels}
+    assert labels["backend"] == "torch"
+    assert labels["model_version"] == f"{tiny_model_dir}@local"
+
+    def count(name, **extra):
+        return REGISTRY.get_sample_value(f"{name}_count", {**labels, **extra}) or 0
+
+    stages = ["preprocess", "tokenize", "forward", "postprocess"]
+    before = {stage: count("inference_stage_seconds", stage=stage) for stage in stages}
+    batches_before = count("inference_padding_ratio")
+
+    token = current_endpoint.set("/predict/batch")
+    try:
+        model.predict_batch(["great", "this is a very good product overall"])
+    finally:
+        current_endpoint.reset(token)
+
+    for stage in stages:
+        assert count("inference_stage_seconds", stage=stage) == before[stage] + 1
+    assert count("inference_padding_ratio") == batches_before + 1
+    # Two texts of different lengths padded into one batch
+    padding = REGISTRY.get_sample_value("inference_padding_ratio_sum", labels)
+    assert padding > 0
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [
+        ("inference_backend", "tensorrt"),
+        ("quantization", "int8"),
+        ("long_text_strategy", "middle"),
+    ],
+)
+def test_unknown_mode_settings_fail_at_load(setting, value, tiny_model_dir, monkeypatch):
+    """Test that a typo in a mode setting fails loudly instead of running fp32."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    monkeypatch.setattr(settings, setting, value)
 
+    with pytest.raises(ValueError, match=f"'{value}'"):
+        SentimentModel()
@@ -0,0 +1,82 @@
+"""Tests for ONNX Runtime backend."""
+import pytest
+
+pytest.importorskip("onnxruntime")
+
+from app.config import settings
+from app.core.model import SentimentModel
+from training.optimize import export_onnx
+
+TEXTS = ["This product is great!", "Terrible service, would not recommend.", "It is okay"]
+
+
+@pytest.fixture(scope="module")
+def onnx_model_dir(tiny_model_dir, tmp_path_factory):
+    """Export the tiny model to ONNX."""
+    output_dir = tmp_path_factory.mktemp("tiny-onnx")
+    export_onnx(tiny_model_dir, str(output_dir))
+    return str(output_dir)
+
+
+def test_onnx_backend_matches_torch(tiny_model_dir, onnx_model_dir, monkeypatch):
+    """Test that the ONNX backend keeps the torch output contract."""
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    torch_model = SentimentModel()
+    expected = [torch_model.predict(text) for text in TEXTS]
+
+    monkeypatch.setattr(settings, "model_name", onnx_model_dir)
+    monkeypatch.setattr(settings, "inference_backend", "onnx")
+    onnx_model = SentimentModel()
+    actual = [onnx_model.predict(text) for text in TEXTS]
+
+    for exp, act in zip(expected, actual):
+        assert act["sentiment"] == exp["sentiment"]
+        for cls in ("positive", "negative", "neutral"):
+            assert act["scores"][cls] == pytest.approx(exp["scores"][cls], abs=1e-4)
+    assert "/onnx:" in onnx_model.identity
+
+
+def test_onnx_quantized_export(tiny_model_dir, tmp_path, monkeypatch):
+    """Test that the int8 export is self-contained and servable."""
+    export_onnx(tiny_model_dir, str(tmp_path), quantize=True)
+
+    assert (tmp_path / "model.onnx").exists()
+    assert not (tmp_path / "model-fp32.onnx").exists()
+    assert (tmp_path / "config.json").exists()
+
+    monkeypatch.setattr(settings, "model_name", str(tmp_path))
+    monkeypatch.setattr(settings, "inference_backend", "onnx")
+    result = SentimentModel().predict("great product")
+
+    assert result["sentiment"] in ["positive", "negative", "neutral"]
+
+
+def test_onnx_session_uses_worker_thread_budget(onnx_model_dir):
+    """Test that a session built before fork is rebuilt with the worker slot's threads."""
+    import multiprocessing
+
+    import torch
+
+    from app.core.onnx_backend import OnnxSentimentClassifier, resolve_onnx_path
+    from app.core.topology import WorkerSlot, apply_worker_slot
+
+    def worker(classifier, conn):
+        apply_worker_slot(WorkerSlot(0, 1, 2.0, intra_op_threads=2, inter_op_threads=1))
+        options = classifier.session.get_session_options()
+        conn.send((options.intra_op_num_threads, options.inter_op_num_threads))
+
+    threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    try:
+        # Like the serving launcher: preloaded and used single-threaded before fork
+        classifier = OnnxSentimentClassifier(resolve_onnx_path(onnx_model_dir))
+        assert classifier.session.get_session_options().intra_op_num_threads == 1
+    finally:
+        torch.set_num_threads(threads)
+
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.get_context("fork").Process(target=worker, args=(classifier, child))
+    process.start()
+    assert parent.poll(60)
+    assert parent.recv() == (2, 1)
+    process.join(10)
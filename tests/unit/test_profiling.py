@@ -0,0 +1,190 @@
+"""Tests for request profiling."""
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.profiling import PROFILE_HEADER, PROFILE_ID_HEADER, RequestProfiler
+
+
+def test_disabled_profiler_never_profiles(monkeypatch):
+    """Test that without a token or sample rate no request is profiled."""
+    monkeypatch.setattr(settings, "profile_token", None)
+    monkeypatch.setattr(settings, "profile_sample_rate", 0.0)
+    profiler = RequestProfiler()
+    headers = Mock()
+
+    assert profiler.should_profile(headers) is None
+    headers.get.assert_not_called()
+
+
+def test_header_and_sample_triggers(monkeypatch):
+    """Test that the token header or sampling selects a request."""
+    monkeypatch.setattr(settings, "profile_token", "secret")
+    monkeypatch.setattr(settings, "profile_sample_rate", 0.0)
+    profiler = RequestProfiler()
+
+    assert profiler.should_profile({PROFILE_HEADER: "secret"}) == "header"
+    assert profiler.should_profile({PROFILE_HEADER: "wrong"}) is None
+
+    monkeypatch.setattr(settings, "profile_sample_rate", 1.0)
+    assert profiler.should_profile({}) == "sample"
+
+
+def test_capture_saves_profiles(tiny_model_dir, tmp_path, monkeypatch):
+    """Test that a capture writes Python and torch profiles with a summary."""
+    from app.core.model import SentimentModel
+
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    model = SentimentModel()
+    profiler = RequestProfiler(directory=str(tmp_path), max_captures=2)
+
+    result, profile_id = profiler.capture("header", model.predict, "great product")
+    profiler.flush()
+
+    assert result["sentiment"] in ("positive", "negative", "neutral")
+    for artifact in ("pstats", "torch", "trace"):
+        assert profiler.artifact_path(profile_id, artifact) is not None
+    with open(profiler.artifact_path(profile_id, "trace")) as f:
+        json.load(f)
+
+    [summary] = profiler.list()
+    assert summary["profile_id"] == profile_id
+    assert summary["trigger"] == "header"
+    assert summary["top_functions"]
+    assert any(op["op"].startswith("aten::") for op in summary["top_torch_ops"])
+
+    # Only the newest captures are kept
+    for _ in range(3):
+        profiler.capture("sample", model.predict, "bad service")
+    profiler.flush()
+    assert len(profiler.list()) == 2
+    assert profiler.artifact_path(profile_id, "pstats") is None
+
+
+def test_concurrent_capture_runs_unprofiled(tmp_path):
+    """Test that a call arriving during another capture is not profiled."""
+    profiler = RequestProfiler(directory=str(tmp_path))
+
+    with profiler._lock:
+        result, profile_id = profiler.capture("header", lambda x: x * 2, 21)
+
+    assert result == 42
+    assert profile_id is None
+    assert profiler.list() == []
+
+
+def test_capture_is_saved_in_the_background(tmp_path, monkeypatch):
+    """Test that the call returns before its capture is written, and frees the slot."""
+    profiler = RequestProfiler(directory=str(tmp_path))
+    saving = threading.Event()
+    release = threading.Event()
+
+    def slow_save(*args):
+        saving.set()
+        release.wait(5)
+
+    monkeypatch.setattr(profiler, "_save", slow_save)
+    monkeypatch.setattr(settings, "inference_backend", "onnx")  # no torch profiler needed
+
+    result, profile_id = profiler.capture("header", lambda x: x * 2, 21)
+    assert saving.wait(5)
+
+    assert result == 42
+    assert profile_id is not None
+    # The next request can be profiled while the previous capture is saved
+    assert profiler.capture("header", lambda x: x + 1, 1)[1] is not None
+    release.set()
+    profiler.flush()
+
+
+def test_capture_is_dropped_when_saves_back_up(tmp_path, monkeypatch):
+    """Test that captures beyond the pending-save bound are dropped and counted."""
+    from app.core.profiling import MAX_PENDING_SAVES
+    from app.utils.metrics import profiles_captured_total
+
+    profiler = RequestProfiler(directory=str(tmp_path))
+    saving = threading.Event()
+    release = threading.Event()
+
+    def slow_save(*args):
+        saving.set()
+        release.wait(5)
+
+    monkeypatch.setattr(profiler, "_save", slow_save)
+    monkeypatch.setattr(settings, "inference_backend", "onnx")
+    dropped = profiles_captured_total.labels(trigger="sample", status="dropped")
+    before = dropped._value.get()
+
+    # One capture is being written and the rest fill the queue
+    assert profiler.capture("sample", lambda: None)[1] is not None
+    assert saving.wait(5)
+    for _ in range(MAX_PENDING_SAVES):
+        assert profiler.capture("sample", lambda: None)[1] is not None
+
+    result, profile_id = profiler.capture("sample", lambda: "ok")
+    assert result == "ok"
+    assert profile_id is None
+    assert dropped._value.get() == before + 1
+    release.set()
+    profiler.flush()
+
+
+def test_artifact_path_rejects_unknown_ids(tmp_path):
+    """Test that artifact lookups only accept capture ids and known names."""
+    profiler = RequestProfiler(directory=str(tmp_path))
+
+    assert profiler.artifact_path("../../etc", "pstats") is None
+    assert profiler.artifact_path("0" * 32, "passwd") is None
+
+
+def test_profiled_request_and_admin_listing(tmp_path, monkeypatch):
+    """Test that a request with the token header is captured and listed."""
+    from app.core.profiling import request_profiler
+    from app.main import app
+
+    monkeypatch.setattr(settings, "profile_token", "secret")
+    monkeypatch.setattr(request_profiler, "directory", tmp_path)
+
+    mock_model_instance = Mock()
+    mock_model_instance.predict.return_value = {
+        "sentiment": "positive",
+        "confidence": 0.95,
+        "scores": {"positive": 0.95, "negative": 0.03, "neutral": 0.02},
+        "processing_time_ms": 35.0,
+    }
+    client = TestClient(app)
+
+    with patch('app.api.endpoints.predict.get_model', return_value=mock_model_instance):
+        response = client.post(
+            "/api/v1/predict",
+            json={"text": "This is great!"},
+            headers={PROFILE_HEADER: "secret"},
+        )
+    assert response.status_code == 200
+    profile_id = response.headers[PROFILE_ID_HEADER]
+    request_profiler.flush()
+
+    assert client.get("/api/v1/admin/profiles").status_code == 403
+    listing = client.get("/api/v1/admin/profiles", headers={PROFILE_HEADER: "secret"})
+    assert [p["profile_id"] for p in listing.json()["profiles"]] == [profile_id]
+    assert listing.json()["profiles"][0]["endpoint"] == "/predict"
+
+    artifact = client.get(
+        f"/api/v1/admin/profiles/{profile_id}/pstats",
+        headers={PROFILE_HEADER: "secret"},
+    )
+    assert artifact.status_code == 200
+
+
+@pytest.mark.parametrize("token", [None, ""])
+def test_admin_disabled_without_token(token, monkeypatch):
+    """Test that admin endpoints are off when no token is configured."""
+    from app.main import app
+
+    monkeypatch.setattr(settings, "profile_token", token)
+    response = TestClient(app).get("/api/v1/admin/profiles")
+    assert response.status_code == 404
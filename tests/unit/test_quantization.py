@@ -0,0 +1,50 @@
+"""Tests for int8 quantized serving."""
+import pytest
+
+from app.config import settings
+from app.core.model import SentimentModel
+from training.optimize import quantize_model
+
+
+@pytest.fixture
+def quantized_settings(monkeypatch):
+    """Serve with dynamic int8 quantization and a strict sanity check."""
+    monkeypatch.setattr(settings, "quantization", "dynamic-int8")
+    monkeypatch.setattr(settings, "quantization_strict", True)
+
+
+def _is_quantized(model):
+    """Check whether Linear layers were replaced by dynamic int8 modules."""
+    return any("quantized" in type(m).__module__ for m in model.modules())
+
+
+def test_quantize_at_load_time(tiny_model_dir, quantized_settings, monkeypatch):
+    """Test quantizing fp32 weights when the model is loaded."""
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+
+    model = SentimentModel()
+
+    assert _is_quantized(model.model)
+    assert model.predict("great product")["sentiment"] in ["positive", "negative", "neutral"]
+    assert "/torch+dynamic-int8:" in model.identity
+
+
+def test_load_saved_quantized_state_dict(tiny_model_dir, quantized_settings, tmp_path, monkeypatch):
+    """Test serving a state dict saved by training/optimize.py."""
+    quantize_model(tiny_model_dir, str(tmp_path))
+    assert (tmp_path / "quantized_state_dict.pt").exists()
+    assert not (tmp_path / "model.safetensors").exists()
+
+    monkeypatch.setattr(settings, "model_name", str(tmp_path))
+    model = SentimentModel()
+
+    assert _is_quantized(model.model)
+
+
+def test_strict_check_fails_on_divergence(tiny_model_dir, quantized_settings, monkeypatch):
+    """Test that a failing sanity check aborts startup in strict mode."""
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    monkeypatch.setattr(settings, "quantization_tolerance", -1.0)
+
+    with pytest.raises(RuntimeError):
+        SentimentModel()
@@ -0,0 +1,107 @@
+"""Tests for the offline bulk scoring CLI."""
+import json
+
+import pytest
+
+from app.config import settings
+from app.utils.records import iter_records
+from scripts.score_file import _init_worker, save_checkpoint, score_file
+
+
+@pytest.fixture
+def reviews(tmp_path):
+    """Small JSONL input file."""
+    path = tmp_path / "reviews.jsonl"
+    path.write_text(
+        "".join(json.dumps({"id": f"r{i}", "text": f"review number {i}"}) + "\n" for i in range(7)),
+        encoding="utf-8",
+    )
+    return path
+
+
+def _read_rows(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_score_file_writes_all_rows(tiny_model_dir, reviews, tmp_path, monkeypatch):
+    """Test scoring a file with a worker pool."""
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    output = tmp_path / "scored.jsonl"
+
+    summary = score_file(str(reviews), str(output), workers=2, chunk_size=2)
+
+    rows = _read_rows(output)
+    assert [row["id"] for row in rows] == [f"r{i}" for i in range(7)]
+    assert [row["row"] for row in rows] == list(range(1, 8))
+    assert set(rows[0]["scores"]) == {"positive", "negative", "neutral"}
+    assert summary["rows_this_run"] == 7
+    assert all(rate > 0 for rate in summary["worker_rows_per_second"].values())
+    assert json.loads((tmp_path / "scored.jsonl.checkpoint").read_text())["completed"]
+
+
+def test_score_file_refuses_to_rewrite_output(tiny_model_dir, reviews, tmp_path, monkeypatch):
+    """Test that a rerun after completion, or onto an unknown file, needs --overwrite."""
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    output = tmp_path / "scored.jsonl"
+    score_file(str(reviews), str(output), workers=1, chunk_size=4)
+    scored = output.read_text()
+
+    with pytest.raises(ValueError, match="already complete"):
+        score_file(str(reviews), str(output), workers=1)
+    assert output.read_text() == scored
+
+    summary = score_file(str(reviews), str(output), workers=1, overwrite=True)
+    assert summary["rows_this_run"] == 7
+    assert output.read_text() == scored
+
+    other = tmp_path / "other.jsonl"
+    other.write_text("keep me\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="without a checkpoint"):
+        score_file(str(reviews), str(other), workers=1)
+    assert other.read_text() == "keep me\n"
+
+
+def test_score_file_resumes_from_checkpoint(tiny_model_dir, reviews, tmp_path, monkeypatch):
+    """Test that a killed run resumes after the last committed chunk."""
+    monkeypatch.setattr(settings, "model_name", tiny_model_dir)
+    output = tmp_path / "scored.jsonl"
+    committed = "".join(json.dumps({"row": i + 1, "id": f"r{i}"}) + "\n" for i in range(3))
+    # Committed prefix followed by a partial chunk written before the kill
+    output.write_text(committed + '{"row": 4, "id": "r3"}\n{"row', encoding="utf-8")
+    save_checkpoint(str(output) + ".checkpoint", str(reviews), 3, len(committed.encode()))
+
+    summary = score_file(str(reviews), str(output), workers=1, chunk_size=2)
+
+    rows = _read_rows(output)
+    assert [row["row"] for row in rows] == list(range(1, 8))
+    assert summary["rows_this_run"] == 4
+
+
+def test_replacement_worker_gets_a_slot(monkeypatch):
+    """Test that a worker started after the first pool never waits for a slot."""
+    import multiprocessing
+
+    from app.core.topology import plan_layout
+    from scripts import score_file as module
+
+    layout = plan_layout(workers=2)
+    applied = []
+    monkeypatch.setattr(module, "apply_worker_slot", applied.append)
+    monkeypatch.setattr("app.core.model.SentimentModel", lambda: None)
+    process = multiprocessing.current_process()
+    # A replacement for a dead worker in a pool of two is worker 3
+    monkeypatch.setattr(process, "_identity", (1, 3))
+
+    _init_worker(layout)
+
+    assert applied == [layout[0]]
+
+
+def test_iter_records_parquet(tmp_path):
+    """Test reading records from a Parquet file."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "reviews.parquet"
+    pq.write_table(pa.table({"text": ["Great", "Bad"], "stars": [5, 1]}), path)
+
+    assert list(iter_records(path, "parquet")) == [(None, "Great"), (None, "Bad")]
@@ -0,0 +1,48 @@
+"""Tests for CPU topology and worker layout."""
+from unittest.mock import mock_open, patch
+
+from app.core import topology
+from app.core.topology import cgroup_cpu_limit, plan_layout
+
+
+def test_cgroup_v2_quota():
+    """Test parsing a cgroup v2 cpu.max quota."""
+    with patch("builtins.open", mock_open(read_data="800000 100000\n")):
+        assert cgroup_cpu_limit() == 8.0
+
+
+def test_cgroup_v2_unlimited():
+    """Test that an unlimited cgroup v2 quota reports no limit."""
+    with patch("builtins.open", mock_open(read_data="max 100000\n")):
+        assert cgroup_cpu_limit() is None
+
+
+def test_layout_splits_cores_across_workers():
+    """Test that 32 cores are split evenly with disjoint pinning."""
+    with patch.object(topology, "available_cpus", return_value=list(range(32))), \
+         patch.object(topology, "cgroup_cpu_limit", return_value=None):
+        layout = plan_layout(workers=4, intra_op_threads=0, inter_op_threads=1, pin=True)
+
+    assert [slot.intra_op_threads for slot in layout] == [8, 8, 8, 8]
+    assert layout[1].cpus == list(range(8, 16))
+    assert not set(layout[0].cpus) & set(layout[3].cpus)
+
+
+def test_layout_respects_cgroup_quota():
+    """Test that a cgroup quota caps threads below the visible core count."""
+    with patch.object(topology, "available_cpus", return_value=list(range(32))), \
+         patch.object(topology, "cgroup_cpu_limit", return_value=6.0):
+        layout = plan_layout(workers=2, intra_op_threads=0, inter_op_threads=1, pin=False)
+
+    assert [slot.intra_op_threads for slot in layout] == [3, 3]
+    assert layout[0].cpus is None
+
+
+def test_layout_never_below_one_thread():
+    """Test that oversubscribed layouts still get one thread per worker."""
+    with patch.object(topology, "available_cpus", return_value=[0, 1]), \
+         patch.object(topology, "cgroup_cpu_limit", return_value=None):
+        layout = plan_layout(workers=4, intra_op_threads=0, inter_op_threads=1, pin=True)
+
+    assert all(slot.intra_op_threads == 1 for slot in layout)
+    assert all(slot.cpus is None for slot in layout)
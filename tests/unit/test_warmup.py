@@ -0,0 +1,48 @@
+"""Tests for cache warm-up."""
+import json
+from unittest.mock import Mock, patch
+
+from app.core.warmup import load_hot_texts, warm_cache, warm_up
+
+
+def test_load_hot_texts_ranks_by_frequency(tmp_path):
+    """Test counting texts across request log and snapshot formats."""
+    log = tmp_path / "requests.jsonl"
+    lines = [
+        {"text": "Great product"},
+        {"texts": ["great   PRODUCT", "Slow delivery"]},
+        "Slow delivery",
+        {"text": "Slow delivery"},
+        {"text": "Rare review"},
+        {"text": "Snapshot entry", "count": 10},
+    ]
+    log.write_text(
+        "\n".join(json.dumps(line) for line in lines) + "\nnot json\n",
+        encoding="utf-8",
+    )
+
+    assert load_hot_texts(str(log), top_n=3) == ["Snapshot entry", "Slow delivery", "Great product"]
+
+
+def test_warm_cache_batches_within_budget():
+    """Test that warm-up scores in batches and stops at the time budget."""
+    model = Mock()
+    texts = [f"text {i}" for i in range(10)]
+
+    assert warm_cache(model, texts, budget_seconds=5, batch_size=4) == 10
+    assert [len(call.args[0]) for call in model.predict_batch.call_args_list] == [4, 4, 2]
+
+    model.reset_mock()
+    assert warm_cache(model, texts, budget_seconds=0, batch_size=4) == 0
+    model.predict_batch.assert_not_called()
+
+
+def test_warm_up_never_fails_startup(tmp_path):
+    """Test that a missing warm-up file is logged, not raised."""
+    model = Mock()
+    with patch("app.core.warmup.settings.cache_warmup_file", str(tmp_path / "missing.jsonl")):
+        assert warm_up(model) == 0
+
+    with patch("app.core.warmup.settings.cache_warmup_file", None):
+        assert warm_up(model) == 0
+    model.predict_batch.assert_not_called()
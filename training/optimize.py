@@ -1,17 +1,46 @@
 """Optimize model (quantization, ONNX export, etc.)."""
 import argparse
+import io
+import json
 from pathlib import Path
 
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
 
+REFERENCE_TEXTS = [
+    "This product is amazing, I love it!",
+    "Terrible experience, would not recommend.",
+    "It's okay, nothing special but works fine.",
+    "Excellent service and fast delivery.",
+    "Poor quality product, very disappointed.",
+]
+
+
+def _state_dict_size_mb(model) -> float:
+    """Serialized state dict size in MB (counts packed int8 weights)."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / (1024 * 1024)
+
+
 def quantize_model(model_dir: str, output_dir: str):
-    """Quantize model to reduce size."""
+    """Quantize model to reduce size.
+
+    Writes ``quantized_state_dict.pt`` with the config and tokenizer, plus
+    fp32 outputs on a few reference texts that the API uses as a sanity
+    check when serving with ``QUANTIZATION=dynamic-int8``.
+    """
     print(f"Loading model from: {model_dir}")
     
     tokenizer = AutoTokenizer.from_pretrained(model_dir)
     model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+    
+    # Reference outputs from the fp32 model
+    encoded = tokenizer(REFERENCE_TEXTS, padding=True, truncation=True, return_tensors="pt")
+    with torch.no_grad():
+        reference = torch.softmax(model(**encoded).logits, dim=-1)
     
     # Dynamic quantization
     print("Quantizing model...")
@@ -26,12 +55,15 @@ def quantize_model(model_dir: str, output_dir: str):
     output_path.mkdir(parents=True, exist_ok=True)
     
     print(f"Saving quantized model to: {output_dir}")
-    quantized_model.save_pretrained(output_dir)
+    torch.save(quantized_model.state_dict(), output_path / "quantized_state_dict.pt")
+    model.config.save_pretrained(output_dir)
     tokenizer.save_pretrained(output_dir)
+    with open(output_path / "quantization_reference.json", "w") as f:
+        json.dump({"texts": REFERENCE_TEXTS, "probabilities": reference.tolist()}, f)
     
     # Compare sizes
-    original_size = sum(p.numel() * 4 for p in model.parameters()) / (1024 * 1024)  # MB
-    quantized_size = sum(p.numel() for p in quantized_model.parameters()) / (1024 * 1024)  # MB
+    original_size = _state_dict_size_mb(model)
+    quantized_size = _state_dict_size_mb(quantized_model)
     
     print(f"\nModel size comparison:")
     print(f"Original: {original_size:.2f} MB")
@@ -41,14 +73,84 @@ def quantize_model(model_dir: str, output_dir: str):
     print("Quantization completed!")
 
 
+class _LogitsOnly(torch.nn.Module):
+    """Wrap a classifier so the exported graph has a single logits output."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+def export_onnx(model_dir: str, output_dir: str, quantize: bool = False, opset: int = 17):
+    """Export model to ONNX, optionally with int8 dynamic quantization.
+
+    The output directory is self-contained: ``model.onnx`` plus the config and
+    tokenizer files, so it can be served with ``MODEL_NAME=<output_dir>`` and
+    ``INFERENCE_BACKEND=onnx``.
+    """
+    print(f"Loading model from: {model_dir}")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    onnx_path = output_path / "model.onnx"
+    fp32_path = output_path / "model-fp32.onnx" if quantize else onnx_path
+
+    # Export with dynamic batch and sequence axes
+    print("Exporting to ONNX...")
+    dummy = tokenizer(["an example review for tracing"], return_tensors="pt")
+    dynamic_axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _LogitsOnly(model),
+            (dummy["input_ids"], dummy["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": dynamic_axes,
+                "attention_mask": dynamic_axes,
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print("Quantizing ONNX graph to int8...")
+        quantize_dynamic(str(fp32_path), str(onnx_path), weight_type=QuantType.QInt8)
+        fp32_size = fp32_path.stat().st_size / (1024 * 1024)
+        fp32_path.unlink()
+        print(f"FP32 graph: {fp32_size:.2f} MB")
+
+    print(f"Saving config and tokenizer to: {output_dir}")
+    model.config.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+
+    print(f"ONNX graph: {onnx_path.stat().st_size / (1024 * 1024):.2f} MB")
+    print("ONNX export completed!")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Optimize model")
     parser.add_argument("--model-dir", required=True, help="Path to model directory")
     parser.add_argument("--output-dir", required=True, help="Output directory for optimized model")
-    parser.add_argument("--method", default="quantize", choices=["quantize"], help="Optimization method")
+    parser.add_argument("--method", default="quantize", choices=["quantize", "onnx"], help="Optimization method")
+    parser.add_argument("--quantize", action="store_true", help="Apply int8 dynamic quantization to the ONNX graph")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset version")
     
     args = parser.parse_args()
     
     if args.method == "quantize":
         quantize_model(args.model_dir, args.output_dir)
+    elif args.method == "onnx":
+        export_onnx(args.model_dir, args.output_dir, quantize=args.quantize, opset=args.opset)
 